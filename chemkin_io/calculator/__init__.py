@@ -4,11 +4,21 @@ calculates derived quantities from the strings of the species
 
 from chemkin_io.calculator import rates
 from chemkin_io.calculator import thermo
+from chemkin_io.calculator import equilibrium
+from chemkin_io.calculator import production
+from chemkin_io.calculator import sensitivity
+from chemkin_io.calculator import uncertainty
+from chemkin_io.calculator import reduction
 from chemkin_io.calculator import combine
 
 
 __all__ = [
     'rates',
     'thermo',
+    'equilibrium',
+    'production',
+    'sensitivity',
+    'uncertainty',
+    'reduction',
     'combine'
 ]
@@ -2,16 +2,27 @@
 Take data dictionaries from mechanisms and combine them under a common index
 """
 
-import itertools
+import collections
 import numpy as np
 import chemkin_io.parser
 from chemkin_io.calculator import thermo
 from chemkin_io.calculator import rates
+from chemkin_io.calculator import equilibrium
 from chemkin_io.parser.mechanism import reaction_units
 
 
 RC = 1.98720425864083e-3  # in kcal/mol.K
 
+# Species and reactions of several mechanisms under a common index; the
+# thermo (H, Cp, S, G) and rate constant arrays have a leading mechanism
+# axis and are NaN where a mechanism lacks an entry, the masks flag the
+# entries each mechanism has, and rxn_reversed flags the reactions a
+# mechanism writes in reverse of their canonical key
+MechanismComparison = collections.namedtuple(
+    'MechanismComparison',
+    ['spc_keys', 'thermo', 'spc_mask', 'rxn_keys', 'ktps', 'rxn_mask',
+     'rxn_reversed', 'press_idx_dct'])
+
 
 def mechanism_thermo(mech1_thermo_dct, mech2_thermo_dct):
     """ Loop over the the Mech1 thermo entries
@@ -49,24 +60,27 @@ def mechanism_rates(mech1_ktp_dct, mech2_ktp_dct, temps,
 
     total_ktp_dct = {}
 
+    # Index the mech2 reactions once by their canonical keys
+    mech2_rxn_idx = reaction_index(mech2_ktp_dct)
+
     # Build full rates dictionary with common index
     # First loop through mech1: add common and mech1-unique species
     for mech1_name, mech1_ktp in mech1_ktp_dct.items():
 
         # Check what (if/any) combination of mech2 matches with mech1
         mech2_name_match, reverse_rates = _assess_reaction_match(
-            mech1_name, mech2_ktp_dct)
+            mech1_name, mech2_ktp_dct, mech2_rxn_idx=mech2_rxn_idx)
 
         # Calculate reaction rates, reverse if needed
         if mech2_name_match:
             if not reverse_rates:
-                mech2_ktp = mech2_ktp_dct[mech1_name]
+                mech2_ktp = mech2_ktp_dct[mech2_name_match]
             else:
                 assert mech2_thermo_dct is not None
                 mech2_ktp = _reverse_reaction_rates(
                     mech2_ktp_dct, mech2_thermo_dct, mech2_name_match, temps)
         else:
-            mech2_dct = None
+            mech2_ktp = None
 
         # Add data_entry to overal thermo dictionary
         total_ktp_dct[mech1_name] = {
@@ -80,6 +94,126 @@ def mechanism_rates(mech1_ktp_dct, mech2_ktp_dct, temps,
     return total_ktp_dct
 
 
+def mechanisms(mech_strs, t_ref, temps, pressures, spc_dcts=None,
+               nprocs=1, cache_dir=None):
+    """ compare any number of mechanisms under a common index
+
+        each mechanism is parsed and evaluated once, by nprocs worker
+        processes; spc_dcts, one per mechanism, may map the species names
+        onto shared identifiers, such as InChI strings, and names missing
+        from them are kept; reactions are aligned by their canonical
+        keys, with rates in the canonical direction, so reactions written
+        in reverse are reversed with the thermo of their mechanism
+
+        returns a MechanismComparison with (nmechs, nspecies, 4, ntemps)
+        thermo and (nmechs, nreactions, npressures+1, ntemps) rate arrays
+    """
+    if spc_dcts is None:
+        spc_dcts = [{}] * len(mech_strs)
+    assert len(spc_dcts) == len(mech_strs)
+    if pressures is None:
+        pressures = ()
+    temps = np.asarray(temps, dtype=float)
+
+    mech_args = [(mech_str, t_ref, temps, pressures, cache_dir)
+                 for mech_str in mech_strs]
+    mech_arrays = chemkin_io.parser.util.parallel_map(
+        _mechanism_arrays, mech_args, nprocs=nprocs, min_chunk_size=1)
+
+    # Build the common species and reaction indices
+    spc_idx_dct = {}
+    rxn_idx_dct = {}
+    mech_spc_idxs = []
+    mech_rxn_idxs = []
+    for (names, _, rxn_keys, _, _), spc_dct in zip(mech_arrays, spc_dcts):
+        spc_idxs = []
+        for name in names:
+            spc_key = spc_dct.get(name, name)
+            spc_idxs.append(spc_idx_dct.setdefault(spc_key, len(spc_idx_dct)))
+        mech_spc_idxs.append(spc_idxs)
+
+        rxn_idxs = []
+        for rcts, prds in rxn_keys:
+            can_key, is_rev = reaction_key(
+                (tuple(spc_dct.get(name, name) for name in rcts),
+                 tuple(spc_dct.get(name, name) for name in prds)))
+            rxn_idxs.append(
+                (rxn_idx_dct.setdefault(can_key, len(rxn_idx_dct)), is_rev))
+        mech_rxn_idxs.append(rxn_idxs)
+
+    nmechs = len(mech_strs)
+    thermo_arr = np.full(
+        (nmechs, len(spc_idx_dct), 4, len(temps)), np.nan)
+    spc_mask = np.zeros((nmechs, len(spc_idx_dct)), dtype=bool)
+    ktps = np.full(
+        (nmechs, len(rxn_idx_dct), len(pressures) + 1, len(temps)), np.nan)
+    rxn_mask = np.zeros((nmechs, len(rxn_idx_dct)), dtype=bool)
+    rxn_reversed = np.zeros((nmechs, len(rxn_idx_dct)), dtype=bool)
+
+    # Fill in each mechanism; the first of several equivalent entries
+    # of one mechanism is kept
+    for mech_idx, mech_data in enumerate(mech_arrays):
+        names, props, _, mech_ktps, mech_rev_ktps = mech_data
+        for row, spc_idx in reversed(list(enumerate(mech_spc_idxs[mech_idx]))):
+            thermo_arr[mech_idx, spc_idx] = props[:, row]
+            spc_mask[mech_idx, spc_idx] = True
+        for row, (rxn_idx, is_rev) in reversed(
+                list(enumerate(mech_rxn_idxs[mech_idx]))):
+            ktps[mech_idx, rxn_idx] = (
+                mech_rev_ktps[row] if is_rev else mech_ktps[row])
+            rxn_mask[mech_idx, rxn_idx] = True
+            rxn_reversed[mech_idx, rxn_idx] = is_rev
+
+    press_idx_dct = {'high': 0}
+    press_idx_dct.update(
+        {pressure: idx + 1 for idx, pressure in enumerate(pressures)})
+
+    return MechanismComparison(
+        spc_keys=tuple(spc_idx_dct), thermo=thermo_arr, spc_mask=spc_mask,
+        rxn_keys=tuple(rxn_idx_dct), ktps=ktps, rxn_mask=rxn_mask,
+        rxn_reversed=rxn_reversed, press_idx_dct=press_idx_dct)
+
+
+def _mechanism_arrays(mech_args):
+    """ the species names, (4, nspecies, ntemps) thermo array, reaction
+        keys and the forward and reverse rate constants of a mechanism;
+        reverse rate constants of irreversible reactions are NaN
+    """
+    mech_str, t_ref, temps, pressures, cache_dir = mech_args
+    mech_data = chemkin_io.parser.cache.mechanism_data(
+        mech_str, cache_dir=cache_dir)
+
+    if mech_data['thermo'] is not None:
+        names, tmps, cfts = chemkin_io.parser.thermo.record_arrays(
+            mech_data['thermo'])
+        props = np.array(thermo.properties(cfts, tmps, temps))
+    else:
+        names, props = (), np.zeros((4, 0, len(temps)))
+
+    if mech_data['reactions'] is None:
+        rxn_keys = ()
+        ktps = np.zeros((0, len(pressures) + 1, len(temps)))
+        return names, props, rxn_keys, ktps, ktps
+
+    cmech = rates.compiled_mechanism(
+        mech_data['reactions'], mech_data['units'])
+    ktp_arrays = rates.mechanism_arrays(
+        cmech, mech_data['units'], t_ref, temps, pressures)
+
+    # Species of the reactions without thermo have NaN Gibbs energies
+    gibbs_dct = dict(zip(names, props[3]))
+    rgt_names, stoich = equilibrium.stoichiometric_matrix(cmech.rxn_keys)
+    gibbs = np.array(
+        [gibbs_dct.get(name, np.full(len(temps), np.nan))
+         for name in rgt_names]).reshape(len(rgt_names), len(temps))
+    k_equils = equilibrium.equilibrium_constants(stoich, gibbs, temps)
+    ktps = rates.dense_ktps(ktp_arrays)
+    rev_ktps = ktps / k_equils[:, np.newaxis, :]
+    rev_ktps[~equilibrium.reversible(cmech)] = np.nan
+
+    return names, props, cmech.rxn_keys, ktps, rev_ktps
+
+
 # Thermo functions
 def build_thermo_name_dcts(mech1_str, mech2_str, temps):
     """ builds the thermo dictionaries indexed by names
@@ -108,8 +242,10 @@ def build_thermo_name_dcts(mech1_str, mech2_str, temps):
 
 def build_thermo_inchi_dcts(mech1_str, mech2_str,
                             mech1_csv_str, mech2_csv_str,
-                            temps):
-    """ builds new thermo dictionaries indexed by inchis
+                            temps, cache_dir=None):
+    """ builds new thermo dictionaries indexed by inchis; the cache
+        directory, if given, stores the SMILES -> InChI conversions;
+        species with no InChI are reported and left out
     """
     # Get dicts: dict[name] = thm_dstr
     mech1_thermo_dct, mech2_thermo_dct = build_thermo_name_dcts(
@@ -117,17 +253,23 @@ def build_thermo_inchi_dcts(mech1_str, mech2_str,
 
     # Get dicts: dict[name] = inchi
     mech1_name_inchi_dct = chemkin_io.parser.mechanism.spc_name_dct(
-        mech1_csv_str, 'inchi')
+        mech1_csv_str, 'inchi', store_dir=cache_dir)
     mech2_name_inchi_dct = chemkin_io.parser.mechanism.spc_name_dct(
-        mech2_csv_str, 'inchi')
+        mech2_csv_str, 'inchi', store_dir=cache_dir)
 
     # Convert name dict to get: dict[inchi] = name
     mech1_thermo_ich_dct = {}
     for name, data in mech1_thermo_dct.items():
+        if name not in mech1_name_inchi_dct:
+            _print_skipped('species', name, [name])
+            continue
         ich = mech1_name_inchi_dct[name]
         mech1_thermo_ich_dct[ich] = data
     mech2_thermo_ich_dct = {}
     for name, data in mech2_thermo_dct.items():
+        if name not in mech2_name_inchi_dct:
+            _print_skipped('species', name, [name])
+            continue
         ich = mech2_name_inchi_dct[name]
         mech2_thermo_ich_dct[ich] = data
 
@@ -137,41 +279,67 @@ def build_thermo_inchi_dcts(mech1_str, mech2_str,
 def spc_name_from_inchi(mech1_csv_str, mech2_csv_str, ich):
     """ uses dict[inchi]=name dicts to get
         the mechanism name for a given InChI string
-    """
 
-    mech1_inchi_dct = chemkin_io.parser.mechanism.spc_inchi_dct(mech1_csv_str)
-    mech2_inchi_dct = chemkin_io.parser.mechanism.spc_inchi_dct(mech2_csv_str)
+        the dictionaries are those kept by parser.identity, looked up
+        without copying them
+    """
 
+    mech1_inchi_dct = chemkin_io.parser.identity.identities(
+        mech1_csv_str).inchi_name_dct
     if ich in mech1_inchi_dct:
         mech_name = mech1_inchi_dct[ich]
     else:
-        mech_name = mech2_inchi_dct[ich]
+        mech_name = chemkin_io.parser.identity.identities(
+            mech2_csv_str).inchi_name_dct[ich]
 
     return mech_name
 
 
 # Rate functions
-def _assess_reaction_match(mech1_names, mech2_dct):
+def reaction_key(rxn_key):
+    """ the canonical form of a (reactants, products) reaction key and
+        whether it is written in reverse of that form
+
+        reactants and products are sorted, so that their order does not
+        matter, and the two sides are put in sorted order
+    """
+    [rcts, prds] = rxn_key
+    rcts, prds = tuple(sorted(rcts)), tuple(sorted(prds))
+    is_rev = prds < rcts
+    can_key = (prds, rcts) if is_rev else (rcts, prds)
+    return can_key, is_rev
+
+
+def reaction_index(rxn_keys):
+    """ a dictionary of the reaction keys of a mechanism by canonical key,
+        giving each key and whether it is written in reverse of the
+        canonical form; the first of several equivalent keys is kept
+    """
+    rxn_idx = {}
+    for rxn_key in rxn_keys:
+        can_key, is_rev = reaction_key(rxn_key)
+        if can_key not in rxn_idx:
+            rxn_idx[can_key] = (rxn_key, is_rev)
+    return rxn_idx
+
+
+def _assess_reaction_match(mech1_names, mech2_dct, mech2_rxn_idx=None):
     """ assess whether the reaction should be flipped
+
+        the reaction index of mech2, from reaction_index, may be passed in
+        to avoid rebuilding it for every reaction
     """
 
-    [mech1_rcts, mech1_prds] = mech1_names
-    mech1_rct_comb = list(itertools.combinations(mech1_rcts, len(mech1_rcts)))
-    mech1_prd_comb = list(itertools.combinations(mech1_prds, len(mech1_prds)))
-
-    for rxn in mech2_dct:
-        [mech2_rcts, mech2_prds] = rxn
-        if mech2_rcts in mech1_rct_comb and mech2_prds in mech1_prd_comb:
-            flip_rxn = False
-            mech2_key = rxn
-            break
-        elif mech2_rcts in mech1_prd_comb and mech2_prds in mech1_rct_comb:
-            mech2_key = rxn
-            flip_rxn = True
-            break
-        else:
-            mech2_key = ()
-            flip_rxn = None
+    if mech2_rxn_idx is None:
+        mech2_rxn_idx = reaction_index(mech2_dct)
+
+    can_key, mech1_rev = reaction_key(mech1_names)
+    if can_key in mech2_rxn_idx:
+        mech2_key, mech2_rev = mech2_rxn_idx[can_key]
+        flip_rxn = mech1_rev != mech2_rev
+    else:
+        mech2_key = ()
+        flip_rxn = None
 
     ret = mech2_key, flip_rxn
 
@@ -183,54 +351,51 @@ def _reverse_reaction_rates(mech_dct, thermo_dct, rxn, temps):
     """
 
     [rct_idxs, prd_idxs] = rxn
-    k_equils = _calculate_equilibrium_constant(
-        thermo_dct, rct_idxs, prd_idxs, temps)
+    k_equils = np.array(_calculate_equilibrium_constant(
+        thermo_dct, rct_idxs, prd_idxs, temps))
 
     ktp_dct = mech_dct[rxn]
     rev_ktp_dct = {}
     for pressure, rate_ks in ktp_dct.items():
-        rev_rates = []
-        for rate_k, k_equil in zip(rate_ks, k_equils):
-            rev_rates.append(rate_k / k_equil)
-        rev_ktp_dct[pressure] = rev_rates
+        rev_ktp_dct[pressure] = list(np.asarray(rate_ks) / k_equils)
 
     return rev_ktp_dct
 
 
 def _calculate_equilibrium_constant(thermo_dct, rct_idxs, prd_idxs, temps):
     """ use the thermo parameters to obtain the equilibrium
-        constant
+        constant, Kc in mol/cm3 units as for the forward rate constants
     """
 
-    k_equils = []
-    for temp_idx, temp in enumerate(temps):
-        rct_gibbs = 0.0
-        for rct in rct_idxs:
-            rct_gibbs += _grab_gibbs(thermo_dct[rct], temp_idx)
-        prd_gibbs = 0.0
-        for prd in prd_idxs:
-            prd_gibbs += _grab_gibbs(thermo_dct[prd], temp_idx)
-
-        rxn_gibbs = prd_gibbs - rct_gibbs
+    names, stoich = equilibrium.stoichiometric_matrix(
+        [(tuple(rct_idxs), tuple(prd_idxs))])
+    _, (_, _, _, gibbs) = thermo.property_arrays(thermo_dct, names=names)
+    k_equils = equilibrium.equilibrium_constants(stoich, gibbs, temps)[0]
 
-        k_equils.append(
-            np.exp(-rxn_gibbs / (RC * temp)))
-
-    return k_equils
-
-
-def _grab_gibbs(thermo_vals, temp_idx):
-    """ calculate the Gibbs Free energy value
-    """
-    gibbs = thermo_vals[3][temp_idx]
-    return gibbs
+    return list(k_equils)
 
 
 # Functions to build dictionaries
-def build_reaction_name_dcts(mech1_str, mech2_str, t_ref, temps, pressures):
-    """ builds the reaction dictionaries indexed by names
+def build_reaction_name_dcts(mech1_str, mech2_str, t_ref, temps, pressures,
+                             cache_dir=None):
+    """ builds the reaction dictionaries indexed by names;
+        if a cache directory is given, the parsed mechanisms are
+        read from (or written to) the on-disk cache
     """
 
+    if cache_dir is not None:
+        mech1_data = chemkin_io.parser.cache.mechanism_data(
+            mech1_str, cache_dir=cache_dir)
+        mech1_ktp_dct = rates.mechanism(
+            mech1_data['reactions'], mech1_data['units'],
+            t_ref, temps, pressures)
+        mech2_data = chemkin_io.parser.cache.mechanism_data(
+            mech2_str, cache_dir=cache_dir)
+        mech2_ktp_dct = rates.mechanism(
+            mech2_data['reactions'], mech2_data['units'],
+            t_ref, temps, pressures)
+        return mech1_ktp_dct, mech2_ktp_dct
+
     mech1_reaction_block = chemkin_io.parser.util.clean_up_whitespace(
         chemkin_io.parser.mechanism.reaction_block(mech1_str))
     mech1_units = reaction_units(mech1_str)
@@ -248,39 +413,56 @@ def build_reaction_name_dcts(mech1_str, mech2_str, t_ref, temps, pressures):
 
 def build_reaction_inchi_dcts(mech1_str, mech2_str,
                               mech1_csv_str, mech2_csv_str,
-                              t_ref, temps, pressures):
-    """ builds new reaction dictionaries indexed by inchis
+                              t_ref, temps, pressures, cache_dir=None):
+    """ builds new reaction dictionaries indexed by inchis; the cache
+        directory, if given, also stores the SMILES -> InChI conversions;
+        reactions of species with no InChI are reported and left out
     """
     # Get dicts: dict[name] = rxn_dstr
     mech1_reaction_dct, mech2_reaction_dct = build_reaction_name_dcts(
-        mech1_str, mech2_str, t_ref, temps, pressures)
+        mech1_str, mech2_str, t_ref, temps, pressures, cache_dir=cache_dir)
 
     # Get dicts: dict[name] = inchi
     mech1_name_inchi_dct = chemkin_io.parser.mechanism.spc_name_dct(
-        mech1_csv_str, 'inchi')
+        mech1_csv_str, 'inchi', store_dir=cache_dir)
     mech2_name_inchi_dct = chemkin_io.parser.mechanism.spc_name_dct(
-        mech2_csv_str, 'inchi')
+        mech2_csv_str, 'inchi', store_dir=cache_dir)
 
     # Convert name dict to get: dict[inchi] = rxn_data
-    mech1_reaction_ich_dct = {}
-    for names, data in mech1_reaction_dct.items():
-        [rct_names, prd_names] = names
-        rct_ichs, prd_ichs = (), ()
-        for rcts, prds in zip(rct_names, prd_names):
-            rct_ichs += ((mech1_name_inchi_dct[rcts]),)
-            prd_ichs += ((mech1_name_inchi_dct[prds]),)
-        mech1_reaction_ich_dct[(rct_ichs, prd_ichs)] = data
-
-    mech2_reaction_ich_dct = {}
-    for names, data in mech2_reaction_dct.items():
-        [rct_names, prd_names] = names
-        rct_ichs, prd_ichs = (), ()
-        for rcts, prds in zip(rct_names, prd_names):
-            rct_ichs += ((mech2_name_inchi_dct[rcts]),)
-            prd_ichs += ((mech2_name_inchi_dct[prds]),)
-        mech2_reaction_ich_dct[(rct_ichs, prd_ichs)] = data
+    mech1_reaction_ich_dct = _reaction_inchi_dct(
+        mech1_reaction_dct, mech1_name_inchi_dct)
+    mech2_reaction_ich_dct = _reaction_inchi_dct(
+        mech2_reaction_dct, mech2_name_inchi_dct)
 
     return mech1_reaction_ich_dct, mech2_reaction_ich_dct
+
+
+def _reaction_inchi_dct(reaction_dct, name_inchi_dct):
+    """ reaction data re-indexed by the InChI strings of the reactants and
+        products; reactions of species with no InChI are reported and left
+        out
+    """
+    reaction_ich_dct = {}
+    for names, data in reaction_dct.items():
+        [rct_names, prd_names] = names
+        missing = [name for name in rct_names + prd_names
+                   if name not in name_inchi_dct]
+        if missing:
+            _print_skipped(
+                'reaction', '+'.join(rct_names) + '=' + '+'.join(prd_names),
+                missing)
+            continue
+        rct_ichs = tuple(name_inchi_dct[rct] for rct in rct_names)
+        prd_ichs = tuple(name_inchi_dct[prd] for prd in prd_names)
+        reaction_ich_dct[(rct_ichs, prd_ichs)] = data
+
+    return reaction_ich_dct
+
+
+def _print_skipped(kind, label, names):
+    """ report an entry left out for species with no InChI """
+    print('Skipping {} {}: no InChI for species {}'.format(
+        kind, label, ', '.join(sorted(set(names)))))
 # def spc_name_from_inchi(mech1_csv_str, mech2_csv_str, ich_pair):
 #     """ uses dict[inchi]=name dicts to get
 #         the mechanism name for a given InChI string
@@ -0,0 +1,106 @@
+""" equilibrium constants and reverse rate constants of a whole mechanism
+"""
+
+import numpy as np
+import scipy.sparse
+from chemkin_io.calculator import rates
+
+
+RC = 1.98720425864083e-3  # in kcal/mol.K
+RC_CM3 = 82.0573660809596  # in cm3.atm/mol.K
+P_REF = 1.0  # standard-state pressure, in atm
+
+
+def stoichiometric_matrix(rxn_keys, names=None):
+    """ the sparse (nreactions, nspecies) stoichiometric matrix of a set of
+        (reactants, products) reaction keys, with products counted as
+        positive and reactants as negative; repeated species add up
+
+        species are ordered as the names given, or else as they first
+        appear in the keys; returns the names and the CSR matrix
+    """
+    if names is None:
+        names = []
+        for rcts, prds in rxn_keys:
+            names.extend(name for name in rcts + prds if name not in names)
+    names = tuple(names)
+    spc_idx_dct = {name: idx for idx, name in enumerate(names)}
+
+    rows, cols, vals = [], [], []
+    for rxn_idx, (rcts, prds) in enumerate(rxn_keys):
+        for rgts, coeff in ((rcts, -1.0), (prds, 1.0)):
+            for rgt in rgts:
+                rows.append(rxn_idx)
+                cols.append(spc_idx_dct[rgt])
+                vals.append(coeff)
+
+    # duplicate entries are summed on conversion to CSR
+    stoich = scipy.sparse.coo_matrix(
+        (vals, (rows, cols)), shape=(len(rxn_keys), len(names))).tocsr()
+
+    return names, stoich
+
+
+def equilibrium_constants(stoich, gibbs, temps, kind='kc'):
+    """ the (nreactions, ntemps) equilibrium constants of every reaction
+        of a stoichiometric matrix, from the (nspecies, ntemps) Gibbs free
+        energies of its species in kcal/mol, as given by thermo.properties
+
+        kind='kp' gives Kp for a 1 atm standard state and kind='kc' gives
+        Kc in mol/cm3 units, matching the rate constants of rates.mechanism
+    """
+    temps = np.asarray(temps, dtype=float)
+    gibbs = np.asarray(gibbs, dtype=float)
+
+    rxn_gibbs = stoich @ gibbs
+    k_equils = np.exp(-rxn_gibbs / (RC * temps))
+
+    if kind == 'kc':
+        delta_ns = np.asarray(stoich.sum(axis=1)).ravel()
+        k_equils *= (
+            (P_REF / (RC_CM3 * temps))[np.newaxis, :] **
+            delta_ns[:, np.newaxis])
+    elif kind != 'kp':
+        raise NotImplementedError
+
+    return k_equils
+
+
+def reversible(cmech):
+    """ flags the reaction keys of a compiled mechanism with a reversible
+        record
+    """
+    rxn_rev = np.zeros(len(cmech.rxn_keys), dtype=bool)
+    np.logical_or.at(
+        rxn_rev, cmech.rxn_idxs, [rxn.reversible for rxn in cmech.rxns])
+    return rxn_rev
+
+
+def reverse_rates(cmech, ktp_arrays, names, gibbs, temps):
+    """ the reverse rate constants of every reversible reaction of a
+        compiled mechanism, from its KTPArrays and the Gibbs free energies
+        of the species names, as KTPArrays
+
+        the rows of the arrays are keyed by the reversed reaction keys,
+        (products, reactants); the rate constants must be evaluated at
+        the temperatures given
+    """
+    _, stoich = stoichiometric_matrix(cmech.rxn_keys, names=names)
+    k_equils = equilibrium_constants(stoich, gibbs, temps, kind='kc')
+
+    rev_idxs = np.flatnonzero(reversible(cmech))
+    rev_pdep = ktp_arrays.pdep[rev_idxs]
+    rev_pdep_idxs = rev_idxs[rev_pdep]
+    high_ktps = ktp_arrays.high_ktps[rev_idxs] / k_equils[rev_idxs]
+    pdep_ktps = (ktp_arrays.pdep_ktps[ktp_arrays.pdep_rows[rev_pdep_idxs]] /
+                 k_equils[rev_pdep_idxs, np.newaxis, :])
+    pdep_rows = np.where(rev_pdep, np.cumsum(rev_pdep) - 1, -1)
+
+    rxn_idx_dct = {
+        cmech.rxn_keys[rxn_idx][::-1]: idx
+        for idx, rxn_idx in enumerate(rev_idxs)}
+
+    return rates.KTPArrays(
+        high_ktps=high_ktps, pdep_ktps=pdep_ktps, pdep_rows=pdep_rows,
+        rxn_idx_dct=rxn_idx_dct, press_idx_dct=ktp_arrays.press_idx_dct,
+        pdep=rev_pdep)
@@ -0,0 +1,314 @@
+""" net production rates of the species of a whole mechanism, and their
+    analytic derivatives
+"""
+
+import collections
+import numpy as np
+import scipy.sparse
+import ratefit
+from chemkin_io.calculator import rates
+from chemkin_io.calculator import thermo
+from chemkin_io.calculator import equilibrium
+
+
+RC_CM3 = ratefit.fxns.RC_CM3
+
+# Reaction records of a compiled mechanism with their stoichiometry over
+# the species names, for production rates; the stoichiometric matrices
+# are sparse (nrecords, nspecies) matrices of reactant, product and net
+# coefficients, rct_idxs and prd_idxs list the species index of each
+# reactant and product of a record, padded with nspecies, eff_deltas is a
+# sparse (nrecords, nspecies) matrix of third-body efficiencies less 1,
+# third_body, falloff and reversible flag the '+M', falloff and
+# reversible records, and thermo holds the (nspecies, 3) temperatures and
+# (nspecies, 2, 7) coefficients of the NASA polynomials of the species, or
+# None
+ProductionMechanism = collections.namedtuple(
+    'ProductionMechanism',
+    ['cmech', 'rxn_units', 'names', 'rct_stoich', 'prd_stoich',
+     'net_stoich', 'rct_idxs', 'prd_idxs', 'eff_deltas', 'third_body',
+     'falloff', 'reversible', 'thermo'])
+
+
+def production_mechanism(rxn_block, rxn_units, names=None, thm_arrays=None):
+    """ compile the stoichiometry of a block of reactions, given as a
+        string or a sequence of Reaction records, for production rates
+
+        species are ordered as the names given, or else as they first
+        appear in the records, including their third-body efficiencies;
+        thm_arrays, the (names, temps, cfts) thermo arrays of
+        parser.thermo.data_arrays, are needed for the reverse rate
+        constants of reversible reactions
+    """
+    cmech = rates.compiled_mechanism(rxn_block, rxn_units)
+    rxns = cmech.rxns
+
+    # bath gases only named in third-body efficiencies still count in [M]
+    if names is None:
+        names, _ = equilibrium.stoichiometric_matrix(
+            [(rxn.reactants, rxn.products + tuple(rxn.buffer or ()))
+             for rxn in rxns])
+    names, net_stoich = equilibrium.stoichiometric_matrix(
+        [(rxn.reactants, rxn.products) for rxn in rxns], names=names)
+    _, rct_stoich = equilibrium.stoichiometric_matrix(
+        [((), rxn.reactants) for rxn in rxns], names=names)
+    _, prd_stoich = equilibrium.stoichiometric_matrix(
+        [((), rxn.products) for rxn in rxns], names=names)
+
+    spc_idx_dct = {name: idx for idx, name in enumerate(names)}
+    rows, cols, vals = [], [], []
+    for rxn_idx, rxn in enumerate(rxns):
+        for name, eff in (rxn.buffer or {}).items():
+            if name in spc_idx_dct:
+                rows.append(rxn_idx)
+                cols.append(spc_idx_dct[name])
+                vals.append(eff - 1.0)
+    eff_deltas = scipy.sparse.coo_matrix(
+        (vals, (rows, cols)), shape=(len(rxns), len(names))).tocsr()
+
+    thm_data = None
+    if thm_arrays is not None:
+        thm_names, tmps, cfts = thm_arrays
+        thm_idx_dct = {name: idx for idx, name in enumerate(thm_names)}
+        thm_data = (np.full((len(names), 3), np.nan),
+                    np.full((len(names), 2, 7), np.nan))
+        for idx, name in enumerate(names):
+            if name in thm_idx_dct:
+                thm_data[0][idx] = tmps[thm_idx_dct[name]]
+                thm_data[1][idx] = cfts[thm_idx_dct[name]]
+
+    return ProductionMechanism(
+        cmech=cmech, rxn_units=rxn_units, names=names,
+        rct_stoich=rct_stoich, prd_stoich=prd_stoich, net_stoich=net_stoich,
+        rct_idxs=_padded_idxs(
+            [rxn.reactants for rxn in rxns], spc_idx_dct),
+        prd_idxs=_padded_idxs(
+            [rxn.products for rxn in rxns], spc_idx_dct),
+        eff_deltas=eff_deltas,
+        third_body=np.array([rxn.third_body == '+M' for rxn in rxns],
+                            dtype=bool),
+        falloff=np.array([rxn.low_p is not None and rxn.plog is None and
+                          rxn.chebyshev is None for rxn in rxns],
+                         dtype=bool),
+        reversible=np.array([rxn.reversible for rxn in rxns], dtype=bool),
+        thermo=thm_data)
+
+
+def third_body_concentrations(pmech, concs):
+    """ the (nbatch, nrecords) effective third-body concentrations,
+        sum_i eff_i C_i, of a batch of (nbatch, nspecies) concentrations
+    """
+    concs = np.atleast_2d(np.asarray(concs, dtype=float))
+    return (concs.sum(axis=1)[:, np.newaxis] +
+            (pmech.eff_deltas @ concs.T).T)
+
+
+def rate_constants(pmech, temp, pressure, concs, t_ref=1.0):
+    """ the (nbatch, nrecords) forward and reverse rate constants of the
+        records for a batch of (nbatch, nspecies) concentrations, at one
+        temperature and pressure
+
+        PLOG and Chebyshev records are evaluated at the pressure, and
+        falloff records at the third-body concentration of each batch
+        entry, in the units of the rate constants (mol/cm3)
+    """
+    concs = np.atleast_2d(np.asarray(concs, dtype=float))
+    nbatch = concs.shape[0]
+    cmech = pmech.cmech
+    nrxns = len(cmech.rxns)
+
+    ktps = rates.dense_ktps(rates.mechanism_arrays(
+        rates.record_mechanism(cmech), pmech.rxn_units, t_ref, [temp],
+        [pressure]))
+    kfs = np.tile(ktps[:, 1, 0], (nbatch, 1))
+
+    if pmech.falloff.any():
+        fall_idxs = np.flatnonzero(pmech.falloff)
+        highp_ks = rates.arrhenius_rates(cmech.high_p, nrxns, [temp], t_ref)
+        lowp_ks = rates.arrhenius_rates(cmech.low_p, nrxns, [temp], t_ref)
+
+        # falloff_grid takes the bath gas concentration as P / RT, in
+        # mol/cm3; scale a unit pressure to each concentration
+        conc_ms = third_body_concentrations(pmech, concs)[:, fall_idxs]
+        m_factor = (conc_ms.T * RC_CM3 * temp)[:, :, np.newaxis]
+        fall_ktps = rates.falloff_rates(
+            [cmech.rxns[idx] for idx in fall_idxs],
+            highp_ks[fall_idxs], lowp_ks[fall_idxs], np.ones(nbatch),
+            [temp], m_factor=m_factor)
+        kfs[:, fall_idxs] = fall_ktps[:, :, 0].T
+
+    krs = np.zeros_like(kfs)
+    if pmech.reversible.any():
+        assert pmech.thermo is not None
+        k_equils = equilibrium.equilibrium_constants(
+            pmech.net_stoich, species_gibbs(pmech, temp), [temp])[:, 0]
+        krs[:, pmech.reversible] = (
+            kfs[:, pmech.reversible] / k_equils[pmech.reversible])
+
+    return kfs, krs
+
+
+def species_gibbs(pmech, temp):
+    """ the (nspecies, 1) Gibbs free energies of the species at a
+        temperature, in kcal/mol; NaN for species without thermo
+    """
+    tmps, cfts = pmech.thermo
+    return thermo.properties(cfts, tmps, [temp])[3]
+
+
+def rates_of_progress(pmech, temp, pressure, concs, t_ref=1.0):
+    """ the (nbatch, nrecords) net rates of progress of the records for a
+        batch of (nbatch, nspecies) concentrations, at one temperature
+        and pressure
+    """
+    concs = np.atleast_2d(np.asarray(concs, dtype=float))
+    kfs, krs = rate_constants(pmech, temp, pressure, concs, t_ref=t_ref)
+
+    # products of the reagent concentrations, with the padding giving 1
+    concs_ext = np.hstack([concs, np.ones((concs.shape[0], 1))])
+    rops = (kfs * np.prod(concs_ext[:, pmech.rct_idxs], axis=-1) -
+            krs * np.prod(concs_ext[:, pmech.prd_idxs], axis=-1))
+
+    if pmech.third_body.any():
+        conc_ms = third_body_concentrations(pmech, concs)
+        rops[:, pmech.third_body] *= conc_ms[:, pmech.third_body]
+
+    return rops
+
+
+def production_rates(pmech, temp, pressure, concs, t_ref=1.0):
+    """ the (nbatch, nspecies) net production rates of the species for a
+        batch of (nbatch, nspecies) concentrations, at one temperature
+        and pressure
+    """
+    rops = rates_of_progress(pmech, temp, pressure, concs, t_ref=t_ref)
+    return (pmech.net_stoich.T @ rops.T).T
+
+
+def jacobians(pmech, temp, pressure, concs, t_ref=1.0):
+    """ the analytic derivatives of the net production rates of a batch
+        of (nbatch, nspecies) concentrations, at one temperature and
+        pressure
+
+        returns a list of nbatch sparse (nspecies, nspecies) matrices of
+        the derivatives with respect to the concentrations, d wdot_i/dC_j,
+        and an (nbatch, nspecies) array of the derivatives with respect to
+        temperature at fixed concentrations, d wdot_i/dT
+    """
+    concs = np.atleast_2d(np.asarray(concs, dtype=float))
+    nbatch, nspc = concs.shape
+    cmech = pmech.cmech
+    nrxns = len(cmech.rxns)
+    kfs, krs = rate_constants(pmech, temp, pressure, concs, t_ref=t_ref)
+
+    # d ln kf/dT of each record, and d ln kf/d ln [M] of falloff records
+    dlnkf_dts = np.tile(
+        rates.record_dlnk_dts(cmech, pmech.rxn_units, t_ref, [temp],
+                              [pressure])[:, 1, 0], (nbatch, 1))
+    dlnkf_dlnms = np.zeros((nbatch, nrxns))
+    conc_ms = third_body_concentrations(pmech, concs)
+    if pmech.falloff.any():
+        fall_idxs = np.flatnonzero(pmech.falloff)
+        highp_ks = rates.arrhenius_rates(cmech.high_p, nrxns, [temp], t_ref)
+        lowp_ks = rates.arrhenius_rates(cmech.low_p, nrxns, [temp], t_ref)
+        highp_dk_dts = rates.arrhenius_rate_derivatives(
+            cmech.high_p, nrxns, [temp], t_ref)
+        lowp_dk_dts = rates.arrhenius_rate_derivatives(
+            cmech.low_p, nrxns, [temp], t_ref)
+        m_factor = (
+            conc_ms[:, fall_idxs].T * RC_CM3 * temp)[:, :, np.newaxis]
+        fall_dlnk_dts, fall_dlnk_dlnms = rates.falloff_rate_derivatives(
+            [cmech.rxns[idx] for idx in fall_idxs],
+            highp_ks[fall_idxs], lowp_ks[fall_idxs],
+            highp_dk_dts[fall_idxs] / highp_ks[fall_idxs],
+            lowp_dk_dts[fall_idxs] / lowp_ks[fall_idxs],
+            np.ones(nbatch), [temp], m_factor=m_factor)
+        dlnkf_dts[:, fall_idxs] = fall_dlnk_dts[:, :, 0].T
+        dlnkf_dlnms[:, fall_idxs] = fall_dlnk_dlnms[:, :, 0].T
+
+    # d ln Kc/dT = dH/RT^2 - dn/T, by the Gibbs-Helmholtz equation
+    dlnkr_dts = dlnkf_dts.copy()
+    if pmech.reversible.any():
+        tmps, cfts = pmech.thermo
+        enthalpies = thermo.properties(cfts, tmps, [temp])[0][:, 0]
+        dlnkc_dts = (
+            (pmech.net_stoich @ enthalpies) /
+            (equilibrium.RC * temp**2) -
+            np.asarray(pmech.net_stoich.sum(axis=1)).ravel() / temp)
+        dlnkr_dts[:, pmech.reversible] -= dlnkc_dts[pmech.reversible]
+
+    # products of the reagent concentrations, with the padding giving 1
+    concs_ext = np.hstack([concs, np.ones((nbatch, 1))])
+    rct_prods = np.prod(concs_ext[:, pmech.rct_idxs], axis=-1)
+    prd_prods = np.prod(concs_ext[:, pmech.prd_idxs], axis=-1)
+    tb_facs = np.where(pmech.third_body, conc_ms, 1.0)
+    net_rops = kfs * rct_prods - krs * prd_prods
+
+    drop_dts = tb_facs * (kfs * dlnkf_dts * rct_prods -
+                          krs * dlnkr_dts * prd_prods)
+    dwdot_dts = (pmech.net_stoich.T @ drop_dts.T).T
+
+    # the rates of progress of third-body and falloff records depend on
+    # every species through [M] = sum_j E_rj C_j
+    m_coeffs = np.where(pmech.third_body, net_rops, 0.0)
+    m_coeffs[:, pmech.falloff] += (
+        dlnkf_dlnms[:, pmech.falloff] * net_rops[:, pmech.falloff] /
+        conc_ms[:, pmech.falloff])
+    m_rows = pmech.third_body | pmech.falloff
+    m_idxs = np.flatnonzero(m_rows)
+    m_ones = scipy.sparse.coo_matrix(
+        (np.ones(len(m_idxs) * nspc),
+         (np.repeat(m_idxs, nspc), np.tile(np.arange(nspc), len(m_idxs)))),
+        shape=(nrxns, nspc))
+    effs = (scipy.sparse.diags(m_rows.astype(float)) @
+            (pmech.eff_deltas + m_ones)).tocsr()
+    effs.eliminate_zeros()
+
+    # mass action terms: each reagent position differentiates to the
+    # product of the others, so repeated reagents count once per position
+    rct_terms = _mass_action_terms(concs_ext, pmech.rct_idxs,
+                                   tb_facs * kfs)
+    prd_terms = _mass_action_terms(concs_ext, pmech.prd_idxs,
+                                   -tb_facs * krs)
+    rows = np.concatenate([
+        np.repeat(np.arange(nrxns), pmech.rct_idxs.shape[1]),
+        np.repeat(np.arange(nrxns), pmech.prd_idxs.shape[1])])
+    cols = np.concatenate([pmech.rct_idxs.ravel(), pmech.prd_idxs.ravel()])
+    keep = cols < nspc
+    rows, cols = rows[keep], cols[keep]
+
+    jacs = []
+    for idx in range(nbatch):
+        vals = np.concatenate(
+            [rct_terms[idx].ravel(), prd_terms[idx].ravel()])[keep]
+        drop_dcs = (
+            scipy.sparse.coo_matrix(
+                (vals, (rows, cols)), shape=(nrxns, nspc)).tocsr() +
+            scipy.sparse.diags(m_coeffs[idx]) @ effs)
+        jacs.append((pmech.net_stoich.T @ drop_dcs).tocsr())
+
+    return jacs, dwdot_dts
+
+
+def _mass_action_terms(concs_ext, rgt_idxs, rate_ks):
+    """ the (nbatch, nrecords, max reagents) derivatives of k prod_i C_i
+        with respect to the reagent at each position
+    """
+    rgt_concs = concs_ext[:, rgt_idxs]
+    terms = np.empty_like(rgt_concs)
+    for pos in range(rgt_idxs.shape[1]):
+        terms[:, :, pos] = np.prod(np.delete(rgt_concs, pos, axis=-1),
+                                   axis=-1)
+    return terms * rate_ks[:, :, np.newaxis]
+
+
+def _padded_idxs(rgts_lst, spc_idx_dct):
+    """ an (nrecords, max reagents) array of the species index of each
+        reagent, padded with the number of species
+    """
+    nspc = len(spc_idx_dct)
+    width = max([len(rgts) for rgts in rgts_lst] + [1])
+    idxs = np.full((len(rgts_lst), width), nspc, dtype=int)
+    for row, rgts in enumerate(rgts_lst):
+        idxs[row, :len(rgts)] = [spc_idx_dct[rgt] for rgt in rgts]
+    return idxs
@@ -2,6 +2,8 @@
 """
 
 
+import collections
+import collections.abc
 import numpy as np
 from qcelemental import constants as qcc
 import ratefit
@@ -14,66 +16,501 @@ CAL2KCAL = qcc.conversion_factor('cal/mol', 'kcal/mol')
 J2KCAL = qcc.conversion_factor('J/mol', 'kcal/mol')
 KJ2KCAL = qcc.conversion_factor('kJ/mol', 'kcal/mol')
 KEL2KCAL = qcc.conversion_factor('kelvin', 'kcal/mol')
+RC = ratefit.fxns.RC
+
+# Arrhenius expressions of a mechanism, one entry per expression; idxs gives
+# the Reaction record each expression belongs to
+ArrheniusArrays = collections.namedtuple(
+    'ArrheniusArrays', ['a', 'n', 'ea', 'idxs'])
+
+# Reaction records of a mechanism with the Arrhenius arrays of their high-
+# and low-pressure parameters; duplicate records, and records written in
+# reverse, share an entry in rxn_keys, given for each record by rxn_idxs
+CompiledMechanism = collections.namedtuple(
+    'CompiledMechanism',
+    ['rxns', 'rxn_keys', 'rxn_idxs', 'high_p', 'low_p'])
+
+# PLOG expressions of the records of a mechanism, one entry per expression,
+# ordered by record, then by plog pressure; idxs gives the record and
+# pressures the plog pressure of each expression
+PlogArrays = collections.namedtuple(
+    'PlogArrays', ['a', 'n', 'ea', 'idxs', 'pressures'])
+
+# Rate constants of a mechanism as a (nreactions, ntemps) array of the
+# high-pressure rate constants of every reaction and a (npdep, npressures,
+# ntemps) array of the rate constants of the npdep reactions with
+# pressure-dependent rate constants, flagged by pdep; pdep_rows gives the
+# row of each reaction in the second array, or -1, and the index maps give
+# the rows of the reaction keys and the columns of 'high' (always 0) and
+# of each pressure in the full grid of dense_ktps
+KTPArrays = collections.namedtuple(
+    'KTPArrays',
+    ['high_ktps', 'pdep_ktps', 'pdep_rows', 'rxn_idx_dct', 'press_idx_dct',
+     'pdep'])
+
+
+class KTPView(collections.abc.Mapping):
+    """ read-only view of a KTPArrays tensor with the layout of the
+        dictionary returned by mechanism: reaction key -> {'high' or
+        pressure -> rate constants}; the rate constants are views into
+        the tensor, so nothing is copied
+    """
+
+    def __init__(self, ktp_arrays):
+        self.arrays = ktp_arrays
+
+    def __getitem__(self, rxn_key):
+        return _ReactionKTPView(
+            self.arrays, self.arrays.rxn_idx_dct[rxn_key])
+
+    def __iter__(self):
+        return iter(self.arrays.rxn_idx_dct)
+
+    def __len__(self):
+        return len(self.arrays.rxn_idx_dct)
+
+
+class _ReactionKTPView(collections.abc.Mapping):
+    """ read-only view of the rate constants of one reaction in a
+        KTPArrays tensor
+    """
+
+    def __init__(self, ktp_arrays, rxn_idx):
+        self.arrays = ktp_arrays
+        self.rxn_idx = rxn_idx
+
+    def __getitem__(self, pressure):
+        if pressure == 'high':
+            return self.arrays.high_ktps[self.rxn_idx]
+        if not self.arrays.pdep[self.rxn_idx]:
+            raise KeyError(pressure)
+        press_idx = self.arrays.press_idx_dct[pressure]
+        return self.arrays.pdep_ktps[
+            self.arrays.pdep_rows[self.rxn_idx], press_idx - 1]
+
+    def __iter__(self):
+        if self.arrays.pdep[self.rxn_idx]:
+            return iter(self.arrays.press_idx_dct)
+        return iter(('high',))
+
+    def __len__(self):
+        if self.arrays.pdep[self.rxn_idx]:
+            return len(self.arrays.press_idx_dct)
+        return 1
 
 
-def mechanism(rxn_block, rxn_units, t_ref, temps, pressures):
-    """ calculate the reactions rates for a whole block via a dict
+def mechanism(rxn_block, rxn_units, t_ref, temps, pressures,
+              mol_fracs=None, output='dct'):
+    """ calculate the reactions rates for a whole block via a dict;
+        the block may also be given as a sequence of Reaction records
+
+        mol_fracs, a dictionary of bath gas mole fractions, applies the
+        third-body efficiencies of each falloff reaction
+
+        output='array' gives the rates as KTPArrays and output='view'
+        gives a KTPView of them, which reads like the dict
     """
+    cmech = compiled_mechanism(rxn_block, rxn_units)
+    if output == 'array':
+        return mechanism_arrays(
+            cmech, rxn_units, t_ref, temps, pressures, mol_fracs=mol_fracs)
+    if output == 'view':
+        return KTPView(mechanism_arrays(
+            cmech, rxn_units, t_ref, temps, pressures, mol_fracs=mol_fracs))
+    if output != 'dct':
+        raise NotImplementedError
+    highp_ks = arrhenius_rates(cmech.high_p, len(cmech.rxns), temps, t_ref)
+    lowp_ks = arrhenius_rates(cmech.low_p, len(cmech.rxns), temps, t_ref)
 
-    reaction_data_strings = rxn_parser.data_strings(rxn_block)
     mech_dct = {}
-    for dstr in reaction_data_strings:
-        rct_names = rxn_parser.reactant_names(dstr)
-        prd_names = rxn_parser.product_names(dstr)
-        rxn = (rct_names, prd_names)
-        rxn_rev = (prd_names, rct_names)
-        if rxn not in mech_dct and rxn_rev not in mech_dct:
-            mech_dct[rxn] = reaction(dstr, rxn_units,
-                                     t_ref, temps, pressures=pressures)
-        elif rxn in mech_dct and rxn_rev not in mech_dct:
-            new_ktp_dct = reaction(dstr, rxn_units,
-                                   t_ref, temps, pressures=pressures)
-            mech_dct[rxn] = _add_rates(mech_dct[rxn], new_ktp_dct)
-        elif rxn not in mech_dct and rxn_rev in mech_dct:
-            new_ktp_dct = reaction(dstr, rxn_units,
-                                   t_ref, temps, pressures=pressures)
-            mech_dct[rxn_rev] = _add_rates(mech_dct[rxn_rev], new_ktp_dct)
-
-    # ktp_dct = {}
-    # for name, rxn_dstr in rxn_dct.items():
-    #     ktp_dct[name] = reaction(
-    #         rxn_dstr, rxn_units, t_ref, temps, pressures=pressures)
+    for idx, rxn in enumerate(cmech.rxns):
+        rxn_key = cmech.rxn_keys[cmech.rxn_idxs[idx]]
+        ktp_dct = {'high': highp_ks[idx]}
+        ktp_dct.update(_pressure_dependence(
+            rxn, rxn_units, t_ref, temps, pressures,
+            highp_ks[idx], lowp_ks[idx], mol_fracs=mol_fracs))
+        if rxn_key not in mech_dct:
+            mech_dct[rxn_key] = ktp_dct
+        else:
+            mech_dct[rxn_key] = _add_rates(mech_dct[rxn_key], ktp_dct)
 
     return mech_dct
 
 
-def reaction(rxn_str, rxn_units, t_ref, temps, pressures=None):
-    """ calculate the rate constant using the rxn_string
+def mechanism_arrays(cmech, rxn_units, t_ref, temps, pressures,
+                     mol_fracs=None):
+    """ calculate the reactions rates of a compiled mechanism as
+        KTPArrays, evaluating each functional form for all of its
+        reactions at once; duplicate records are summed, and a
+        pressure-independent record adds its high-pressure rate constants
+        to every pressure of a pressure-dependent duplicate
+    """
+    temps = np.asarray(temps, dtype=float)
+    if pressures is None:
+        pressures = ()
+    nrxns = len(cmech.rxns)
+    npress = len(pressures)
+
+    highp_ks = arrhenius_rates(cmech.high_p, nrxns, temps, t_ref)
+    lowp_ks = arrhenius_rates(cmech.low_p, nrxns, temps, t_ref)
+
+    plog_idxs, cheb_idxs, fall_idxs = pdep_idxs(cmech)
+    pdep = np.zeros(nrxns, dtype=bool)
+    pdep[plog_idxs + cheb_idxs + fall_idxs] = True
+    if pdep.any():
+        assert npress > 0
+    rxn_pdep = np.zeros(len(cmech.rxn_keys), dtype=bool)
+    np.logical_or.at(rxn_pdep, cmech.rxn_idxs, pdep)
+    pdep_rows = np.where(rxn_pdep, np.cumsum(rxn_pdep) - 1, -1)
+
+    # Records are summed straight into the rows of their reactions; only
+    # the pressure-dependent reactions have pressure columns
+    high_ktps = np.zeros((len(cmech.rxn_keys), len(temps)))
+    pdep_ktps = np.zeros((rxn_pdep.sum(), npress, len(temps)))
+    rec_rows = pdep_rows[cmech.rxn_idxs]
+    _add_rows(high_ktps, cmech.rxn_idxs, highp_ks)
+    idxs = np.flatnonzero(~pdep & (rec_rows >= 0))
+    _add_rows(pdep_ktps, rec_rows[idxs], highp_ks[idxs, np.newaxis, :])
+
+    for idx in plog_idxs:
+        plog_params = {
+            pressure: _update_params_units(params, rxn_units)
+            for pressure, params in cmech.rxns[idx].plog.items()}
+        pdep_ktps[rec_rows[idx]] += ratefit.fxns.plog_grid(
+            plog_params, t_ref, pressures, temps)
+
+    if cheb_idxs:
+        cheb_dcts = [cmech.rxns[idx].chebyshev for idx in cheb_idxs]
+        cheb_ktps = ratefit.fxns.chebyshev_batch(
+            [cheb_dct['alpha_elm'] for cheb_dct in cheb_dcts],
+            [cheb_dct['t_limits'] for cheb_dct in cheb_dcts],
+            [cheb_dct['p_limits'] for cheb_dct in cheb_dcts],
+            pressures, temps)
+        _add_rows(pdep_ktps, rec_rows[cheb_idxs], cheb_ktps)
+
+    if fall_idxs:
+        m_factor = _column([third_body_factor(cmech.rxns[idx].buffer,
+                                              mol_fracs)
+                            for idx in fall_idxs])
+        falloff_ktps = falloff_rates(
+            [cmech.rxns[idx] for idx in fall_idxs],
+            highp_ks[fall_idxs], lowp_ks[fall_idxs], pressures, temps,
+            m_factor=m_factor)
+        _add_rows(pdep_ktps, rec_rows[fall_idxs], falloff_ktps)
+
+    rxn_idx_dct = {key: idx for idx, key in enumerate(cmech.rxn_keys)}
+    press_idx_dct = {'high': 0}
+    press_idx_dct.update(
+        {pressure: idx + 1 for idx, pressure in enumerate(pressures)})
+
+    return KTPArrays(
+        high_ktps=high_ktps, pdep_ktps=pdep_ktps, pdep_rows=pdep_rows,
+        rxn_idx_dct=rxn_idx_dct, press_idx_dct=press_idx_dct,
+        pdep=rxn_pdep)
+
+
+def dense_ktps(ktp_arrays):
+    """ the rate constants of KTPArrays as one (nreactions, npressures+1,
+        ntemps) array, with the high-pressure rate constants in column 0
+        and, for the pressure-independent reactions, in every pressure
+        column
+    """
+    npress = len(ktp_arrays.press_idx_dct) - 1
+    ktps = np.repeat(ktp_arrays.high_ktps[:, np.newaxis, :], npress + 1,
+                     axis=1)
+    ktps[ktp_arrays.pdep, 1:] = ktp_arrays.pdep_ktps
+    return ktps
+
+
+def record_dlnk_dts(cmech, rxn_units, t_ref, temps, pressures,
+                    mol_fracs=None):
+    """ the temperature derivatives of the log of the rate constants of
+        each record of a compiled mechanism, d ln k / dT, as one
+        (nrecords, npressures+1, ntemps) array laid out as the
+        dense_ktps of mechanism_arrays over record_mechanism
+
+        the derivatives of falloff records are taken at a fixed bath gas
+        concentration
+    """
+    temps = np.asarray(temps, dtype=float)
+    if pressures is None:
+        pressures = ()
+    nrxns = len(cmech.rxns)
+
+    highp_ks = arrhenius_rates(cmech.high_p, nrxns, temps, t_ref)
+    highp_dlnks = _dlnks(
+        arrhenius_rate_derivatives(cmech.high_p, nrxns, temps, t_ref),
+        highp_ks)
+    dlnktps = np.repeat(highp_dlnks[:, np.newaxis, :], len(pressures) + 1,
+                        axis=1)
+
+    plog_idxs, cheb_idxs, fall_idxs = pdep_idxs(cmech)
+    for idx in plog_idxs:
+        plog_params = {
+            pressure: _update_params_units(params, rxn_units)
+            for pressure, params in cmech.rxns[idx].plog.items()}
+        dlnktps[idx, 1:] = ratefit.fxns.plog_grid_dlnk_dt(
+            plog_params, t_ref, pressures, temps)
+
+    if cheb_idxs:
+        cheb_dcts = [cmech.rxns[idx].chebyshev for idx in cheb_idxs]
+        dlnktps[cheb_idxs, 1:] = ratefit.fxns.chebyshev_batch_dlnk_dt(
+            [cheb_dct['alpha_elm'] for cheb_dct in cheb_dcts],
+            [cheb_dct['t_limits'] for cheb_dct in cheb_dcts],
+            [cheb_dct['p_limits'] for cheb_dct in cheb_dcts],
+            pressures, temps)
+
+    if fall_idxs:
+        lowp_ks = arrhenius_rates(cmech.low_p, nrxns, temps, t_ref)
+        lowp_dlnks = _dlnks(
+            arrhenius_rate_derivatives(cmech.low_p, nrxns, temps, t_ref),
+            lowp_ks)
+        m_factor = _column([third_body_factor(cmech.rxns[idx].buffer,
+                                              mol_fracs)
+                            for idx in fall_idxs])
+        dlnktps[fall_idxs, 1:], _ = falloff_rate_derivatives(
+            [cmech.rxns[idx] for idx in fall_idxs],
+            highp_ks[fall_idxs], lowp_ks[fall_idxs],
+            highp_dlnks[fall_idxs], lowp_dlnks[fall_idxs],
+            pressures, temps, m_factor=m_factor)
+
+    return dlnktps
+
+
+def compiled_mechanism(rxn_block, rxn_units):
+    """ collect the high- and low-pressure Arrhenius parameters of a whole
+        block into arrays, converted to kcal/mol and per-mole units;
+        the block may also be given as a sequence of Reaction records
+
+        double Arrhenius parameters give two expressions for one record
+    """
+    if isinstance(rxn_block, str):
+        rxns = tuple(rxn_parser.data_records(rxn_block))
+    else:
+        rxns = tuple(rxn_block)
+
+    rxn_keys = []
+    rxn_idxs = []
+    key_idx_dct = {}
+    for rxn in rxns:
+        rxn_key = (rxn.reactants, rxn.products)
+        rxn_rev = (rxn.products, rxn.reactants)
+        if rxn_key not in key_idx_dct and rxn_rev not in key_idx_dct:
+            key_idx_dct[rxn_key] = len(rxn_keys)
+            rxn_keys.append(rxn_key)
+        rxn_idxs.append(key_idx_dct.get(rxn_key, key_idx_dct.get(rxn_rev)))
+
+    a_conv_factor, ea_conv_factor = _unit_factors(rxn_units)
+    high_p = _arrhenius_arrays(
+        [rxn.high_p for rxn in rxns], a_conv_factor, ea_conv_factor)
+    low_p = _arrhenius_arrays(
+        [rxn.low_p for rxn in rxns], a_conv_factor, ea_conv_factor)
+
+    return CompiledMechanism(
+        rxns=rxns, rxn_keys=tuple(rxn_keys),
+        rxn_idxs=np.array(rxn_idxs, dtype=int),
+        high_p=high_p, low_p=low_p)
+
+
+def plog_arrays(cmech, rxn_units):
+    """ collect the PLOG parameters of a compiled mechanism into arrays,
+        converted to kcal/mol and per-mole units as its Arrhenius arrays
+    """
+    params_lst, rec_idxs, plog_pressures = [], [], []
+    for idx, rxn in enumerate(cmech.rxns):
+        if rxn.plog is not None:
+            for pressure in sorted(rxn.plog):
+                params_lst.append(rxn.plog[pressure])
+                rec_idxs.append(idx)
+                plog_pressures.append(pressure)
+
+    a_conv_factor, ea_conv_factor = _unit_factors(rxn_units)
+    arr_arrays = _arrhenius_arrays(params_lst, a_conv_factor, ea_conv_factor)
+
+    return PlogArrays(
+        a=arr_arrays.a, n=arr_arrays.n, ea=arr_arrays.ea,
+        idxs=np.array(rec_idxs, dtype=int)[arr_arrays.idxs],
+        pressures=np.array(plog_pressures, dtype=float)[arr_arrays.idxs])
+
+
+def pdep_idxs(cmech):
+    """ the indices of the PLOG, Chebyshev and falloff records of a
+        compiled mechanism
+    """
+    plog_idxs, cheb_idxs, fall_idxs = [], [], []
+    for idx, rxn in enumerate(cmech.rxns):
+        if rxn.plog is not None:
+            plog_idxs.append(idx)
+        elif rxn.chebyshev is not None:
+            cheb_idxs.append(idx)
+        elif rxn.low_p is not None:
+            fall_idxs.append(idx)
+    return plog_idxs, cheb_idxs, fall_idxs
+
+
+def record_mechanism(cmech):
+    """ the compiled mechanism with one reaction per record, keyed by the
+        record indices, so that mechanism_arrays gives the rate constants
+        of each record rather than of each reaction
+    """
+    nrxns = len(cmech.rxns)
+    return cmech._replace(
+        rxn_keys=tuple(range(nrxns)), rxn_idxs=np.arange(nrxns))
+
+
+def falloff_rates(rxns, highp_ks, lowp_ks, pressures, temps, m_factor=1.0):
+    """ calculate the rate constants of a set of Lindemann, Troe and SRI
+        records from their (nrxns, ntemps) high- and low-pressure rate
+        constants, as one (nrxns, npressures, ntemps) array
+
+        m_factor scales the bath gas concentration; it may be a scalar or
+        an array broadcasting against the (nrxns, npressures, ntemps) grid
+    """
+    pressures = np.asarray(pressures, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+    highp_ks = np.asarray(highp_ks, dtype=float).reshape(len(rxns), -1)
+    lowp_ks = np.asarray(lowp_ks, dtype=float).reshape(len(rxns), -1)
+    m_factor = np.asarray(m_factor, dtype=float)
+    ktps = np.zeros((len(rxns), len(pressures), len(temps)))
+
+    for idxs, troe_params, sri_params in _falloff_groups(rxns):
+        ktps[idxs] = ratefit.fxns.falloff_grid(
+            highp_ks[idxs], lowp_ks[idxs], pressures, temps,
+            troe_params=troe_params, sri_params=sri_params,
+            m_factor=_group_m_factor(m_factor, idxs, len(rxns)))
+
+    return ktps
+
+
+def falloff_rate_derivatives(rxns, highp_ks, lowp_ks, highp_dlnks,
+                             lowp_dlnks, pressures, temps, m_factor=1.0):
+    """ the derivatives of the log of the rate constants of falloff_rates
+        with respect to temperature, at a fixed bath gas concentration,
+        and with respect to the log of the bath gas concentration, as two
+        (nrxns, npressures, ntemps) arrays
+
+        highp_dlnks and lowp_dlnks are the (nrxns, ntemps) d ln k / dT of
+        the high- and low-pressure rate constants
+    """
+    pressures = np.asarray(pressures, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+    shape = (len(rxns), -1)
+    highp_ks = np.asarray(highp_ks, dtype=float).reshape(shape)
+    lowp_ks = np.asarray(lowp_ks, dtype=float).reshape(shape)
+    highp_dlnks = np.asarray(highp_dlnks, dtype=float).reshape(shape)
+    lowp_dlnks = np.asarray(lowp_dlnks, dtype=float).reshape(shape)
+    m_factor = np.asarray(m_factor, dtype=float)
+    dlnk_dts = np.zeros((len(rxns), len(pressures), len(temps)))
+    dlnk_dlnms = np.zeros((len(rxns), len(pressures), len(temps)))
+
+    for idxs, troe_params, sri_params in _falloff_groups(rxns):
+        dlnk_dts[idxs], dlnk_dlnms[idxs] = (
+            ratefit.fxns.falloff_grid_derivatives(
+                highp_ks[idxs], lowp_ks[idxs], highp_dlnks[idxs],
+                lowp_dlnks[idxs], pressures, temps,
+                troe_params=troe_params, sri_params=sri_params,
+                m_factor=_group_m_factor(m_factor, idxs, len(rxns))))
+
+    return dlnk_dts, dlnk_dlnms
+
+
+def arrhenius_rates(arr_arrays, nrxns, temps, t_ref):
+    """ calculate the rate constants of every expression in a set of
+        Arrhenius arrays at once, summed into an (nrxns, ntemps) array
+        indexed by record; records without an expression are zero
+    """
+    expr_ks = _expression_rates(arr_arrays, temps, t_ref)
+    return _record_sums(arr_arrays.idxs, expr_ks, nrxns)
+
+
+def arrhenius_rate_derivatives(arr_arrays, nrxns, temps, t_ref):
+    """ calculate the temperature derivatives of the rate constants of
+        arrhenius_rates, dk/dT, summed into an (nrxns, ntemps) array
+    """
+    temps = np.asarray(temps, dtype=float)
+    expr_ks = _expression_rates(arr_arrays, temps, t_ref)
+
+    # dk/dT = k (n/T + Ea/RT^2) for every expression
+    expr_dk_dts = expr_ks * (arr_arrays.n[:, np.newaxis] / temps +
+                             arr_arrays.ea[:, np.newaxis] / (RC * temps**2))
+
+    return _record_sums(arr_arrays.idxs, expr_dk_dts, nrxns)
+
+
+def reduced_rates(cmech, rate_ks):
+    """ sum an (nrecords, ...) array of record rates over the duplicate
+        records of a compiled mechanism, giving an (nreactions, ...) array
+        ordered as its reaction keys
+    """
+    rate_ks = np.asarray(rate_ks)
+    rxn_ks = np.zeros((len(cmech.rxn_keys),) + rate_ks.shape[1:])
+    np.add.at(rxn_ks, cmech.rxn_idxs, rate_ks)
+    return rxn_ks
+
+
+def reaction(rxn, rxn_units, t_ref, temps, pressures=None,
+             mol_fracs=None):
+    """ calculate the rate constant using a Reaction record
+        or a reaction string, which is parsed into one
+
+        mol_fracs, a dictionary of bath gas mole fractions, applies the
+        third-body efficiencies of a falloff reaction
     """
     rate_constants = {}
 
-    # Accepts a params dictionary
-    # Read the parameters from the reactions string
-    highp_params = rxn_parser.high_p_parameters(rxn_str)
-    lowp_params = rxn_parser.low_p_parameters(rxn_str)
-    troe_params = rxn_parser.troe_parameters(rxn_str)
-    chebyshev_params = rxn_parser.chebyshev_parameters(rxn_str)
-    plog_params = rxn_parser.plog_parameters(rxn_str)
-    # print(highp_params)
-    # print(lowp_params)
-    # print(troe_params)
-    # print(chebyshev_params)
-    # print(plog_params)
+    # Read the parameters from the reactions string, if not parsed yet
+    if isinstance(rxn, str):
+        rxn = rxn_parser.data_record(rxn)
 
     # Calculate high_pressure rates
-    highp_ks = _arrhenius(highp_params, temps, t_ref, rxn_units)
+    highp_ks = _arrhenius(rxn.high_p, temps, t_ref, rxn_units)
     rate_constants['high'] = highp_ks
 
     # Calculate pressure-dependent rate constants based on discovered params
-    # Either (1) Plog, (2) Chebyshev, (3) Lindemann, or (4) Troe
+    lowp_ks = None
+    if rxn.low_p is not None:
+        lowp_ks = _arrhenius(rxn.low_p, temps, t_ref, rxn_units)
+    pdep_dct = _pressure_dependence(
+        rxn, rxn_units, t_ref, temps, pressures, highp_ks, lowp_ks,
+        mol_fracs=mol_fracs)
+
+    # Build the rate constants dictionary with the pdep dict
+    if pdep_dct:
+        rate_constants.update(pdep_dct)
+
+    return rate_constants
+
+
+def third_body_factor(buffer_dct, mol_fracs=None):
+    """ factor scaling the bath gas concentration of a reaction by the
+        third-body efficiencies of its bath gas enhancement factors,
+        sum_i eff_i x_i, with an efficiency of 1 for species without a
+        factor; 1 if no mole fractions are given
+    """
+    if mol_fracs is None:
+        m_factor = 1.0
+    else:
+        buffer_dct = buffer_dct if buffer_dct is not None else {}
+        m_factor = sum(buffer_dct.get(name, 1.0) * frac
+                       for name, frac in mol_fracs.items())
+
+    return m_factor
+
+
+def _pressure_dependence(rxn, rxn_units, t_ref, temps, pressures,
+                         highp_ks, lowp_ks, mol_fracs=None):
+    """ calculate the pressure-dependent rate constants of a record
+        from its high- and low-pressure rate constants
+    """
+    troe_params = rxn.troe
+    sri_params = rxn.sri
+    chebyshev_params = rxn.chebyshev
+    plog_params = rxn.plog
+
+    # Either (1) Plog, (2) Chebyshev, (3) Lindemann, (4) Troe, or (5) SRI
     # Update units if necessary
     if any(params is not None
-           for params in (plog_params, chebyshev_params, lowp_params)):
+           for params in (plog_params, chebyshev_params, rxn.low_p)):
         assert pressures is not None
 
     pdep_dct = {}
@@ -83,28 +520,33 @@ def reaction(rxn_str, rxn_units, t_ref, temps, pressures=None):
     elif chebyshev_params is not None:
         pdep_dct = _chebyshev(chebyshev_params, pressures, temps)
 
-    elif lowp_params is not None:
-        lowp_ks = _arrhenius(lowp_params, temps, t_ref, rxn_units)
+    elif rxn.low_p is not None:
+        m_factor = third_body_factor(rxn.buffer, mol_fracs)
         if troe_params is not None:
             pdep_dct = _troe(troe_params, highp_ks, lowp_ks,
-                             pressures, temps)
+                             pressures, temps, m_factor=m_factor)
+        elif sri_params is not None:
+            pdep_dct = ratefit.fxns.sri(
+                highp_ks, lowp_ks, pressures, temps, *sri_params,
+                m_factor=m_factor)
         else:
             pdep_dct = ratefit.fxns.lindemann(
-                highp_ks, lowp_ks, pressures, temps)
-
-    # Build the rate constants dictionary with the pdep dict
-    if pdep_dct:
-        rate_constants.update(pdep_dct)
+                highp_ks, lowp_ks, pressures, temps, m_factor=m_factor)
 
-    return rate_constants
+    return pdep_dct
 
 
 def _add_rates(ktp_dct1, ktp_dct2):
-    """ add the rates of two dictionaries together
+    """ add the rates of two dictionaries together over the union of
+        their pressures; a dictionary without a pressure adds its
+        high-pressure rates there
     """
-    for pressure in ktp_dct1:
-        ktp_dct1[pressure] += ktp_dct2[pressure]
-    return ktp_dct1
+    pressures = list(ktp_dct1) + [
+        pressure for pressure in ktp_dct2 if pressure not in ktp_dct1]
+    return {
+        pressure: (ktp_dct1.get(pressure, ktp_dct1['high']) +
+                   ktp_dct2.get(pressure, ktp_dct2['high']))
+        for pressure in pressures}
 
 
 def _arrhenius(arr_params, temps, t_ref, rxn_units):
@@ -120,8 +562,8 @@ def _arrhenius(arr_params, temps, t_ref, rxn_units):
 def _plog(plog_params, pressures, temps, t_ref, rxn_units):
     """ calc plog
     """
-    for pressure, params in plog_params.items():
-        plog_params[pressure] = _update_params_units(params, rxn_units)
+    plog_params = {pressure: _update_params_units(params, rxn_units)
+                   for pressure, params in plog_params.items()}
     pdep_dct = ratefit.fxns.plog(plog_params, t_ref, pressures, temps)
     return pdep_dct
 
@@ -139,7 +581,7 @@ def _chebyshev(chebyshev_params, pressures, temps):
     return pdep_dct
 
 
-def _troe(troe_params, highp_ks, lowp_ks, pressures, temps):
+def _troe(troe_params, highp_ks, lowp_ks, pressures, temps, m_factor=1.0):
     """ calc troe
     """
     if len(troe_params) == 3:
@@ -148,14 +590,132 @@ def _troe(troe_params, highp_ks, lowp_ks, pressures, temps):
         ts2 = troe_params[3]
     pdep_dct = ratefit.fxns.troe(
         highp_ks, lowp_ks, pressures, temps,
-        troe_params[0], troe_params[1], troe_params[2], ts2=ts2)
+        troe_params[0], troe_params[1], troe_params[2], ts2=ts2,
+        m_factor=m_factor)
     return pdep_dct
 
 
+def _add_rows(ktps, rxn_idxs, rec_ktps):
+    """ add the rate constants of a group of records to the rows of their
+        reactions
+    """
+    rxn_idxs = np.asarray(rxn_idxs, dtype=int)
+
+    # add in rounds of records with distinct reactions, as a buffered
+    # fancy-index addition only counts a repeated index once
+    rec_idxs = np.arange(len(rxn_idxs))
+    while rec_idxs.size:
+        _, firsts = np.unique(rxn_idxs[rec_idxs], return_index=True)
+        round_idxs = rec_idxs[firsts]
+        ktps[rxn_idxs[round_idxs]] += rec_ktps[round_idxs]
+        rec_idxs = np.delete(rec_idxs, firsts)
+
+
+def _expression_rates(arr_arrays, temps, t_ref):
+    """ the (nexpressions, ntemps) rate constants of each expression of a
+        set of Arrhenius arrays
+    """
+    temps = np.asarray(temps, dtype=float)
+
+    # ln k = ln A + n ln(T/Tref) - Ea/RT for every expression as one product
+    with np.errstate(divide='ignore'):
+        log_params = np.column_stack(
+            [np.log(np.abs(arr_arrays.a)), arr_arrays.n, -arr_arrays.ea])
+    temp_basis = np.vstack(
+        [np.ones_like(temps), np.log(temps / t_ref), 1.0 / (RC * temps)])
+    expr_ks = np.exp(log_params @ temp_basis)
+    expr_ks[arr_arrays.a < 0.0] *= -1.0
+
+    return expr_ks
+
+
+def _record_sums(expr_idxs, expr_vals, nrxns):
+    """ sum (nexpressions, ntemps) values of expressions into the
+        (nrxns, ntemps) values of their records
+    """
+    # one expression per record, in order, needs no summation
+    if np.array_equal(expr_idxs, np.arange(nrxns)):
+        return expr_vals
+    rec_vals = np.zeros((nrxns,) + expr_vals.shape[1:])
+    np.add.at(rec_vals, expr_idxs, expr_vals)
+    return rec_vals
+
+
+def _dlnks(dk_dts, rate_ks):
+    """ d ln k / dT from dk/dT, zero for records without a rate constant
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(rate_ks != 0.0, dk_dts / rate_ks, 0.0)
+
+
+def _falloff_groups(rxns):
+    """ the indices and the falloff params of the Lindemann, Troe and SRI
+        records of a set of falloff records, for each form present;
+        the params are broadcast as (nreactions, 1, 1) arrays
+    """
+    lind_idxs = [idx for idx, rxn in enumerate(rxns)
+                 if rxn.troe is None and rxn.sri is None]
+    troe_idxs = [idx for idx, rxn in enumerate(rxns) if rxn.troe is not None]
+    sri_idxs = [idx for idx, rxn in enumerate(rxns)
+                if rxn.troe is None and rxn.sri is not None]
+
+    groups = []
+    if lind_idxs:
+        groups.append((lind_idxs, None, None))
+    if troe_idxs:
+        troe_params = [
+            _column([rxns[idx].troe[num] for idx in troe_idxs])
+            for num in range(3)]
+        troe_params.append(_column(
+            [rxns[idx].troe[3] if len(rxns[idx].troe) == 4
+             else np.inf for idx in troe_idxs]))
+        groups.append((troe_idxs, troe_params, None))
+    if sri_idxs:
+        sri_params = [
+            _column([(tuple(rxns[idx].sri) + (1.0, 0.0))[num]
+                     for idx in sri_idxs])
+            for num in range(5)]
+        groups.append((sri_idxs, None, sri_params))
+
+    return groups
+
+
+def _group_m_factor(m_factor, idxs, nrxns):
+    """ the m_factor of a group of falloff records, sliced from a
+        per-reaction array
+    """
+    if m_factor.ndim == 3 and m_factor.shape[0] == nrxns:
+        return m_factor[idxs]
+    return m_factor
+
+
+def _column(vals):
+    """ an array of per-reaction values shaped to broadcast over
+        (nreactions, npressures, ntemps) grids
+    """
+    return np.array(vals, dtype=float).reshape(-1, 1, 1)
+
+
 def _update_params_units(params, rxn_units):
     """ change the units if necessary
         only needed for highp, lowp, and plog
     """
+    a_conv_factor, ea_conv_factor = _unit_factors(rxn_units)
+
+    # update units of params, leaving the parsed params untouched;
+    # params may hold several [a, n, ea] triples
+    if params is not None:
+        params = list(params)
+        for idx in range(0, len(params), 3):
+            params[idx] *= a_conv_factor
+            params[idx+2] *= ea_conv_factor
+
+    return params
+
+
+def _unit_factors(rxn_units):
+    """ conversion factors of the A and Ea units to per-mole and kcal/mol
+    """
     # Determine converstion factor for Ea Units
     ea_units = rxn_units[0]
     if ea_units == 'cal/mole':
@@ -175,9 +735,24 @@ def _update_params_units(params, rxn_units):
     else:
         a_conv_factor = 1.0
 
-    # update units of params
-    if params is not None:
-        params[0] *= a_conv_factor
-        params[2] *= ea_conv_factor
+    return a_conv_factor, ea_conv_factor
 
-    return params
+
+def _arrhenius_arrays(params_lst, a_conv_factor, ea_conv_factor):
+    """ Arrhenius arrays of the parameters of each record, skipping
+        records without parameters
+    """
+    rows = []
+    idxs = []
+    for idx, params in enumerate(params_lst):
+        if params is not None:
+            for start in range(0, len(params), 3):
+                rows.append(params[start:start+3])
+                idxs.append(idx)
+
+    rows = np.array(rows, dtype=float).reshape(-1, 3)
+    return ArrheniusArrays(
+        a=rows[:, 0] * a_conv_factor,
+        n=rows[:, 1],
+        ea=rows[:, 2] * ea_conv_factor,
+        idxs=np.array(idxs, dtype=int))
@@ -0,0 +1,190 @@
+""" skeletal reduction of mechanisms by directed relation graphs
+
+    the direct interaction coefficients of the species are found from the
+    rates of progress of the reactions at a set of sample states, with
+    sparse products over the stoichiometry of the mechanism; DRG keeps the
+    species reached from the target species through coefficients above a
+    threshold, and DRGEP keeps those whose path coefficient, the largest
+    product of the coefficients along a path from a target, is above it
+"""
+
+import heapq
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+from chemkin_io.parser import mechanism as mech_parser
+from chemkin_io.parser import thermo as thm_parser
+from chemkin_io.parser import submechanism
+from chemkin_io.parser import cache
+from chemkin_io.writer import mechanism as mech_writer
+from chemkin_io.calculator import production
+from chemkin_io.calculator import equilibrium
+
+
+RC_CM3 = equilibrium.RC_CM3
+
+
+def state_rates(pmech, states, t_ref=1.0):
+    """ the (nstates, nrecords) net rates of progress of the records of a
+        production mechanism at a set of (temperature, pressure, mole
+        fraction dictionary) states, in K, atm and mol/cm3 units; species
+        missing from a dictionary are absent
+    """
+    rops = []
+    for temp, pressure, mol_frac_dct in states:
+        mol_fracs = np.array(
+            [mol_frac_dct.get(name, 0.0) for name in pmech.names])
+        concs = mol_fracs * pressure / (RC_CM3 * temp)
+        rops.append(production.rates_of_progress(
+            pmech, temp, pressure, concs, t_ref=t_ref)[0])
+    return np.array(rops).reshape(len(rops), len(pmech.cmech.rxns))
+
+
+def interaction_coefficients(pmech, rops, method='drgep'):
+    """ the sparse (nspecies, nspecies) direct interaction coefficients of
+        the species of a production mechanism, r_AB for the dependence of
+        species A on species B, from (nstates, nrecords) rates of
+        progress; each coefficient is its largest over the states
+
+        method='drg' gives sum_i |nu_iA w_i| d_iB / sum_i |nu_iA w_i| and
+        method='drgep' gives |sum_i nu_iA w_i d_iB| / max(P_A, C_A), with
+        d_iB flagging the reactants and products of record i and P_A and
+        C_A the production and consumption rates of species A
+    """
+    assert method in ('drg', 'drgep')
+    rops = np.atleast_2d(np.asarray(rops, dtype=float))
+    nspc = len(pmech.names)
+    stoich = pmech.net_stoich.tocsr()
+    partic = (abs(pmech.rct_stoich) + abs(pmech.prd_stoich)).sign().tocsr()
+
+    coeffs = scipy.sparse.csr_matrix((nspc, nspc))
+    for state_rops in rops:
+        terms = scipy.sparse.diags(state_rops) @ stoich
+        if method == 'drg':
+            numers = abs(terms).T @ partic
+            denoms = np.asarray(abs(terms).sum(axis=0)).ravel()
+        else:
+            numers = abs(terms.T @ partic)
+            denoms = np.maximum(
+                np.asarray(terms.maximum(0.0).sum(axis=0)).ravel(),
+                np.asarray((-terms).maximum(0.0).sum(axis=0)).ravel())
+        inv_denoms = np.divide(1.0, denoms, out=np.zeros(nspc),
+                               where=denoms > 0.0)
+        coeffs = coeffs.maximum(scipy.sparse.diags(inv_denoms) @ numers)
+
+    coeffs = coeffs.tolil()
+    coeffs.setdiag(0.0)
+    coeffs = coeffs.tocsr()
+    coeffs.eliminate_zeros()
+
+    return coeffs
+
+
+def important_species(coeffs, names, targets, threshold, method='drgep'):
+    """ the names of the species kept for a set of target species and a
+        threshold on the interaction coefficients, in the order given
+    """
+    assert method in ('drg', 'drgep')
+    spc_idx_dct = {name: idx for idx, name in enumerate(names)}
+    target_idxs = [spc_idx_dct[name] for name in targets]
+
+    keep = np.zeros(len(names), dtype=bool)
+    if method == 'drg':
+        graph = scipy.sparse.csr_matrix(coeffs, copy=True)
+        graph.data = (graph.data >= threshold).astype(float)
+        graph.eliminate_zeros()
+        for idx in target_idxs:
+            keep[scipy.sparse.csgraph.breadth_first_order(
+                graph, idx, return_predecessors=False)] = True
+    else:
+        keep = path_coefficients(coeffs, target_idxs) >= threshold
+    keep[target_idxs] = True
+
+    return tuple(name for name, kept in zip(names, keep) if kept)
+
+
+def path_coefficients(coeffs, source_idxs):
+    """ the DRGEP path coefficients of every species from a set of source
+        species: the largest product of the interaction coefficients
+        along a path from any source, which is 1 for the sources
+
+        the coefficients are at most 1, so the products only shrink along
+        a path and Dijkstra's search on them finds the largest
+    """
+    coeffs = scipy.sparse.csr_matrix(coeffs)
+    path_coeffs = np.zeros(coeffs.shape[0])
+    path_coeffs[source_idxs] = 1.0
+    done = np.zeros(coeffs.shape[0], dtype=bool)
+
+    heap = [(-1.0, idx) for idx in source_idxs]
+    while heap:
+        neg_coeff, idx = heapq.heappop(heap)
+        if done[idx]:
+            continue
+        done[idx] = True
+        start, end = coeffs.indptr[idx], coeffs.indptr[idx+1]
+        for nbr, val in zip(coeffs.indices[start:end],
+                            coeffs.data[start:end]):
+            new_coeff = -neg_coeff * val
+            if new_coeff > path_coeffs[nbr]:
+                path_coeffs[nbr] = new_coeff
+                heapq.heappush(heap, (-new_coeff, nbr))
+
+    return path_coeffs
+
+
+def reduced_mechanism(mech_data, states, targets, threshold,
+                      method='drgep', keep_names=(), t_ref=1.0):
+    """ the skeletal mechanism of a mechanism, in the layout of
+        cache.mechanism_data, for a set of target species and a threshold,
+        from its rates at a set of (temperature, pressure, mole fraction
+        dictionary) states
+
+        the skeletal mechanism has the reactions of the parsed mechanism
+        with all of their reactants and products kept; keep_names, such as
+        bath gases, are kept whatever their coefficients
+    """
+    assert mech_data['reactions'] is not None
+    assert mech_data['thermo'] is not None
+    pmech = production.production_mechanism(
+        mech_data['reactions'], mech_data['units'],
+        thm_arrays=thm_parser.record_arrays(mech_data['thermo']))
+
+    rops = state_rates(pmech, states, t_ref=t_ref)
+    coeffs = interaction_coefficients(pmech, rops, method=method)
+    names = important_species(coeffs, pmech.names, targets, threshold,
+                              method=method)
+
+    return submechanism.extract(mech_data, names, keep_names=keep_names)
+
+
+def reduced_string(mech_str, states, targets, threshold, method='drgep',
+                   keep_names=(), t_ref=1.0, cache_dir=None):
+    """ the CHEMKIN string of the skeletal mechanism of a mechanism string,
+        as given by reduced_mechanism, with the elements block and the
+        thermo entries of its species in the column layout they were read
+        in
+    """
+    mech_data = cache.mechanism_data(mech_str, cache_dir=cache_dir)
+    sub_data = reduced_mechanism(
+        mech_data, states, targets, threshold, method=method,
+        keep_names=keep_names, t_ref=t_ref)
+
+    thm_str_dct = {
+        thm_parser.species_name(thm_str): thm_str
+        for thm_str in thm_parser.column_strings(
+            mech_parser.section(mech_str, 'thermo'))}
+
+    spc_names = sub_data['species']
+    if spc_names is None:
+        spc_names, _ = equilibrium.stoichiometric_matrix(
+            [(rxn.reactants, rxn.products)
+             for rxn in sub_data['reactions']])
+        spc_names = spc_names + tuple(
+            name for name in keep_names if name not in spc_names)
+
+    return mech_writer.string(
+        spc_names, sub_data['reactions'], sub_data['units'],
+        thm_strs=[thm_str_dct[thm_dat[0]]
+                  for thm_dat in sub_data['thermo']],
+        elm_block=mech_parser.elements_block(mech_str))
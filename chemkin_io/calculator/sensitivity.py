@@ -0,0 +1,125 @@
+""" closed-form sensitivities of the rate constants of a compiled mechanism
+    to its rate parameters
+"""
+
+import collections
+import numpy as np
+import ratefit
+from chemkin_io.calculator import rates
+
+
+RC = ratefit.fxns.RC
+
+# Derivatives of the (nrecords, npressures+1, ntemps) rate constants ktps
+# of each record, laid out as the dense_ktps of mechanism_arrays over
+# record_mechanism, with respect to the parameters of the compiled
+# mechanism, in its units; high_p and low_p are ArrheniusArrays and plog
+# is PlogArrays of (nexpressions, npressures+1, ntemps) derivatives by a,
+# n and ea, aligned with the expressions of the compiled mechanism and of
+# plog_arrays, and chebyshev is an (nchebyshev, nrows, ncols,
+# npressures+1, ntemps) array of derivatives by the zero-padded alpha
+# elements of the records cheb_idxs
+ParameterSensitivities = collections.namedtuple(
+    'ParameterSensitivities',
+    ['ktps', 'high_p', 'low_p', 'plog', 'chebyshev', 'cheb_idxs'])
+
+
+def parameter_sensitivities(cmech, rxn_units, t_ref, temps, pressures,
+                            mol_fracs=None):
+    """ the derivatives of the rate constants of every record of a
+        compiled mechanism with respect to each of its rate parameters,
+        over a grid of temperatures and pressures
+
+        a rate constant depends on the parameters of its own record only,
+        so each expression has the derivatives of the rate constants of
+        its record, given by idxs
+    """
+    temps = np.asarray(temps, dtype=float)
+    if pressures is None:
+        pressures = ()
+    pressures = np.asarray(pressures, dtype=float)
+    nrxns = len(cmech.rxns)
+    shape = (nrxns, len(pressures) + 1, len(temps))
+
+    ktps = rates.dense_ktps(rates.mechanism_arrays(
+        rates.record_mechanism(cmech), rxn_units, t_ref, temps, pressures,
+        mol_fracs=mol_fracs))
+    plog_idxs, cheb_idxs, fall_idxs = rates.pdep_idxs(cmech)
+
+    # dk/dk_expr of the records for their high- and low-pressure
+    # expressions; the 'high' column is always the high-pressure sum
+    high_wts = np.ones(shape)
+    high_wts[plog_idxs + cheb_idxs, 1:] = 0.0
+    low_wts = np.zeros(shape)
+    if fall_idxs:
+        highp_ks = rates.arrhenius_rates(cmech.high_p, nrxns, temps, t_ref)
+        lowp_ks = rates.arrhenius_rates(cmech.low_p, nrxns, temps, t_ref)
+        m_factor = np.array(
+            [rates.third_body_factor(cmech.rxns[idx].buffer, mol_fracs)
+             for idx in fall_idxs], dtype=float).reshape(-1, 1, 1)
+
+        # k depends on k0 through Pr only, so d ln k/d ln k0 is
+        # d ln k/d ln [M] and d ln k/d ln kinf is 1 less it
+        zeros = np.zeros((len(fall_idxs), len(temps)))
+        _, dlnk_dlnms = rates.falloff_rate_derivatives(
+            [cmech.rxns[idx] for idx in fall_idxs],
+            highp_ks[fall_idxs], lowp_ks[fall_idxs], zeros, zeros,
+            pressures, temps, m_factor=m_factor)
+        fall_ktps = ktps[fall_idxs, 1:]
+        high_wts[fall_idxs, 1:] = (
+            fall_ktps / highp_ks[fall_idxs, np.newaxis] * (1.0 - dlnk_dlnms))
+        low_wts[fall_idxs, 1:] = (
+            fall_ktps / lowp_ks[fall_idxs, np.newaxis] * dlnk_dlnms)
+
+    plog_arrs = rates.plog_arrays(cmech, rxn_units)
+    plog_derivs = [np.zeros((len(plog_arrs.a),) + shape[1:])
+                   for _ in range(3)]
+    for idx in plog_idxs:
+        expr_idxs = np.flatnonzero(plog_arrs.idxs == idx)
+        plog_dct = collections.defaultdict(list)
+        for expr_idx in expr_idxs:
+            plog_dct[plog_arrs.pressures[expr_idx]].extend(
+                [plog_arrs.a[expr_idx], plog_arrs.n[expr_idx],
+                 plog_arrs.ea[expr_idx]])
+        for plog_deriv, deriv in zip(
+                plog_derivs, ratefit.fxns.plog_grid_derivatives(
+                    plog_dct, t_ref, pressures, temps)):
+            plog_deriv[expr_idxs, 1:] = deriv
+
+    cheb_derivs = np.zeros((0, 0, 0) + shape[1:])
+    if cheb_idxs:
+        cheb_dcts = [cmech.rxns[idx].chebyshev for idx in cheb_idxs]
+        derivs = ratefit.fxns.chebyshev_batch_alpha_derivatives(
+            [cheb_dct['alpha_elm'] for cheb_dct in cheb_dcts],
+            [cheb_dct['t_limits'] for cheb_dct in cheb_dcts],
+            [cheb_dct['p_limits'] for cheb_dct in cheb_dcts],
+            pressures, temps)
+        cheb_derivs = np.zeros(derivs.shape[:3] + shape[1:])
+        cheb_derivs[..., 1:, :] = derivs
+
+    return ParameterSensitivities(
+        ktps=ktps,
+        high_p=_arrhenius_sensitivities(cmech.high_p, high_wts, temps,
+                                        t_ref),
+        low_p=_arrhenius_sensitivities(cmech.low_p, low_wts, temps, t_ref),
+        plog=plog_arrs._replace(
+            a=plog_derivs[0], n=plog_derivs[1], ea=plog_derivs[2]),
+        chebyshev=cheb_derivs,
+        cheb_idxs=np.array(cheb_idxs, dtype=int))
+
+
+def _arrhenius_sensitivities(arr_arrays, rec_wts, temps, t_ref):
+    """ the derivatives of the rate constants of the records by the
+        parameters of each expression, from the derivatives of the record
+        rate constants by the rate constants of their expressions
+    """
+    # k = A (T/Tref)^n exp(-Ea/RT) for each expression
+    dk_das = np.exp(arr_arrays.n[:, np.newaxis] * np.log(temps / t_ref) -
+                    arr_arrays.ea[:, np.newaxis] / (RC * temps))
+    expr_ks = arr_arrays.a[:, np.newaxis] * dk_das
+    wts = rec_wts[arr_arrays.idxs]
+
+    return arr_arrays._replace(
+        a=wts * dk_das[:, np.newaxis],
+        n=wts * (expr_ks * np.log(temps / t_ref))[:, np.newaxis],
+        ea=wts * (-expr_ks / (RC * temps))[:, np.newaxis])
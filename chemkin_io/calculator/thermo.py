@@ -13,22 +13,86 @@ RC = 1.98720425864083e-3  # in kcal/mol.K
 def mechanism(block_str, temps):
     """ Loop over a dictionary of NASA polynomials for a mechanism
     """
-    nasa_dct = thm_parser.data_dct(block_str)
+    names, tmps, cfts = thm_parser.data_arrays(block_str)
+    props = properties(cfts, tmps, temps)
+    mech_thermo_dct = property_dct(names, props)
+
+    return mech_thermo_dct
 
-    mech_thermo_dct = {}
-    for name, thermo_dstr in nasa_dct.items():
-        h_t, cp_t, s_t, g_t, = [], [], [], []
-        for temp in temps:
-            h_t.append(enthalpy(thermo_dstr, temp))
-            cp_t.append(heat_capacity(thermo_dstr, temp))
-            s_t.append(entropy(thermo_dstr, temp))
-            g_t.append(gibbs(thermo_dstr, temp))
 
-        mech_thermo_dct[name] = [h_t, cp_t, s_t, g_t]
+def properties(cfts, tmps, temps):
+    """ Calculate the Enthalpy, Heat Capacity, Entropy and Gibbs Free Energy
+        of a set of species over a vector of temperatures
+
+        takes the (nspecies, 2, 7) low and high temperature coefficients and
+        the (nspecies, 3) low, high and common temperatures of the NASA
+        polynomials; returns four (nspecies, ntemps) arrays, which are NaN
+        at temperatures outside the range of a polynomial
+    """
+    cfts = np.asarray(cfts, dtype=float).reshape(-1, 2, 7)
+    tmps = np.asarray(tmps, dtype=float).reshape(-1, 3)
+    temps = np.asarray(temps, dtype=float).ravel()
+
+    # pick the low or high temperature set for each species and temperature
+    use_high = temps[np.newaxis, :] > tmps[:, 2:3]
+    sel_cfts = np.where(use_high[..., np.newaxis],
+                        cfts[:, np.newaxis, 1, :],
+                        cfts[:, np.newaxis, 0, :])
+    poly_cfts = sel_cfts[..., :5]
+    powers = temps[:, np.newaxis] ** np.arange(5)
+
+    cp_t = np.sum(poly_cfts * powers, axis=-1)
+    h_t = (np.sum(poly_cfts * powers / np.arange(1, 6), axis=-1) +
+           sel_cfts[..., 5] / temps)
+    s_t = (sel_cfts[..., 0] * np.log(temps) +
+           np.sum(poly_cfts[..., 1:] * powers[:, 1:] / np.arange(1, 5),
+                  axis=-1) +
+           sel_cfts[..., 6])
+
+    h_t *= (RC * temps)
+    cp_t *= RC
+    s_t *= RC
+    g_t = h_t - (s_t * temps)
+
+    out_of_range = ((temps[np.newaxis, :] < tmps[:, 0:1]) |
+                    (temps[np.newaxis, :] > tmps[:, 1:2]))
+    for prop in (h_t, cp_t, s_t, g_t):
+        prop[out_of_range] = np.nan
+
+    return h_t, cp_t, s_t, g_t
+
+
+def property_dct(names, props):
+    """ a dictionary of [H, Cp, S, G] lists indexed by species name, as
+        returned by mechanism, from the arrays returned by properties;
+        NaN values are given as None
+    """
+    props = np.asarray(props, dtype=float)
+    mech_thermo_dct = {}
+    for idx, name in enumerate(names):
+        mech_thermo_dct[name] = [
+            [None if np.isnan(val) else float(val) for val in prop[idx]]
+            for prop in props]
 
     return mech_thermo_dct
 
 
+def property_arrays(mech_thermo_dct, names=None):
+    """ the species names and the (H, Cp, S, G) arrays of a dictionary
+        of [H, Cp, S, G] lists, as returned by mechanism; None values are
+        given as NaN
+    """
+    if names is None:
+        names = tuple(mech_thermo_dct.keys())
+    props = np.array(
+        [[[np.nan if val is None else val for val in prop]
+          for prop in mech_thermo_dct[name]] for name in names],
+        dtype=float)
+    props = props.reshape(len(names), 4, -1)
+
+    return names, tuple(props[:, idx, :] for idx in range(4))
+
+
 def enthalpy(thm_dstr, temp):
     """ Calculate the Enthalpy [H(T)] of a species using the
         coefficients of its NASA polynomial
@@ -102,7 +166,7 @@ def gibbs(thm_dstr, temp):
 
     h_t = enthalpy(thm_dstr, temp)
     s_t = entropy(thm_dstr, temp)
-    if enthalpy is not None and entropy is not None:
+    if h_t is not None and s_t is not None:
         g_t = h_t - (s_t * temp)
     else:
         g_t = None
@@ -113,12 +177,15 @@ def gibbs(thm_dstr, temp):
 def _coefficients_for_specific_temperature(thm_dstr, temp):
     """ return the set of coefficients of the polynomial (low or high)
         that should be used for a given temperature
+
+        the low, high and common temperatures are switched at the common
+        temperature as in properties, with None outside the range
     """
 
     temps = thm_parser.temperatures(thm_dstr)
-    if temps[0] < temp < temps[1]:
+    if temps[0] <= temp <= temps[2]:
         cfts = thm_parser.low_coefficients(thm_dstr)
-    elif temps[1] < temp < temps[2]:
+    elif temps[2] < temp <= temps[1]:
         cfts = thm_parser.high_coefficients(thm_dstr)
     else:
         cfts = None
@@ -0,0 +1,130 @@
+""" Monte-Carlo propagation of rate and thermo uncertainties through the
+    rate constants, equilibrium constants and reverse rate constants of a
+    whole mechanism
+
+    a shift of the ln A or Ea of every expression of a reaction scales its
+    rate constants by the same factor in every functional form: both
+    falloff limits are shifted, leaving Pr unchanged, and PLOG and
+    Chebyshev log k shift as a whole; so the rate constants are evaluated
+    once and each sample only scales them
+"""
+
+import collections
+import numpy as np
+from chemkin_io.calculator import rates
+from chemkin_io.calculator import thermo
+from chemkin_io.calculator import equilibrium
+
+
+RC = equilibrium.RC
+
+# Upper bound on the number of elements of the rate constants of a chunk
+# of samples, which sets the default chunk size
+CHUNK_ELEMENTS = 2**24
+
+# Samples of the rate constants of a mechanism; ktps and rev_ktps are
+# (nsamples, nreactions, npressures+1, ntemps) arrays laid out as the
+# dense_ktps of mechanism_arrays, with NaN reverse rate constants for
+# irreversible reactions, and k_equils is (nsamples, nreactions, ntemps);
+# ln_a_shifts and ea_shifts are the (nsamples, nreactions) shifts of ln A
+# and Ea (kcal/mol) and h_shifts the (nsamples, nspecies) enthalpy shifts
+# (kcal/mol) of the species names of the reactions; start is the index of
+# the first sample
+RateSamples = collections.namedtuple(
+    'RateSamples',
+    ['ktps', 'k_equils', 'rev_ktps', 'ln_a_shifts', 'ea_shifts',
+     'h_shifts', 'names', 'start'])
+
+
+def sample_chunks(cmech, rxn_units, thm_arrays, t_ref, temps, pressures,
+                  nsamples, ln_a_sigmas=0.0, ea_sigmas=0.0, h_sigmas=0.0,
+                  chunk_size=None, seed=None, mol_fracs=None):
+    """ draw samples of the rate constants of a compiled mechanism with
+        normal shifts of the ln A and Ea of its reactions and of the
+        enthalpies of its species, yielding RateSamples for consecutive
+        chunks of samples
+
+        the standard deviations may be scalars, sequences aligned with the
+        reaction keys of the compiled mechanism (ln A, Ea in kcal/mol) or
+        the species names of its reactions (enthalpy in kcal/mol), or
+        dictionaries of them, with zero for those not given; thm_arrays
+        are the (names, temps, cfts) thermo arrays of
+        parser.thermo.data_arrays
+
+        the samples are the same for any chunk size with the same seed
+    """
+    temps = np.asarray(temps, dtype=float)
+    ntemps = len(temps)
+
+    ktp_arrays = rates.mechanism_arrays(
+        cmech, rxn_units, t_ref, temps, pressures, mol_fracs=mol_fracs)
+    base_ktps = rates.dense_ktps(ktp_arrays)
+    nrxns = len(cmech.rxn_keys)
+
+    # Species of the reactions without thermo have NaN Gibbs energies
+    names, stoich = equilibrium.stoichiometric_matrix(cmech.rxn_keys)
+    thm_names, tmps, cfts = thm_arrays
+    _, _, _, gibbs = thermo.properties(cfts, tmps, temps)
+    thm_idx_dct = {name: idx for idx, name in enumerate(thm_names)}
+    gibbs = np.array(
+        [gibbs[thm_idx_dct[name]] if name in thm_idx_dct
+         else np.full(ntemps, np.nan) for name in names]).reshape(
+             len(names), ntemps)
+    base_k_equils = equilibrium.equilibrium_constants(stoich, gibbs, temps)
+    irreversible = ~equilibrium.reversible(cmech)
+
+    ln_a_sigmas = _sigmas(ln_a_sigmas, cmech.rxn_keys)
+    ea_sigmas = _sigmas(ea_sigmas, cmech.rxn_keys)
+    h_sigmas = _sigmas(h_sigmas, names)
+
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(base_ktps.size, 1))
+
+    # one stream for each kind of shift keeps the samples independent of
+    # the chunk size
+    ln_a_rng, ea_rng, h_rng = (
+        np.random.default_rng(seq)
+        for seq in np.random.SeedSequence(seed).spawn(3))
+    for start in range(0, nsamples, chunk_size):
+        nchunk = min(chunk_size, nsamples - start)
+        ln_a_shifts = ln_a_rng.standard_normal((nchunk, nrxns)) * ln_a_sigmas
+        ea_shifts = ea_rng.standard_normal((nchunk, nrxns)) * ea_sigmas
+        h_shifts = h_rng.standard_normal((nchunk, len(names))) * h_sigmas
+
+        ln_facs = (ln_a_shifts[:, :, np.newaxis] -
+                   ea_shifts[:, :, np.newaxis] / (RC * temps))
+        ktps = base_ktps * np.exp(ln_facs)[:, :, np.newaxis, :]
+
+        # a shift of the enthalpies shifts the Gibbs energies alike
+        ln_k_shifts = -(stoich @ h_shifts.T).T[:, :, np.newaxis] / (
+            RC * temps)
+        k_equils = base_k_equils * np.exp(ln_k_shifts)
+        rev_ktps = ktps / k_equils[:, :, np.newaxis, :]
+        rev_ktps[:, irreversible] = np.nan
+
+        yield RateSamples(
+            ktps=ktps, k_equils=k_equils, rev_ktps=rev_ktps,
+            ln_a_shifts=ln_a_shifts, ea_shifts=ea_shifts,
+            h_shifts=h_shifts, names=names, start=start)
+
+
+def samples(cmech, rxn_units, thm_arrays, t_ref, temps, pressures,
+            nsamples, **kwargs):
+    """ draw all samples of sample_chunks at once, as one RateSamples
+    """
+    chunks = list(sample_chunks(cmech, rxn_units, thm_arrays, t_ref, temps,
+                                pressures, nsamples, **kwargs))
+    assert chunks
+    return chunks[0]._replace(
+        **{field: np.concatenate([getattr(chunk, field) for chunk in chunks])
+           for field in ('ktps', 'k_equils', 'rev_ktps', 'ln_a_shifts',
+                         'ea_shifts', 'h_shifts')})
+
+
+def _sigmas(sigmas, keys):
+    """ an array of standard deviations aligned with a set of keys, from a
+        scalar, a sequence or a dictionary
+    """
+    if isinstance(sigmas, dict):
+        sigmas = [sigmas.get(key, 0.0) for key in keys]
+    return np.broadcast_to(np.asarray(sigmas, dtype=float), (len(keys),))
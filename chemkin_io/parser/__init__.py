@@ -6,6 +6,10 @@ from chemkin_io.parser import species
 from chemkin_io.parser import reaction
 from chemkin_io.parser import thermo
 from chemkin_io.parser import util
+from chemkin_io.parser import registry
+from chemkin_io.parser import cache
+from chemkin_io.parser import identity
+from chemkin_io.parser import submechanism
 
 
 __all__ = [
@@ -14,4 +18,8 @@ __all__ = [
     'reaction',
     'thermo',
     'util',
+    'registry',
+    'cache',
+    'identity',
+    'submechanism',
 ]
@@ -0,0 +1,125 @@
+""" on-disk cache of fully parsed mechanisms
+
+    entries are pickles of the parsed species, thermo and reaction data,
+    named by a hash of the mechanism text and of the parser source code;
+    an edit to either one gives a new name, so stale entries are never
+    read back
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+from chemkin_io.parser import mechanism
+from chemkin_io.parser import species
+from chemkin_io.parser import thermo
+from chemkin_io.parser import reaction
+from chemkin_io.parser import util
+
+
+PARSER_PATH = os.path.dirname(os.path.realpath(__file__))
+CACHE_EXT = '.pickle'
+
+_PARSER_VERSION = []
+
+
+def mechanism_data(mech_str, cache_dir=None, nprocs=1):
+    """ the parsed data of a mechanism string
+
+        returns a dictionary of the species names, the thermo data as
+        given by thermo.data_block, the Reaction records, the reaction
+        units and the species index of the records, as given by
+        reaction.species_index; a block absent from the mechanism gives
+        None; if a cache directory is given, the data is read from it when
+        present and written to it otherwise
+    """
+    if cache_dir is None:
+        return parse(mech_str, nprocs=nprocs)
+
+    cache_path = os.path.join(cache_dir, key(mech_str) + CACHE_EXT)
+    mech_data = _read(cache_path)
+    if mech_data is None:
+        mech_data = parse(mech_str, nprocs=nprocs)
+        _write(cache_path, mech_data)
+
+    return mech_data
+
+
+def parse(mech_str, nprocs=1):
+    """ parse the species, thermo and reaction data of a mechanism string
+    """
+    spc_block, thm_block, rxn_block, rxn_units = mechanism.blocks(mech_str)
+
+    mech_data = {
+        'species': None,
+        'thermo': None,
+        'reactions': None,
+        'units': None,
+        'species_index': None
+    }
+    if spc_block is not None:
+        mech_data['species'] = species.names(
+            util.clean_up_whitespace(spc_block))
+    if thm_block is not None:
+        mech_data['thermo'] = thermo.data_block(
+            util.clean_up_whitespace(thm_block))
+    if rxn_block is not None:
+        mech_data['reactions'] = reaction.data_records(
+            util.clean_up_whitespace(rxn_block), nprocs=nprocs)
+        mech_data['units'] = rxn_units
+        mech_data['species_index'] = reaction.species_index(
+            mech_data['reactions'])
+
+    return mech_data
+
+
+def key(mech_str):
+    """ the cache key of a mechanism string, hashing its text together
+        with the version of the parser
+    """
+    hasher = hashlib.sha256(parser_version().encode('utf8'))
+    hasher.update(mech_str.encode('utf8', errors='ignore'))
+    return hasher.hexdigest()
+
+
+def parser_version():
+    """ a hash of the source code of the parser modules
+    """
+    if not _PARSER_VERSION:
+        hasher = hashlib.sha256()
+        for file_name in sorted(os.listdir(PARSER_PATH)):
+            if file_name.endswith('.py'):
+                with open(os.path.join(PARSER_PATH, file_name), 'rb') as fobj:
+                    hasher.update(fobj.read())
+        _PARSER_VERSION.append(hasher.hexdigest())
+    return _PARSER_VERSION[0]
+
+
+def _read(cache_path):
+    """ read a cache entry; None if it is missing or unreadable
+    """
+    mech_data = None
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as file_obj:
+                mech_data = pickle.load(file_obj)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            mech_data = None
+    return mech_data
+
+
+def _write(cache_path, mech_data):
+    """ write a cache entry through a temporary file, so that concurrent
+        jobs never read a partial entry; the temporary file is removed if
+        the entry cannot be written
+    """
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    file_desc, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(file_desc, 'wb') as file_obj:
+            pickle.dump(mech_data, file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,246 @@
+""" species identities from the species CSV files of mechanisms
+
+    each CSV string is read once per process, and its name <-> InChI
+    dictionaries are built once; SMILES -> InChI conversions are
+    memoized in the process and, if a store directory is given, in a
+    JSON file in that directory, so later runs skip the conversions
+
+    conversions may run on a pool of worker processes, and a species
+    that fails to convert is reported without stopping the others; the
+    identities of a CSV with failed species are not kept, so they are
+    tried again by the next call
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import contextlib
+import collections
+from io import StringIO
+import pandas
+from automol.smiles import inchi as _inchi
+from automol.inchi import smiles as _smiles
+from chemkin_io.parser import util
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+STORE_NAME = 'smiles_inchi.json'
+LOCK_NAME = STORE_NAME + '.lock'
+
+# Bounds on the number of identifiers per chunk sent to a worker process;
+# conversions are slow, so chunks are far smaller than those of the parser
+MIN_CHUNK_SIZE = 10
+MAX_CHUNK_SIZE = 100
+
+# Both directions of the name <-> InChI map of a species CSV, and the
+# errors of the species whose SMILES strings failed to convert, by name;
+# those species are left out of the maps
+SpeciesIdentities = collections.namedtuple(
+    'SpeciesIdentities', ['name_inchi_dct', 'inchi_name_dct', 'failed_dct'])
+
+_CSV_DATA = {}
+_IDENTITIES = {}
+_INCHI_MEMO = {}
+
+
+def read_csv(csv_str):
+    """ read the csv file; removes whitespace and makes everything lower
+
+        the data of each CSV string is read once and shared by every
+        caller, so it must not be modified
+    """
+    csv_key = _key(csv_str)
+    data = _CSV_DATA.get(csv_key)
+    if data is None:
+        data = pandas.read_csv(StringIO(csv_str), comment='!', quotechar="'")
+        data.columns = data.columns.str.strip()
+        data.columns = map(str.lower, data.columns)
+        _CSV_DATA[csv_key] = data
+    return data
+
+
+def identities(csv_str, store_dir=None, nprocs=1):
+    """ the name -> InChI and InChI -> name dictionaries of a species CSV
+        string, from its InChI column or else from its SMILES column;
+        both are empty if it has neither
+
+        identities with failed species are returned but not kept
+    """
+    csv_key = _key(csv_str)
+    spc_ids = _IDENTITIES.get(csv_key)
+    if spc_ids is None:
+        data = read_csv(csv_str)
+        names, ichs, failed_dct = list(data.name), None, {}
+        if hasattr(data, 'inchi'):
+            ichs = list(data.inchi)
+        elif hasattr(data, 'smiles'):
+            ichs, smi_failed_dct = inchis(
+                data.smiles, store_dir=store_dir, nprocs=nprocs)
+            failed_dct = {
+                name: smi_failed_dct[smi]
+                for name, smi in zip(names, data.smiles)
+                if smi in smi_failed_dct}
+
+        if ichs is None:
+            spc_ids = SpeciesIdentities({}, {}, {})
+        else:
+            name_ichs = [(name, ich) for name, ich in zip(names, ichs)
+                         if name not in failed_dct]
+            spc_ids = SpeciesIdentities(
+                name_inchi_dct=dict(name_ichs),
+                inchi_name_dct={ich: name for name, ich in name_ichs},
+                failed_dct=failed_dct)
+        if not spc_ids.failed_dct:
+            _IDENTITIES[csv_key] = spc_ids
+
+    return spc_ids
+
+
+def inchis(smiles_lst, store_dir=None, nprocs=1):
+    """ the InChI strings of a sequence of SMILES strings, with None for
+        those that fail to convert, and a dictionary of the errors of the
+        failed SMILES strings
+
+        each SMILES string is converted at most once per process and, if
+        a store directory is given, at most once over all runs sharing it;
+        failed conversions are not kept, so they are tried again
+    """
+    smiles_lst = list(smiles_lst)
+    missing = set(smi for smi in smiles_lst if smi not in _INCHI_MEMO)
+
+    if missing and store_dir is not None:
+        stored = _read_store(store_dir)
+        _INCHI_MEMO.update(
+            (smi, stored[smi]) for smi in missing if smi in stored)
+        missing = set(smi for smi in missing if smi not in _INCHI_MEMO)
+
+    failed_dct = {}
+    if missing:
+        missing = sorted(missing)
+        new_ichs, failed_dct = _convert(_try_inchi, missing, nprocs)
+        _INCHI_MEMO.update(new_ichs)
+        if store_dir is not None and new_ichs:
+            _write_store(store_dir, new_ichs)
+
+    ichs = [_INCHI_MEMO.get(smi) for smi in smiles_lst]
+
+    return ichs, failed_dct
+
+
+def smiles(ich_lst, nprocs=1):
+    """ the SMILES strings of a sequence of InChI strings, with None for
+        those that fail to convert, and a dictionary of the errors of the
+        failed InChI strings
+    """
+    ich_lst = list(ich_lst)
+    unique_ichs = sorted(set(ich_lst))
+    smi_dct, failed_dct = _convert(_try_smiles, unique_ichs, nprocs)
+    smis = [smi_dct.get(ich) for ich in ich_lst]
+
+    return smis, failed_dct
+
+
+def clear():
+    """ forget the CSV data, identities and conversions read so far in
+        this process
+    """
+    _CSV_DATA.clear()
+    _IDENTITIES.clear()
+    _INCHI_MEMO.clear()
+
+
+def _convert(try_fxn, ids, nprocs):
+    """ convert identifiers on a pool of worker processes; returns the
+        converted identifiers and the errors of the failed ones
+    """
+    results = util.parallel_map(
+        try_fxn, ids, nprocs=nprocs,
+        min_chunk_size=MIN_CHUNK_SIZE, max_chunk_size=MAX_CHUNK_SIZE)
+    conv_dct, failed_dct = {}, {}
+    for id_str, (conv_id, error) in zip(ids, results):
+        if error is None:
+            conv_dct[id_str] = conv_id
+        else:
+            failed_dct[id_str] = error
+    return conv_dct, failed_dct
+
+
+def _try_inchi(smi):
+    return _try(_inchi, smi)
+
+
+def _try_smiles(ich):
+    return _try(_smiles, ich)
+
+
+def _try(conv_fxn, id_str):
+    """ the conversion of an identifier and None, or None and the error
+        message if the conversion fails or gives nothing
+    """
+    try:
+        conv_id = conv_fxn(id_str)
+    except Exception as err:  # automol raises many kinds of errors
+        return None, '{}: {}'.format(type(err).__name__, err)
+    if not conv_id:
+        return None, 'no identifier returned'
+    return conv_id, None
+
+
+def _key(csv_str):
+    return hashlib.sha256(csv_str.encode('utf8', errors='ignore')).digest()
+
+
+def _read_store(store_dir):
+    """ the SMILES -> InChI dictionary of a store; empty if it is missing
+        or unreadable
+    """
+    store_path = os.path.join(store_dir, STORE_NAME)
+    stored = {}
+    if os.path.exists(store_path):
+        try:
+            with open(store_path, encoding='utf8') as file_obj:
+                stored = json.load(file_obj)
+        except (OSError, ValueError):
+            stored = {}
+    return stored
+
+
+def _write_store(store_dir, new_ichs):
+    """ add conversions to a store, through a temporary file so that
+        concurrent jobs never read a partial store; the store is read and
+        merged under a lock, so concurrent jobs never drop each other's
+        conversions; the temporary file is removed if the store cannot be
+        written
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    with _store_lock(store_dir):
+        stored = _read_store(store_dir)
+        stored.update(new_ichs)
+        file_desc, tmp_path = tempfile.mkstemp(dir=store_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_desc, 'w', encoding='utf8') as file_obj:
+                json.dump(stored, file_obj, indent=0, sort_keys=True)
+            os.replace(tmp_path, os.path.join(store_dir, STORE_NAME))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+@contextlib.contextmanager
+def _store_lock(store_dir):
+    """ hold an exclusive lock on a store, on a lock file beside it; no
+        lock is taken where fcntl is unavailable
+    """
+    with open(os.path.join(store_dir, LOCK_NAME), 'a') as lock_obj:
+        if fcntl is not None:
+            fcntl.flock(lock_obj, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_obj, fcntl.LOCK_UN)
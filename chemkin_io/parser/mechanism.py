@@ -1,44 +1,192 @@
 """ functions operating on the mechanism string
 """
 
-from io import StringIO
-import pandas
+import os
+import mmap
 import autoparse.pattern as app
-import autoparse.find as apf
-from automol.smiles import inchi as _inchi
-from automol.inchi import smiles as _smiles
 from chemkin_io.parser import util
+from chemkin_io.parser import registry
+from chemkin_io.parser import reaction
+from chemkin_io.parser import identity
 
 
-def species_block(mech_str):
-    """ species block
+REACTION_START_WORDS = ('REACTIONS', 'REAC')
+
+# Leading words of the section headlines, mapped to the section names
+SECTION_START_WORDS = {
+    b'ELEM': 'elements',
+    b'SPEC': 'species',
+    b'THER': 'thermo',
+    b'REAC': 'reactions',
+    b'TRAN': 'transport',
+}
+
+
+class Mechanism():
+    """ memory-mapped handle to a mechanism file
+
+        the byte offsets of each section are found in a single scan of
+        the file when the handle is opened; the blocks are then read
+        from the map on request, cleaning only the slice of their section
+    """
+
+    def __init__(self, mech_path):
+        self._file_obj = open(mech_path, 'rb')
+        if os.fstat(self._file_obj.fileno()).st_size > 0:
+            self._map = mmap.mmap(
+                self._file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b''
+        self.offsets = _section_offsets(self._map)
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """ release the map and the file
+        """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file_obj.close()
+
+    def section(self, name):
+        """ the raw string of a section, from its headline through its END
+            statement; None if the mechanism has no such section
+        """
+        if name not in self.offsets:
+            return None
+        start, end = self.offsets[name]
+        sec_str = self._map[start:end].decode('utf8', errors='ignore')
+        # Translate newlines as reading the file in text mode would
+        return sec_str.replace('\r\n', '\n').replace('\r', '\n')
+
+    def elements_block(self):
+        """ elements block
+        """
+        return self._block('elements', elements_block)
+
+    def species_block(self):
+        """ species block
+        """
+        return self._block('species', species_block)
+
+    def reaction_block(self, remove_comments=True):
+        """ reaction block
+        """
+        return self._block(
+            'reactions', reaction_block, remove_comments=remove_comments)
+
+    def thermo_block(self):
+        """ thermo block
+        """
+        return self._block('thermo', thermo_block)
+
+    def transport_block(self):
+        """ transport block
+        """
+        return self._block('transport', transport_block)
+
+    def reaction_units(self):
+        """ reaction units
+        """
+        return self._block('reactions', reaction_units)
+
+    def _block(self, name, block_fxn, **kwargs):
+        """ apply a block function to a section, once
+        """
+        key = (block_fxn.__name__,) + tuple(sorted(kwargs.items()))
+        if key not in self._blocks:
+            sec_str = self.section(name)
+            self._blocks[key] = (block_fxn(sec_str, **kwargs)
+                                 if sec_str is not None else None)
+        return self._blocks[key]
+
+
+def blocks(mech_str):
+    """ the species, thermo and reaction blocks and the reaction units of
+        a mechanism string, with None for the blocks it lacks
+
+        the string is cleaned once and every block is cut from it, as
+        species_block, thermo_block, reaction_block and reaction_units
+        give them
+    """
+    clean_str = _clean_up(mech_str)
+    return (_species_block(clean_str), _thermo_block(clean_str),
+            _reaction_block(clean_str), _reaction_units(clean_str))
+
+
+def section(mech_str, name):
+    """ the raw string of a section of a mechanism string, from its
+        headline through its END statement, as Mechanism.section gives it;
+        None if the mechanism has no such section
+    """
+    buf = mech_str.encode('utf8', errors='ignore')
+    offsets = _section_offsets(buf)
+    if name not in offsets:
+        return None
+    start, end = offsets[name]
+    return buf[start:end].decode('utf8', errors='ignore')
+
+
+def elements_block(mech_str):
+    """ elements block
     """
     block_str = util.block(
         string=_clean_up(mech_str),
-        start_pattern=app.one_of_these(['SPECIES', 'SPEC']),
+        start_pattern=app.one_of_these(['ELEMENTS', 'ELEM']),
         end_pattern='END'
     )
     return block_str
 
 
+def species_block(mech_str):
+    """ species block
+    """
+    return _species_block(_clean_up(mech_str))
+
+
 def reaction_block(mech_str, remove_comments=True):
     """ reaction block
     """
-    block_str = util.block(
-        string=_clean_up(mech_str, remove_comments=remove_comments),
-        start_pattern=app.one_of_these(['REACTIONS', 'REAC']),
-        end_pattern='END'
-    )
-    return block_str
+    return _reaction_block(
+        _clean_up(mech_str, remove_comments=remove_comments))
+
+
+def reaction_stream(mech_file, remove_comments=True):
+    """ yield the parsed reactions of a mechanism file one at a time
+
+        reads the file line by line, so only the lines of the reaction
+        being assembled are held in memory; mech_file is a path or an
+        open file handle; each reaction is yielded as the dictionary
+        built by chemkin_io.parser.reaction.data_fields
+    """
+    if hasattr(mech_file, 'readline'):
+        lines = _reaction_block_lines(mech_file, remove_comments)
+        for rxn_dstr in _reaction_data_strings(lines):
+            yield reaction.data_fields(rxn_dstr)
+    else:
+        with open(mech_file, encoding='utf8', errors='ignore') as file_obj:
+            lines = _reaction_block_lines(file_obj, remove_comments)
+            for rxn_dstr in _reaction_data_strings(lines):
+                yield reaction.data_fields(rxn_dstr)
 
 
 def thermo_block(mech_str):
     """ thermo block
     """
+    return _thermo_block(_clean_up(mech_str))
+
+
+def transport_block(mech_str):
+    """ transport block
+    """
     block_str = util.block(
         string=_clean_up(mech_str),
-        start_pattern=app.one_of_these(['THERMO ALL', 'THERM ALL', 'THER ALL',
-                                        'THERMO', 'THERM', 'THER']),
+        start_pattern=app.one_of_these(['TRANSPORT', 'TRAN']),
         end_pattern='END'
     )
     return block_str
@@ -47,57 +195,23 @@ def thermo_block(mech_str):
 def reaction_units(mech_str):
     """ reaction units
     """
+    return _reaction_units(_clean_up(mech_str))
 
-    def _reaction_units(string, start_pattern, units_pattern):
-        """ return a block delimited by start and end patterns
-        """
-        rxn_line_pattern = start_pattern + app.capturing(app.LINE_FILL)
-        units_string = apf.first_capture(rxn_line_pattern, string)
-        units_lst = apf.all_captures(units_pattern, units_string)
-
-        ckin_ea_units = ['CAL/MOLE', 'KCAL/MOLE',
-                         'JOULES/MOLE', 'KJOULES/MOLE',
-                         'KELVINS']
-        ckin_a_units = ['MOLES', 'MOLECULES']
-
-        if units_lst:
-            if any(unit in ckin_ea_units for unit in units_lst):
-                for unit in ckin_ea_units:
-                    if unit in units_lst:
-                        ea_unit = unit.lower()
-            else:
-                ea_unit = 'cal/mole'
-            if any(unit in ckin_a_units for unit in units_lst):
-                for unit in ckin_a_units:
-                    if unit in units_lst:
-                        a_unit = unit.lower()
-            else:
-                a_unit = 'moles'
-            units = (ea_unit, a_unit)
-        else:
-            units = ('cal/mole', 'moles')
-
-        return units
-
-    units = _reaction_units(
-        string=_clean_up(mech_str),
-        start_pattern=app.one_of_these(['REACTIONS', 'REAC']),
-        units_pattern=app.one_or_more(
-            app.one_of_these([app.LETTER, app.escape('/')])),
-    )
 
-    return units
-
-
-def spc_name_dct(csv_str, entry):
+def spc_name_dct(csv_str, entry, store_dir=None, nprocs=1):
     """ build a dictionary of name idx and inchi entry
+
+        SMILES <-> InChI conversions run on nprocs worker processes, and
+        SMILES -> InChI ones are memoized in the store directory, if one
+        is given; species that fail to convert are reported and left out
     """
     data = _read_csv(csv_str)
 
     if entry == 'inchi':
-        spc_dct = _read_name_inchi(data)
+        spc_dct = _read_name_inchi(
+            csv_str, store_dir=store_dir, nprocs=nprocs)
     elif entry == 'smiles':
-        spc_dct = _read_name_smiles(data)
+        spc_dct = _read_name_smiles(data, nprocs=nprocs)
     elif entry == 'mult':
         spc_dct = _read_name_mult(data)
     elif entry == 'charge':
@@ -110,30 +224,34 @@ def spc_name_dct(csv_str, entry):
     return spc_dct
 
 
-def _read_name_inchi(data):
+def _read_name_inchi(csv_str, store_dir=None, nprocs=1):
     """ get dct[name]=inchi """
 
-    if hasattr(data, 'inchi'):
-        spc_dct = dict(zip(data.name, data.inchi))
-    elif hasattr(data, 'smiles'):
-        ichs = [_inchi(smiles) for smiles in data.smiles]
-        spc_dct = dict(zip(data.name, ichs))
-    else:
-        spc_dct = {}
+    data = _read_csv(csv_str)
+    if not hasattr(data, 'inchi') and not hasattr(data, 'smiles'):
         print('No "InChI" or "SMILES" column in csv file')
+    spc_ids = identity.identities(
+        csv_str, store_dir=store_dir, nprocs=nprocs)
+    _print_failures(spc_ids.failed_dct, 'InChI')
+    spc_dct = dict(spc_ids.name_inchi_dct)
 
     return spc_dct
 
 
-def _read_name_smiles(data):
+def _read_name_smiles(data, nprocs=1):
     """ get dct[name]=smiles """
 
     spc_dct = {}
     if hasattr(data, 'smiles'):
         spc_dct = dict(zip(data.name, data.smiles))
     elif hasattr(data, 'inchi'):
-        smiles = [_smiles(ich) for ich in data.inchi]
-        spc_dct = dict(zip(data.name, smiles))
+        smiles, ich_failed_dct = identity.smiles(data.inchi, nprocs=nprocs)
+        failed_dct = {name: ich_failed_dct[ich]
+                      for name, ich in zip(data.name, data.inchi)
+                      if ich in ich_failed_dct}
+        _print_failures(failed_dct, 'SMILES')
+        spc_dct = {name: smi for name, smi in zip(data.name, smiles)
+                   if name not in failed_dct}
     else:
         spc_dct = {}
         print('No "SMILES" or "InChI" column in csv file')
@@ -141,6 +259,13 @@ def _read_name_smiles(data):
     return spc_dct
 
 
+def _print_failures(failed_dct, id_name):
+    """ report the species that failed to convert, one line each """
+    for name, error in failed_dct.items():
+        print('Could not convert species {} to {}: {}'.format(
+            name, id_name, error))
+
+
 def _read_name_mult(data):
     """ get dct[name]=mult """
 
@@ -181,19 +306,11 @@ def _read_name_sensitivity(data):
     return spc_dct
 
 
-def spc_inchi_dct(csv_str):
+def spc_inchi_dct(csv_str, store_dir=None, nprocs=1):
     """ build a dictionary of inchi idx and name entry
     """
-    data = _read_csv(csv_str)
-
-    spc_dct = {}
-    if hasattr(data, 'inchi'):
-        spc_dct = dict(zip(data.name, data.inchi))
-    elif hasattr(data, 'smiles'):
-        ichs = [_inchi(smiles) for smiles in data.smiles]
-        spc_dct = dict(zip(ichs, data.name))
-    else:
-        spc_dct = {}
+    spc_dct = dict(identity.identities(
+        csv_str, store_dir=store_dir, nprocs=nprocs).inchi_name_dct)
 
     return spc_dct
 
@@ -224,11 +341,140 @@ def _read_reac_class(data):
 def _read_csv(csv_str):
     """ read the csv file; removes whitespace and makes everything lower
     """
-    csv_file = StringIO(csv_str)
-    data = pandas.read_csv(csv_file, comment='!', quotechar="'")
-    data.columns = data.columns.str.strip()
-    data.columns = map(str.lower, data.columns)
-    return data
+    return identity.read_csv(csv_str)
+
+
+def _reaction_block_lines(file_obj, remove_comments):
+    """ yield the cleaned lines between the start of the reactions block
+        and its END statement
+    """
+    in_block = False
+    for line in file_obj:
+        if remove_comments:
+            line = line.split('!')[0]
+        line = line.strip()
+        if not line:
+            continue
+        if not in_block:
+            in_block = line.split()[0].startswith(REACTION_START_WORDS)
+        elif line.startswith('END'):
+            break
+        else:
+            yield line
+
+
+def _reaction_data_strings(lines):
+    """ assemble the data strings of each reaction from a stream of
+        reaction block lines
+    """
+    headline_matcher = registry.matcher(reaction.CHEMKIN_ARROW)
+    rxn_lines = []
+    for line in lines:
+        if headline_matcher(line):
+            if rxn_lines:
+                yield '\n'.join(rxn_lines)
+            rxn_lines = [line]
+        elif rxn_lines:
+            rxn_lines.append(line)
+    if rxn_lines:
+        yield '\n'.join(rxn_lines)
+
+
+def _section_offsets(buf):
+    """ byte offsets of each section of a mechanism buffer, found in
+        one pass over its lines; a section runs from the start of its
+        headline to the end of its END line
+    """
+    offsets = {}
+    name, start = None, 0
+    pos, size = 0, len(buf)
+    while pos < size:
+        end = buf.find(b'\n', pos)
+        end = size if end == -1 else end + 1
+        words = buf[pos:end].split(b'!')[0].split()
+        if words:
+            if name is None:
+                for start_word, sec_name in SECTION_START_WORDS.items():
+                    if words[0].startswith(start_word):
+                        name, start = sec_name, pos
+                        break
+                if name is not None and b'END' in words[1:]:
+                    offsets[name] = (start, end)
+                    name = None
+            elif words[0].startswith(b'END'):
+                offsets[name] = (start, end)
+                name = None
+        pos = end
+
+    # Close off a section left open at the end of the file
+    if name is not None:
+        offsets[name] = (start, size)
+
+    return offsets
+
+
+def _species_block(clean_str):
+    block_str = util.block(
+        string=clean_str,
+        start_pattern=app.one_of_these(['SPECIES', 'SPEC']),
+        end_pattern='END'
+    )
+    return block_str
+
+
+def _reaction_block(clean_str):
+    block_str = util.block(
+        string=clean_str,
+        start_pattern=app.one_of_these(['REACTIONS', 'REAC']),
+        end_pattern='END'
+    )
+    return block_str
+
+
+def _thermo_block(clean_str):
+    block_str = util.block(
+        string=clean_str,
+        start_pattern=app.one_of_these(['THERMO ALL', 'THERM ALL', 'THER ALL',
+                                        'THERMO', 'THERM', 'THER']),
+        end_pattern='END'
+    )
+    return block_str
+
+
+def _reaction_units(clean_str):
+    """ the (Ea, A) units on the headline of the reactions block of a
+        cleaned mechanism string
+    """
+    start_pattern = app.one_of_these(['REACTIONS', 'REAC'])
+    units_pattern = app.one_or_more(
+        app.one_of_these([app.LETTER, app.escape('/')]))
+    rxn_line_pattern = start_pattern + app.capturing(app.LINE_FILL)
+    units_string = registry.first_capture(rxn_line_pattern, clean_str)
+    units_lst = registry.all_captures(units_pattern, units_string)
+
+    ckin_ea_units = ['CAL/MOLE', 'KCAL/MOLE',
+                     'JOULES/MOLE', 'KJOULES/MOLE',
+                     'KELVINS']
+    ckin_a_units = ['MOLES', 'MOLECULES']
+
+    if units_lst:
+        if any(unit in ckin_ea_units for unit in units_lst):
+            for unit in ckin_ea_units:
+                if unit in units_lst:
+                    ea_unit = unit.lower()
+        else:
+            ea_unit = 'cal/mole'
+        if any(unit in ckin_a_units for unit in units_lst):
+            for unit in ckin_a_units:
+                if unit in units_lst:
+                    a_unit = unit.lower()
+        else:
+            a_unit = 'moles'
+        units = (ea_unit, a_unit)
+    else:
+        units = ('cal/mole', 'moles')
+
+    return units
 
 
 def _clean_up(mech_str, remove_comments=True):
@@ -3,11 +3,12 @@
 
 
 import itertools
+import collections
 from qcelemental import constants as qcc
 import autoparse.pattern as app
-import autoparse.find as apf
 from autoparse import cast as ap_cast
 from chemkin_io.parser import util
+from chemkin_io.parser import registry
 
 
 # Constants and Conversion factors
@@ -40,57 +41,313 @@ REACTION_PATTERN = (SPECIES_NAMES_PATTERN + app.padded(CHEMKIN_ARROW) +
 COEFF_PATTERN = (app.NUMBER + app.LINESPACES + app.NUMBER +
                  app.LINESPACES + app.NUMBER)
 
+# Patterns for the auxiliary lines of a reaction string
+LOW_PATTERN = (
+    'LOW' +
+    app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+TROE_PATTERN = (
+    'TROE' +
+    app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.maybe(app.capturing(app.NUMBER)) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+SRI_PATTERN = (
+    'SRI' +
+    app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.SPACES + app.capturing(app.NUMBER) +
+    app.maybe(app.SPACES + app.capturing(app.NUMBER)) +
+    app.maybe(app.SPACES + app.capturing(app.NUMBER)) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+CHEB_TEMP_PATTERN = (
+    'TCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.FLOAT) +
+    app.SPACES + app.capturing(app.FLOAT) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+CHEB_PRESSURE_PATTERN = (
+    'PCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.FLOAT) +
+    app.SPACES + app.capturing(app.FLOAT) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+CHEB_DIMENSION_PATTERN = (
+    'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.SPACES + app.capturing(app.INTEGER) +
+    app.SPACES + app.capturing(app.INTEGER) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+CHEB_ELEMENTS_PATTERN = (
+    'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.capturing(
+        app.one_or_more(app.SPACES + app.EXPONENTIAL_FLOAT)) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+PLOG_PATTERN = (
+    'PLOG' +
+    app.zero_or_more(app.SPACE) + app.escape('/') +
+    app.zero_or_more(app.SPACE) + app.capturing(app.NUMBER) +
+    app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
+    app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
+    app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
+    app.zero_or_more(app.SPACE) + app.escape('/')
+)
+BUFFER_SPECIES_PATTERN = app.one_or_more(app.one_of_these([
+    app.LETTER, app.DIGIT,
+    app.escape('('), app.escape(')'),
+    app.UNDERSCORE]))
+BUFFER_FACTOR_PATTERN = (
+    app.capturing(BUFFER_SPECIES_PATTERN) +
+    app.escape('/') +
+    app.capturing(app.NUMBER) +
+    app.escape('/')
+)
+BUFFER_BAD_STRINGS = ('DUP', 'LOW', 'TROE', 'SRI', 'CHEB', 'PLOG')
+
+# Reaction line with the reactants, products and coefficients all captured
+REACTION_LINE_PATTERN = (
+    app.capturing(SPECIES_NAMES_PATTERN) + app.padded(CHEMKIN_ARROW) +
+    app.capturing(SPECIES_NAMES_PATTERN) + app.LINESPACES +
+    app.capturing(COEFF_PATTERN)
+)
+BATH_LINE_PATTERN = (
+    SPECIES_NAMES_PATTERN + app.padded(CHEMKIN_ARROW) +
+    SPECIES_NAMES_PATTERN + app.LINESPACES + COEFF_PATTERN + '\n' +
+    app.capturing(app.LINE)
+)
+
+# Patterns for splitting up the reagent strings
+REAGENT_COUNT_PATTERN = (
+    app.STRING_START + app.capturing(app.maybe(app.DIGIT)) +
+    app.capturing(app.one_or_more(app.NONSPACE)))
+REAGENT_SEPARATOR_PATTERN = app.PLUS + app.not_followed_by(app.PLUS)
+
 # Constants
 NAVO = 6.02214076e23
 
 
+class Reaction(collections.namedtuple('Reaction', [
+        'reactants', 'products', 'reversible', 'third_body',
+        'high_p', 'low_p', 'troe', 'sri', 'chebyshev', 'plog',
+        'buffer', 'duplicate'])):
+    """ parsed data of a single reaction expression
+
+        the parameters are held as floats in the units of the mechanism:
+        high_p, low_p, troe and sri are tuples; plog is a dictionary of
+        parameter tuples indexed by pressure, with the parameters of
+        expressions repeated at one pressure concatenated; chebyshev is a
+        dictionary of the limits, dimensions and rows of the alpha matrix;
+        buffer is a dictionary of bath gas enhancement factors; third_body is
+        '(+M)' for falloff reactions, '+M' for third-body reactions, or
+        None; pressure-independent forms are None when absent
+    """
+    __slots__ = ()
+
+
 # Functions which use thermo parsers to collate the data
-def data_block(block_str):
+def data_block(block_str, nprocs=1):
     """ get the reaction data
+
+        with nprocs > 1, the reaction strings are parsed in chunks
+        over a pool of worker processes
     """
     rxn_dstr_lst = data_strings(block_str)
-    rxn_dat_lst = tuple(zip(
-        map(reactant_names, rxn_dstr_lst),
-        map(product_names, rxn_dstr_lst),
-        map(high_p_parameters, rxn_dstr_lst),
-        map(low_p_parameters, rxn_dstr_lst),
-        map(troe_parameters, rxn_dstr_lst),
-        map(chebyshev_parameters, rxn_dstr_lst),
-        map(plog_parameters, rxn_dstr_lst),
-        map(buffer_enhance_factors, rxn_dstr_lst)))
+    fld_dcts = util.parallel_map(data_fields, rxn_dstr_lst, nprocs=nprocs)
+    rxn_dat_lst = tuple(
+        (fld_dct['reactants'], fld_dct['products'],
+         fld_dct['high_p'], fld_dct['low_p'], fld_dct['troe'],
+         fld_dct['chebyshev'], fld_dct['plog'], fld_dct['buffer'])
+        for fld_dct in fld_dcts)
 
     return rxn_dat_lst
 
 
-def data_dct(block_str, data_entry='strings'):
+def data_records(block_str, nprocs=1):
+    """ get the reaction data as a tuple of Reaction records
+
+        with nprocs > 1, the reaction strings are parsed in chunks
+        over a pool of worker processes
+    """
+    rxn_dstr_lst = data_strings(block_str)
+    rxns = tuple(util.parallel_map(data_record, rxn_dstr_lst, nprocs=nprocs))
+    return rxns
+
+
+def species_index(rxns):
+    """ a dictionary of the reactions each species takes part in, as a
+        reactant or a product, by species name; gives the indices of the
+        Reaction records in rxns, in order
+    """
+    spc_idx_dct = collections.defaultdict(list)
+    for rxn_idx, rxn in enumerate(rxns):
+        for name in set(rxn.reactants + rxn.products):
+            spc_idx_dct[name].append(rxn_idx)
+    return {name: tuple(rxn_idxs) for name, rxn_idxs in spc_idx_dct.items()}
+
+
+def data_dct(block_str, data_entry='strings', nprocs=1):
     """ build a dictionary with the name dictionary
+
+        data_entry='strings' gives the reaction strings, with those of
+        duplicate reactions joined; data_entry='block' gives a tuple of
+        Reaction records, one per duplicate expression
+
+        with nprocs > 1, the reaction strings are parsed in chunks
+        over a pool of worker processes
     """
     rxn_dstr_lst = data_strings(block_str)
     if data_entry == 'strings':
+        keys = util.parallel_map(_reagent_names, rxn_dstr_lst, nprocs=nprocs)
         rxn_dct = {}
-        for string in rxn_dstr_lst:
-            rct_names = reactant_names(string)
-            prd_names = product_names(string)
-            key = (rct_names, prd_names)
+        for key, string in zip(keys, rxn_dstr_lst):
             if key not in rxn_dct.keys():
                 rxn_dct[key] = string
             else:
                 rxn_dct[key] += '\n'+string
-    # elif data_entry == 'block':
-    #     rxn_dct = {}
-    #     for block in rxn_block_lst:
-    #         param_blocks = []
-    #         rct_names = rxn_block_lst[0]
-    #         prd_names = rxn_block_lst[1]
-    #         key = (rct_names, prd_names)
-    #         if key not in rxn_dct.keys():
-    #             rxn_dct[key] = block[2:]
-    #         else:
-    #             rxn_dct[key]
+    elif data_entry == 'block':
+        rxns = util.parallel_map(data_record, rxn_dstr_lst, nprocs=nprocs)
+        rxn_dct = {}
+        for rxn in rxns:
+            key = (rxn.reactants, rxn.products)
+            if key not in rxn_dct.keys():
+                rxn_dct[key] = (rxn,)
+            else:
+                rxn_dct[key] += (rxn,)
+    else:
+        raise NotImplementedError
 
     return rxn_dct
 
 
+def data_record(rxn_dstr):
+    """ parse a single reaction string into a Reaction record
+    """
+    fld_dct = data_fields(rxn_dstr)
+
+    plog_dct = fld_dct['plog']
+    if plog_dct is not None:
+        plog_dct = {pressure: tuple(params)
+                    for pressure, params in plog_dct.items()}
+
+    rxn = Reaction(
+        reactants=fld_dct['reactants'],
+        products=fld_dct['products'],
+        reversible=fld_dct['reversible'],
+        third_body=fld_dct['third_body'],
+        high_p=_float_tuple(fld_dct['high_p']),
+        low_p=_float_tuple(fld_dct['low_p']),
+        troe=_float_tuple(fld_dct['troe']),
+        sri=_float_tuple(fld_dct['sri']),
+        chebyshev=fld_dct['chebyshev'],
+        plog=plog_dct,
+        buffer=fld_dct['buffer'],
+        duplicate=fld_dct['duplicate'])
+
+    return rxn
+
+
+def data_fields(rxn_dstr):
+    """ read every field of a single reaction string in one pass
+
+        the reaction line is matched once and each following line is
+        dispatched on its keyword, so the string is only scanned once;
+        returns a dictionary with the same values as the individual
+        field parsers, plus the reversibility, the third body ('(+M)',
+        '+M' or None) and a flag for DUPLICATE reactions
+    """
+    fld_dct = {
+        'reactants': None,
+        'products': None,
+        'reversible': True,
+        'third_body': None,
+        'high_p': None,
+        'low_p': None,
+        'troe': None,
+        'sri': None,
+        'chebyshev': None,
+        'plog': None,
+        'buffer': None,
+        'duplicate': False
+    }
+
+    # Read the reagents and high-pressure params off the reaction line
+    lines = rxn_dstr.splitlines()
+    while lines:
+        rxn_line = lines.pop(0)
+        captures = registry.first_capture(REACTION_LINE_PATTERN, rxn_line)
+        if captures is not None:
+            break
+    else:
+        raise ValueError(
+            'No reaction line found in string:\n{}'.format(rxn_dstr))
+    rct_str, prd_str, coeff_str = captures
+    fld_dct['reactants'] = _split_reagent_string(rct_str)
+    fld_dct['products'] = _split_reagent_string(prd_str)
+    fld_dct['high_p'] = list(ap_cast(coeff_str.split()))
+    fld_dct['reversible'] = not ('=>' in rxn_line and '<=>' not in rxn_line)
+    fld_dct['third_body'] = _third_body(rct_str)
+
+    # Dispatch each line after the reaction line on its keyword
+    cheb_temps, cheb_pressures, alpha_dims, alpha_elm = None, None, None, []
+    plog_dct = {}
+    for idx, line in enumerate(lines):
+        keyword = line.split('/')[0].strip()
+        if line.count('/') < 2 and idx + 1 < len(lines):
+            # Entry is closed on the next line
+            line += '\n' + lines[idx+1]
+        if keyword == 'LOW':
+            if fld_dct['low_p'] is None:
+                fld_dct['low_p'] = _low_p_captures(line)
+        elif keyword == 'TROE':
+            if fld_dct['troe'] is None:
+                fld_dct['troe'] = _troe_captures(line)
+        elif keyword == 'SRI':
+            if fld_dct['sri'] is None:
+                fld_dct['sri'] = _sri_captures(line)
+        elif keyword == 'PLOG':
+            params = registry.first_capture(PLOG_PATTERN, line)
+            if params is not None:
+                # expressions repeated at a pressure are summed
+                plog_dct.setdefault(float(params[0]), []).extend(
+                    map(float, params[1:]))
+        elif keyword == 'TCHEB':
+            if cheb_temps is None:
+                cheb_temps = registry.first_capture(CHEB_TEMP_PATTERN, line)
+        elif keyword == 'PCHEB':
+            if cheb_pressures is None:
+                cheb_pressures = registry.first_capture(
+                    CHEB_PRESSURE_PATTERN, line)
+        elif keyword == 'CHEB':
+            if alpha_dims is None:
+                alpha_dims = registry.first_capture(
+                    CHEB_DIMENSION_PATTERN, line)
+            row = registry.first_capture(CHEB_ELEMENTS_PATTERN, line)
+            if row is not None:
+                alpha_elm.append(row)
+        elif line.strip().startswith('DUP'):
+            fld_dct['duplicate'] = True
+
+        # Only the line after the reaction line may hold bath gas factors
+        if idx == 0:
+            fld_dct['buffer'] = _buffer_factors(lines[0])
+
+    fld_dct['chebyshev'] = _chebyshev_dct(
+        cheb_temps, cheb_pressures, alpha_dims, alpha_elm)
+    fld_dct['plog'] = plog_dct if plog_dct else None
+
+    return fld_dct
+
+
 # Functions for parsing the reactuins block or single reaction string #
 def data_strings(block_str):
     """ reaction strings
@@ -105,12 +362,7 @@ def data_strings(block_str):
 def reactant_names(rxn_dstr):
     """ reactant species names
     """
-    pattern = _first_line_pattern(
-        rct_ptt=app.capturing(SPECIES_NAMES_PATTERN),
-        prd_ptt=SPECIES_NAMES_PATTERN,
-        coeff_ptt=COEFF_PATTERN
-    )
-    string = apf.first_capture(pattern, rxn_dstr)
+    string, _, _ = registry.first_capture(REACTION_LINE_PATTERN, rxn_dstr)
     names = _split_reagent_string(string)
     return names
 
@@ -118,12 +370,7 @@ def reactant_names(rxn_dstr):
 def product_names(rxn_dstr):
     """ product species names
     """
-    pattern = _first_line_pattern(
-        rct_ptt=SPECIES_NAMES_PATTERN,
-        prd_ptt=app.capturing(SPECIES_NAMES_PATTERN),
-        coeff_ptt=COEFF_PATTERN
-    )
-    string = apf.first_capture(pattern, rxn_dstr)
+    _, string, _ = registry.first_capture(REACTION_LINE_PATTERN, rxn_dstr)
     names = _split_reagent_string(string)
     return names
 
@@ -131,14 +378,9 @@ def product_names(rxn_dstr):
 def high_p_parameters(rxn_dstr):
     """ high-pressure parameters
     """
-    pattern = _first_line_pattern(
-        rct_ptt=SPECIES_NAMES_PATTERN,
-        prd_ptt=SPECIES_NAMES_PATTERN,
-        coeff_ptt=app.capturing(COEFF_PATTERN)
-    )
-    params_string = apf.first_capture(pattern, rxn_dstr)
-    if params_string is not None:
-        params = list(ap_cast(params_string.split()))
+    captures = registry.first_capture(REACTION_LINE_PATTERN, rxn_dstr)
+    if captures is not None:
+        params = list(ap_cast(captures[2].split()))
     else:
         params = None
 
@@ -153,20 +395,8 @@ def high_p_parameters(rxn_dstr):
 def low_p_parameters(rxn_dstr):
     """ low-pressure parameters
     """
-    pattern = (
-        'LOW' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    params = apf.first_capture(pattern, rxn_dstr)
-    if params:
-        params = [float(val) for val in params]
-    else:
-        params = None
-    # capture_lst = apf.all_captures(pattern, rxn_dstr)
+    params = _low_p_captures(rxn_dstr)
+    # capture_lst = registry.all_captures(pattern, rxn_dstr)
     # params = [[float(val) for val in vals]
     #           for vals in capture_lst]
 
@@ -176,67 +406,26 @@ def low_p_parameters(rxn_dstr):
 def troe_parameters(rxn_dstr):
     """ troe parameters
     """
-    pattern = (
-        'TROE' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.capturing(app.NUMBER) +
-        app.SPACES + app.maybe(app.capturing(app.NUMBER)) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    params = apf.first_capture(pattern, rxn_dstr)
-    if params is not None:
-        params = [float(val) for val in params]
+    params = _troe_captures(rxn_dstr)
     return params
 
 
-def chebyshev_parameters(rxn_dstr):
-    """ chebyshev parameters
+def sri_parameters(rxn_dstr):
+    """ sri parameters
     """
-    temp_pattern = (
-        'TCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    pressure_pattern = (
-        'PCHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.SPACES + app.capturing(app.FLOAT) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    alpha_dimension_pattern = (
-        'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.SPACES + app.capturing(app.INTEGER) +
-        app.SPACES + app.capturing(app.INTEGER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    alpha_elements_pattern = (
-        'CHEB' + app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.series(
-            app.capturing(app.SPACES + app.capturing(app.EXPONENTIAL_FLOAT)),
-            app.SPACES
-        ) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
+    params = _sri_captures(rxn_dstr)
+    return params
 
-    cheb_temps = apf.first_capture(temp_pattern, rxn_dstr)
-    cheb_pressures = apf.first_capture(pressure_pattern, rxn_dstr)
-    alpha_dims = apf.first_capture(alpha_dimension_pattern, rxn_dstr)
-    alpha_elm = apf.all_captures(alpha_elements_pattern, rxn_dstr)
-    if not alpha_elm:
-        alpha_elm = None
 
-    params_dct = {}
-    if all(vals is not None
-           for vals in (cheb_temps, cheb_pressures, alpha_dims, alpha_elm)):
-        params_dct['t_limits'] = [float(val) for val in cheb_temps]
-        params_dct['p_limits'] = [float(val) for val in cheb_pressures]
-        params_dct['alpha_dim'] = [int(val) for val in alpha_dims]
-        params_dct['alpha_elm'] = [list(map(float, row)) for row in alpha_elm]
-    else:
-        params_dct = None
+def chebyshev_parameters(rxn_dstr):
+    """ chebyshev parameters
+    """
+    cheb_temps = registry.first_capture(CHEB_TEMP_PATTERN, rxn_dstr)
+    cheb_pressures = registry.first_capture(CHEB_PRESSURE_PATTERN, rxn_dstr)
+    alpha_dims = registry.first_capture(CHEB_DIMENSION_PATTERN, rxn_dstr)
+    alpha_elm = registry.all_captures(CHEB_ELEMENTS_PATTERN, rxn_dstr)
+    params_dct = _chebyshev_dct(
+        cheb_temps, cheb_pressures, alpha_dims, alpha_elm)
 
     return params_dct
 
@@ -244,16 +433,7 @@ def chebyshev_parameters(rxn_dstr):
 def plog_parameters(rxn_dstr):
     """ gets parameters associated with plog strings
     """
-    pattern = (
-        'PLOG' +
-        app.zero_or_more(app.SPACE) + app.escape('/') +
-        app.zero_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.one_or_more(app.SPACE) + app.capturing(app.NUMBER) +
-        app.zero_or_more(app.SPACE) + app.escape('/')
-    )
-    params_lst = apf.all_captures(pattern, rxn_dstr)
+    params_lst = registry.all_captures(PLOG_PATTERN, rxn_dstr)
 
     # Build dictionary of parameters, indexed by parameter
     if params_lst:
@@ -261,11 +441,8 @@ def plog_parameters(rxn_dstr):
         for params in params_lst:
             pressure = float(params[0])
             vals = list(map(float, params[1:]))
-            params_dct[pressure] = vals
-            # if pressure not in params_dct:
-            #     params_dct[pressure] = [vals]
-            # else:
-            #     params_dct[pressure].append(vals)
+            # expressions repeated at a pressure are summed
+            params_dct.setdefault(pressure, []).extend(vals)
     else:
         params_dct = None
 
@@ -277,65 +454,131 @@ def buffer_enhance_factors(rxn_dstr):
         function currently only works if factors are
         on line directly after the reaction string
     """
-    species_char = app.one_of_these([
-        app.LETTER, app.DIGIT,
-        app.escape('('), app.escape(')'),
-        app.UNDERSCORE])
-    species_name = app.one_or_more(species_char)
 
     # Get the line that could have the bath gas buffer enhancements
-    bath_line_pattern = (
-        _first_line_pattern(
-            rct_ptt=SPECIES_NAMES_PATTERN,
-            prd_ptt=SPECIES_NAMES_PATTERN,
-            coeff_ptt=COEFF_PATTERN) + '\n' +
-        app.capturing(app.LINE)
-    )
-    bath_string = apf.first_capture(bath_line_pattern, rxn_dstr)
+    bath_string = registry.first_capture(BATH_LINE_PATTERN, rxn_dstr)
+    factors = _buffer_factors(bath_string)
 
+    return factors
+
+
+# helper functions #
+def _reagent_names(rxn_dstr):
+    """ reactant and product names read off of a single match
+        of the reaction line
+    """
+    rct_str, prd_str, _ = registry.first_capture(
+        REACTION_LINE_PATTERN, rxn_dstr)
+    return (_split_reagent_string(rct_str), _split_reagent_string(prd_str))
+
+
+def _third_body(rgt_str):
+    """ the third-body term of a reagent string: '(+M)', '+M', or None
+    """
+    rgt_str = registry.remove(app.LINESPACES, rgt_str)
+    if '(+M)' in rgt_str:
+        third_body = '(+M)'
+    elif 'M' in rgt_str.split('+')[1:]:
+        third_body = '+M'
+    else:
+        third_body = None
+    return third_body
+
+
+def _float_tuple(params):
+    """ convert a list of parameters to a tuple of floats
+    """
+    return tuple(map(float, params)) if params is not None else None
+
+
+def _low_p_captures(string):
+    """ low-pressure parameters from the first LOW entry of a string
+    """
+    params = registry.first_capture(LOW_PATTERN, string)
+    if params:
+        params = [float(val) for val in params]
+    else:
+        params = None
+    return params
+
+
+def _troe_captures(string):
+    """ troe parameters from the first TROE entry of a string;
+        the optional fourth parameter is dropped if it is absent
+    """
+    params = registry.first_capture(TROE_PATTERN, string)
+    if params is not None:
+        params = [float(val) for val in params if val is not None]
+    return params
+
+
+def _sri_captures(string):
+    """ sri parameters from the first SRI entry of a string;
+        the optional fourth and fifth parameters are dropped if absent
+    """
+    params = registry.first_capture(SRI_PATTERN, string)
+    if params is not None:
+        params = [float(val) for val in params if val is not None]
+    return params
+
+
+def _chebyshev_dct(cheb_temps, cheb_pressures, alpha_dims, alpha_elm):
+    """ build the chebyshev parameters dictionary from the captures
+    """
+    if not alpha_elm:
+        alpha_elm = None
+
+    params_dct = {}
+    if all(vals is not None
+           for vals in (cheb_temps, cheb_pressures, alpha_dims, alpha_elm)):
+        params_dct['t_limits'] = [float(val) for val in cheb_temps]
+        params_dct['p_limits'] = [float(val) for val in cheb_pressures]
+        params_dct['alpha_dim'] = [int(val) for val in alpha_dims]
+        params_dct['alpha_elm'] = [list(map(float, row.split()))
+                                   for row in alpha_elm]
+    else:
+        params_dct = None
+
+    return params_dct
+
+
+def _buffer_factors(bath_string):
+    """ read the bath gas enhancement factors off of the line
+        following the reaction line, if it has any
+    """
     # Check if this line has bath gas factors or is for something else
     # If factors in string, get factors
-    bad_strings = ('DUP', 'LOW', 'TROE', 'CHEB', 'PLOG')
-    if (any(string in bath_string for string in bad_strings)
-            and bath_string.strip() != ''):
+    if bath_string is None:
+        factors = None
+    elif (any(string in bath_string for string in BUFFER_BAD_STRINGS)
+          and bath_string.strip() != ''):
         factors = None
     else:
-        bath_string = '\n'.join(bath_string.strip().split())
-        factor_pattern = (
-            app.capturing(species_name) +
-            app.escape('/') +
-            app.capturing(app.NUMBER) +
-            app.escape('/')
-        )
-        baths = apf.all_captures(factor_pattern, bath_string)
+        # Drop the spaces around the slashes, as in H2/ 2.50/
+        bath_string = '/'.join(
+            val.strip() for val in bath_string.strip().split('/'))
+        bath_string = '\n'.join(bath_string.split())
+        baths = registry.all_captures(BUFFER_FACTOR_PATTERN, bath_string)
         factors = {}
-        for bath in baths:
-            factors[bath[0]] = float(bath[1])
+        if baths:
+            for bath in baths:
+                factors[bath[0]] = float(bath[1])
 
     return factors
 
 
-# helper functions #
-def _first_line_pattern(rct_ptt, prd_ptt, coeff_ptt):
-    return (rct_ptt + app.padded(CHEMKIN_ARROW) + prd_ptt +
-            app.LINESPACES + coeff_ptt)
-
-
 def _split_reagent_string(rgt_str):
 
     def _interpret_reagent_count(rgt_cnt_str):
-        _pattern = (app.STRING_START + app.capturing(app.maybe(app.DIGIT)) +
-                    app.capturing(app.one_or_more(app.NONSPACE)))
-        cnt, rgt = apf.first_capture(_pattern, rgt_cnt_str)
+        cnt, rgt = registry.first_capture(REAGENT_COUNT_PATTERN, rgt_cnt_str)
         cnt = int(cnt) if cnt else 1
         rgts = (rgt,) * cnt
         return rgts
 
-    rgt_str = apf.remove(app.LINESPACES, rgt_str)
-    rgt_str = apf.remove(CHEMKIN_PAREN_PLUS_EM, rgt_str)
-    rgt_str = apf.remove(CHEMKIN_PLUS_EM, rgt_str)
-    pattern = app.PLUS + app.not_followed_by(app.PLUS)
-    rgt_cnt_strs = apf.split(pattern, rgt_str)
+    rgt_str = registry.remove(app.LINESPACES, rgt_str)
+    rgt_str = registry.remove(CHEMKIN_PAREN_PLUS_EM, rgt_str)
+    rgt_str = registry.remove(CHEMKIN_PLUS_EM, rgt_str)
+    rgt_cnt_strs = registry.split(REAGENT_SEPARATOR_PATTERN, rgt_str)
     rgts = tuple(itertools.chain(*map(_interpret_reagent_count, rgt_cnt_strs)))
 
     return rgts
@@ -0,0 +1,114 @@
+""" registry of compiled patterns shared by the chemkin_io parsers
+
+    patterns are compiled once, on first use, and kept for the life of the
+    process; the find functions mirror those of autoparse.find but draw
+    their regex objects from the registry
+"""
+
+import re
+import contextlib
+
+
+FLAGS = re.MULTILINE
+
+_REGISTRY = {}
+_COUNTERS = []
+
+
+def compiled(pattern):
+    """ the compiled regex object for a pattern string
+    """
+    regex = _REGISTRY.get(pattern)
+    if regex is None:
+        regex = re.compile(pattern, FLAGS)
+        _REGISTRY[pattern] = regex
+        _count('compiles')
+    return regex
+
+
+def size():
+    """ the number of patterns currently held by the registry
+    """
+    return len(_REGISTRY)
+
+
+def clear():
+    """ empty the registry
+    """
+    _REGISTRY.clear()
+
+
+@contextlib.contextmanager
+def counting():
+    """ count the pattern compiles and matches performed in a context
+
+        yields a dictionary with 'compiles' and 'matches' entries which is
+        updated until the context exits; contexts may be nested
+    """
+    counts = {'compiles': 0, 'matches': 0}
+    _COUNTERS.append(counts)
+    try:
+        yield counts
+    finally:
+        _COUNTERS.remove(counts)
+
+
+# find functions #
+def has_match(pattern, string):
+    """ does this string have a pattern match?
+    """
+    _count('matches')
+    return compiled(pattern).search(string) is not None
+
+
+def matcher(pattern):
+    """ a function testing a string for a pattern match
+    """
+    regex = compiled(pattern)
+
+    def _matcher(string):
+        _count('matches')
+        return regex.search(string) is not None
+
+    return _matcher
+
+
+def first_capture(pattern, string):
+    """ capture(s) of the first match of a capturing pattern;
+        a single capture is returned bare, several as a tuple
+    """
+    _count('matches')
+    match = compiled(pattern).search(string)
+    caps = None
+    if match is not None:
+        caps = match.groups()
+        if len(caps) == 1:
+            caps = caps[0]
+    return caps
+
+
+def all_captures(pattern, string):
+    """ capture(s) of every match of a capturing pattern
+    """
+    _count('matches')
+    caps_lst = compiled(pattern).findall(string)
+    return tuple(caps_lst) if caps_lst else None
+
+
+def remove(pattern, string):
+    """ remove every match of a pattern from a string
+    """
+    _count('matches')
+    return compiled(pattern).sub('', string)
+
+
+def split(pattern, string):
+    """ split a string at every match of a pattern
+    """
+    _count('matches')
+    return tuple(compiled(pattern).split(string))
+
+
+def _count(key):
+    for counts in _COUNTERS:
+        counts[key] += 1
@@ -0,0 +1,70 @@
+""" extract sub-mechanisms from parsed mechanism data
+
+    the extraction works on the dictionaries of cache.mechanism_data and
+    only visits the reactions of the species it keeps, through the
+    species index of the mechanism
+"""
+
+from chemkin_io.parser import reaction
+
+
+def extract(mech_data, seed_names, depth=0, keep_names=()):
+    """ the sub-mechanism of a set of seed species, in the layout of
+        cache.mechanism_data
+
+        the species set grows from the seed species by depth steps, each
+        adding the species of every reaction of the species so far; the
+        sub-mechanism has the reactions with all of their reactants and
+        products in the final set, the thermo data of its species and
+        the third-body efficiencies of its species only
+
+        keep_names, such as bath gases, are kept but do not grow the set
+    """
+    rxns = mech_data['reactions'] or ()
+    spc_idx_dct = mech_data.get('species_index')
+    if spc_idx_dct is None:
+        spc_idx_dct = reaction.species_index(rxns)
+
+    # Grow the species set out from the seeds
+    spc_set = set(seed_names)
+    new_names = set(spc_set)
+    for _ in range(depth):
+        rxn_idxs = set().union(
+            *(spc_idx_dct.get(name, ()) for name in new_names))
+        new_names = set().union(
+            *(rxns[idx].reactants + rxns[idx].products for idx in rxn_idxs))
+        new_names -= spc_set
+        spc_set |= new_names
+        if not new_names:
+            break
+    spc_set |= set(keep_names)
+
+    # Keep the reactions closed over the species set, in their order
+    rxn_idxs = set().union(*(spc_idx_dct.get(name, ()) for name in spc_set))
+    sub_rxns = tuple(
+        _subset_buffer(rxns[idx], spc_set) for idx in sorted(rxn_idxs)
+        if spc_set.issuperset(rxns[idx].reactants + rxns[idx].products))
+
+    sub_data = dict(mech_data)
+    if mech_data['species'] is not None:
+        sub_data['species'] = tuple(
+            name for name in mech_data['species'] if name in spc_set)
+    if mech_data['thermo'] is not None:
+        sub_data['thermo'] = tuple(
+            thm_dat for thm_dat in mech_data['thermo']
+            if thm_dat[0] in spc_set)
+    if mech_data['reactions'] is not None:
+        sub_data['reactions'] = sub_rxns
+        sub_data['species_index'] = reaction.species_index(sub_rxns)
+
+    return sub_data
+
+
+def _subset_buffer(rxn, spc_set):
+    """ the Reaction record with the efficiencies of species outside the
+        set removed
+    """
+    if rxn.buffer is None:
+        return rxn
+    return rxn._replace(buffer={name: val for name, val in rxn.buffer.items()
+                                if name in spc_set})
@@ -2,27 +2,72 @@
 """
 
 
+import numpy as np
 import autoparse.pattern as app
-import autoparse.find as apf
 from chemkin_io.parser.util import headlined_sections
+from chemkin_io.parser import registry
 
 
 RC = 1.98720425864083e-3  # in kcal/mol.K
 
+# Patterns for the entries of the thermo block
+HEADLINE_PATTERN = (
+    app.LINE_START + app.not_followed_by(app.one_of_these(
+        [app.DIGIT, app.PLUS, app.escape('=')])) +
+    app.one_or_more(app.NONNEWLINE) +
+    app.escape('1') + app.LINE_END
+)
+SPECIES_NAME_PATTERN = (
+    app.STRING_START + app.capturing(app.one_or_more(app.NONSPACE)))
+TEMPERATURES_PATTERN = (
+    app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT) +
+    app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT) +
+    app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT))
+TEMP_COMMON_PATTERN = (
+    app.STRING_START +
+    app.UNSIGNED_FLOAT + app.LINESPACES +
+    app.capturing(app.UNSIGNED_FLOAT) + app.LINESPACES +
+    app.UNSIGNED_FLOAT)
+
+# Column layout of a standard NASA-7 entry: line width, the slices holding
+# the temperatures on the first line, and the width of a coefficient field
+LINE_WIDTH = 80
+TEMPERATURE_COLUMNS = ((45, 55), (55, 65), (65, 73))
+COEFFICIENT_WIDTH = 15
+
 
 # Functions which use thermo parsers to collate the data
 def data_block(block_str):
     """ find all thermo data
     """
     thm_dstr_lst = data_strings(block_str)
-    thm_dat_lst = tuple(zip(
-        map(species_name, thm_dstr_lst),
-        map(temperatures, thm_dstr_lst),
-        map(low_coefficients, thm_dstr_lst),
-        map(high_coefficients, thm_dstr_lst)))
+    thm_dat_lst = tuple(map(data_record, thm_dstr_lst))
     return thm_dat_lst
 
 
+def data_arrays(block_str):
+    """ the thermo data of a block as arrays
+
+        returns the species names, an (nspecies, 3) array of the low, high
+        and common temperatures and an (nspecies, 2, 7) array of the
+        coefficients, with the low temperature ones at index 0 and the
+        high temperature ones at index 1 of the second axis
+    """
+    return record_arrays(data_block(block_str))
+
+
+def record_arrays(thm_dat_lst):
+    """ the thermo data of a sequence of records, as given by data_block,
+        as arrays; see data_arrays
+    """
+    names = tuple(thm_dat[0] for thm_dat in thm_dat_lst)
+    temps = np.array(
+        [thm_dat[1] for thm_dat in thm_dat_lst], dtype=float)
+    cfts = np.array(
+        [thm_dat[2:] for thm_dat in thm_dat_lst], dtype=float)
+    return names, temps.reshape(-1, 3), cfts.reshape(-1, 2, 7)
+
+
 def data_dct(block_str, data_entry='strings'):
     """ build a dictionary indexes by the species' CHEMKIN mechanism name
         contains block entry
@@ -46,35 +91,58 @@ def data_dct(block_str, data_entry='strings'):
 def data_strings(block_str):
     """ thermo strings
     """
-    headline_pattern = (
-        app.LINE_START + app.not_followed_by(app.one_of_these(
-            [app.DIGIT, app.PLUS, app.escape('=')])) +
-        app.one_or_more(app.NONNEWLINE) +
-        app.escape('1') + app.LINE_END
-    )
     thm_strs = headlined_sections(
         string=block_str.strip(),
-        headline_pattern=headline_pattern,
+        headline_pattern=HEADLINE_PATTERN,
     )
     return thm_strs
 
 
+def column_strings(block_str):
+    """ thermo strings with their column layout kept, from a block whose
+        whitespace has not been cleaned up, such as a section given by
+        parser.mechanism.section; each is the four lines of an entry,
+        numbered 1 to 4 in their last column; comments are removed
+    """
+    lines = [line.split('!')[0].rstrip() for line in block_str.splitlines()]
+    thm_strs = []
+    idx = 0
+    while idx + 4 <= len(lines):
+        entry_lines = lines[idx:idx+4]
+        if all(line.endswith(str(num + 1))
+               for num, line in enumerate(entry_lines)):
+            thm_strs.append('\n'.join(entry_lines))
+            idx += 4
+        else:
+            idx += 1
+    return tuple(thm_strs)
+
+
+def data_record(thm_dstr):
+    """ the species name, temperatures, and low and high temperature
+        coefficients of a thermo data string
+
+        entries in the standard 80-column layout are read by column in a
+        single pass; others fall back to the pattern parsers
+    """
+    fields = _fixed_column_fields(thm_dstr)
+    if fields is None:
+        fields = _pattern_fields(thm_dstr)
+    return (species_name(thm_dstr),) + fields
+
+
 def species_name(thm_dstr):
     """ get the species name from a thermo data string
     """
-    pattern = app.STRING_START + app.capturing(app.one_or_more(app.NONSPACE))
-    spc = apf.first_capture(pattern, thm_dstr)
+    spc = registry.first_capture(SPECIES_NAME_PATTERN, thm_dstr)
     return spc
 
 
 def temperatures(thm_dstr):
     """ get the common temperature from a thermo data string
     """
-    headline = apf.split_lines(thm_dstr)[0]
-    pattern = (app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT) +
-               app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT) +
-               app.LINESPACES + app.capturing(app.UNSIGNED_FLOAT))
-    captures = apf.first_capture(pattern, headline)
+    headline = thm_dstr.splitlines()[0]
+    captures = registry.first_capture(TEMPERATURES_PATTERN, headline)
     assert captures
     tmps = tuple(map(float, captures))
     return tmps
@@ -83,7 +151,7 @@ def temperatures(thm_dstr):
 def low_coefficients(thm_dstr):
     """ get the low temperature thermo coefficients
     """
-    capture_lst = apf.all_captures(app.EXPONENTIAL_FLOAT, thm_dstr)
+    capture_lst = registry.all_captures(app.EXPONENTIAL_FLOAT, thm_dstr)
     assert len(capture_lst) in (14, 15)
     cfts = tuple(map(float, capture_lst[7:14]))
     return cfts
@@ -92,7 +160,7 @@ def low_coefficients(thm_dstr):
 def high_coefficients(thm_dstr):
     """ get the high temperature thermo coefficients
     """
-    capture_lst = apf.all_captures(app.EXPONENTIAL_FLOAT, thm_dstr)
+    capture_lst = registry.all_captures(app.EXPONENTIAL_FLOAT, thm_dstr)
     assert len(capture_lst) in (14, 15)
     cfts = tuple(map(float, capture_lst[:7]))
     return cfts
@@ -101,11 +169,53 @@ def high_coefficients(thm_dstr):
 def temp_common_default(block_str):
     """ temperature defaults from the thermo block
     """
-    pattern = (app.STRING_START +
-               app.UNSIGNED_FLOAT + app.LINESPACES +
-               app.capturing(app.UNSIGNED_FLOAT) + app.LINESPACES +
-               app.UNSIGNED_FLOAT)
-    capture = apf.first_capture(pattern, block_str)
+    capture = registry.first_capture(TEMP_COMMON_PATTERN, block_str)
     assert capture
     tmp_com_def = float(capture)
     return tmp_com_def
+
+
+def _fixed_column_fields(thm_dstr):
+    """ the temperatures and coefficients of a thermo data string, sliced
+        out of the standard column layout; None if it does not fit
+
+        each line is aligned on its line number in the last column, so
+        strings with their leading whitespace removed are read as well
+    """
+    lines = [line.rstrip() for line in thm_dstr.splitlines()]
+    if len(lines) != 4:
+        return None
+
+    vals = []
+    for idx, line in enumerate(lines):
+        offset = LINE_WIDTH - len(line)
+        if offset < 0 or line[-1] != str(idx + 1):
+            return None
+        if idx == 0:
+            bounds = TEMPERATURE_COLUMNS
+        else:
+            nfields = 5 if idx < 3 else 4
+            bounds = tuple(
+                (COEFFICIENT_WIDTH * num, COEFFICIENT_WIDTH * (num + 1))
+                for num in range(nfields))
+        try:
+            vals.extend(float(line[max(start - offset, 0):end - offset])
+                        for start, end in bounds)
+        except ValueError:
+            return None
+
+    tmps = tuple(vals[:3])
+    high_cfts = tuple(vals[3:10])
+    low_cfts = tuple(vals[10:])
+    return tmps, low_cfts, high_cfts
+
+
+def _pattern_fields(thm_dstr):
+    """ the temperatures and coefficients of a thermo data string, found
+        by the pattern parsers with a single scan for the coefficients
+    """
+    capture_lst = registry.all_captures(app.EXPONENTIAL_FLOAT, thm_dstr)
+    assert len(capture_lst) in (14, 15)
+    low_cfts = tuple(map(float, capture_lst[7:14]))
+    high_cfts = tuple(map(float, capture_lst[:7]))
+    return temperatures(thm_dstr), low_cfts, high_cfts
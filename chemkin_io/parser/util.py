@@ -1,25 +1,31 @@
 """ utility functions
 """
+import multiprocessing
 import more_itertools as mit
 import autoparse.pattern as app
-import autoparse.find as apf
+from chemkin_io.parser import registry
+
+
+# Smallest number of items per chunk sent to a worker process
+MIN_CHUNK_SIZE = 500
+
+WHITESPACE_PATTERN = app.one_of_these([
+    app.LINE_START + app.maybe(app.LINESPACES) + app.NEWLINE,
+    app.LINESPACES + app.LINE_END,
+    app.LINE_START + app.LINESPACES])
 
 
 def clean_up_whitespace(string):
     """ remove leading spaces, trailing spaces, and empty lines from a string
     """
-    empty_line = app.LINE_START + app.maybe(app.LINESPACES) + app.NEWLINE
-    trailing_spaces = app.LINESPACES + app.LINE_END
-    leading_spaces = app.LINE_START + app.LINESPACES
-    pattern = app.one_of_these([empty_line, trailing_spaces, leading_spaces])
-    return apf.remove(pattern, string)
+    return registry.remove(WHITESPACE_PATTERN, string)
 
 
 def remove_line_comments(string, delim_pattern):
     """ remove line comments marked by a delimiter pattern
     """
     pattern = delim_pattern + app.zero_or_more(app.NONNEWLINE)
-    return apf.remove(pattern, string)
+    return registry.remove(pattern, string)
 
 
 def headlined_sections(string, headline_pattern):
@@ -27,7 +33,7 @@ def headlined_sections(string, headline_pattern):
     """
     lines = string.splitlines()
     join_lines = '\n'.join
-    pattern_matcher = apf.matcher(headline_pattern)
+    pattern_matcher = registry.matcher(headline_pattern)
     lines = mit.lstrip(lines, pred=lambda line: not pattern_matcher(line))
     sections = list(map(join_lines, mit.split_before(lines, pattern_matcher)))
     return sections
@@ -39,5 +45,29 @@ def block(string, start_pattern, end_pattern):
     contents_pattern = app.capturing(
         app.one_or_more(app.WILDCARD, greedy=False))
     pattern = start_pattern + contents_pattern + end_pattern
-    contents = apf.first_capture(pattern, string)
+    contents = registry.first_capture(pattern, string)
     return contents
+
+
+def parallel_map(fxn, seq, nprocs=1, min_chunk_size=MIN_CHUNK_SIZE,
+                 max_chunk_size=None):
+    """ map a function over a sequence with a pool of worker processes
+
+        results come back in the order of the sequence; the chunk size
+        grows with the length of the sequence so each worker gets a few
+        chunks, up to max_chunk_size if given, and sequences too short to
+        give every worker a full chunk are mapped serially to avoid the
+        pool startup cost; fxn must be a module-level function so that it
+        can be pickled
+    """
+    seq = list(seq)
+    nprocs = min(nprocs, len(seq) // min_chunk_size)
+    if nprocs <= 1:
+        return list(map(fxn, seq))
+
+    chunk_size = max(min_chunk_size, -(-len(seq) // (4 * nprocs)))
+    if max_chunk_size is not None:
+        chunk_size = min(chunk_size, max_chunk_size)
+    with multiprocessing.Pool(nprocs) as pool:
+        results = pool.map(fxn, seq, chunksize=chunk_size)
+    return results
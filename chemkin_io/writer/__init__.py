@@ -4,9 +4,11 @@ Interface to CHEMKIN
 
 from chemkin_io.writer import reaction
 from chemkin_io.writer import transport
+from chemkin_io.writer import mechanism
 
 
 __all__ = [
     'reaction',
-    'transport'
+    'transport',
+    'mechanism'
 ]
@@ -0,0 +1,42 @@
+""" write whole CHEMKIN mechanism strings
+"""
+
+from chemkin_io.writer import reaction
+
+
+def string(spc_names, rxns, rxn_units, thm_strs=(), elm_block=None):
+    """ Write the CHEMKIN string of a mechanism from its species names,
+        its parsed Reaction records and their units, as given by
+        parser.mechanism.reaction_units, the thermo data strings of its
+        species in their column layout, as given by
+        parser.thermo.column_strings, and its elements block, as given by
+        parser.mechanism.elements_block
+    """
+
+    # Elements block
+    mech_str = ''
+    if elm_block is not None:
+        mech_str += 'ELEMENTS\n'
+        mech_str += ''.join('    {0}\n'.format(line.strip())
+                            for line in elm_block.splitlines()
+                            if line.strip())
+        mech_str += 'END\n\n'
+
+    # Species block
+    mech_str += 'SPECIES\n'
+    mech_str += ''.join('    {0}\n'.format(name) for name in spc_names)
+    mech_str += 'END\n\n'
+
+    # Thermo block, with the entries as they were read
+    if thm_strs:
+        mech_str += 'THERMO\n'
+        mech_str += ''.join(thm_str.rstrip() + '\n' for thm_str in thm_strs)
+        mech_str += 'END\n\n'
+
+    # Reaction block, in the units of the records
+    mech_str += 'REACTIONS    {0}   {1}\n'.format(
+        rxn_units[0].upper(), rxn_units[1].upper())
+    mech_str += ''.join(reaction.data_string(rxn) for rxn in rxns)
+    mech_str += 'END\n'
+
+    return mech_str
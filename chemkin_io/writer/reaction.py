@@ -93,3 +93,58 @@ def _fit_info_str(pressures, temp_dct, err_dct):
         inf_str += '! {0}: {1} {2}\n'.format(pstr, temp_range_str, err_str)
 
     return inf_str
+
+
+def data_string(rxn):
+    """ Write the CHEMKIN string of a single reaction expression
+        from a parsed Reaction record
+    """
+
+    # Build the reaction line with the high-pressure params
+    third_body = rxn.third_body if rxn.third_body is not None else ''
+    arrow = '=' if rxn.reversible else '=>'
+    rxn_str = '{0}{1}{2}{3}{1}'.format(
+        '+'.join(rxn.reactants), third_body, arrow, '+'.join(rxn.products))
+    high_a, high_n, high_ea = rxn.high_p
+    r_str = '{0:<48s} {1:>13.6E} {2:>10.5f} {3:>13.4f}\n'.format(
+        rxn_str, high_a, high_n, high_ea)
+
+    # Bath gas factors must directly follow the reaction line
+    if rxn.buffer:
+        r_str += ' '.join(
+            '{0}/{1:.4f}/'.format(name, factor)
+            for name, factor in rxn.buffer.items()) + '\n'
+
+    if rxn.low_p is not None:
+        r_str += '{0:>8s} /{1:>13.6E} {2:>10.5f} {3:>13.4f} /\n'.format(
+            'LOW', *rxn.low_p)
+    if rxn.troe is not None:
+        r_str += '{0:>8s} /'.format('TROE')
+        r_str += ''.join(' {0:>13.6E}'.format(val) for val in rxn.troe)
+        r_str += ' /\n'
+    if rxn.sri is not None:
+        r_str += '{0:>8s} /'.format('SRI')
+        r_str += ''.join(' {0:>13.6E}'.format(val) for val in rxn.sri)
+        r_str += ' /\n'
+    if rxn.plog is not None:
+        for pressure, params in rxn.plog.items():
+            for idx in range(0, len(params), 3):
+                r_str += '{0:>8s} /{1:>13.6E} '.format('PLOG', pressure)
+                r_str += '{0:>13.6E} {1:>10.5f} {2:>13.4f} /\n'.format(
+                    *params[idx:idx+3])
+    if rxn.chebyshev is not None:
+        cheb_dct = rxn.chebyshev
+        r_str += '{0:>8s} / {1:.6f} {2:.6f} /\n'.format(
+            'TCHEB', *cheb_dct['t_limits'])
+        r_str += '{0:>8s} / {1:.6f} {2:.6f} /\n'.format(
+            'PCHEB', *cheb_dct['p_limits'])
+        r_str += '{0:>8s} / {1:d} {2:d} /\n'.format(
+            'CHEB', *cheb_dct['alpha_dim'])
+        for row in cheb_dct['alpha_elm']:
+            r_str += '{0:>8s} /'.format('CHEB')
+            r_str += ''.join(' {0:>13.6E}'.format(val) for val in row)
+            r_str += ' /\n'
+    if rxn.duplicate:
+        r_str += 'DUPLICATE\n'
+
+    return r_str
@@ -3,11 +3,11 @@ Calculate rates with various fitting functions
 """
 
 import numpy as np
-from scipy.special import eval_chebyt
 
 
 RC = 1.98720425864083e-3  # Gas Constant in kcal/mol.K
 RC2 = 0.0820573660809596  # Gas Constant in L.atm/mol.K
+RC_CM3 = 82.0573660809596  # Gas Constant in cm3.atm/mol.K
 
 
 def single_arrhenius(a_par, n_par, ea_par,
@@ -33,32 +33,73 @@ def double_arrhenius(a_par1, n_par1, ea_par1,
 def arrhenius(params, t_ref, temp):
     """ simplified function whcih will call single or double arrhenis
         based on the number of params that are passed in
-        only does single and double fits.
-        params must be [a1, n1, ea1] or [a1, n2, ea1, a2, n2, ea2]
+        params must be [a1, n1, ea1] or [a1, n2, ea1, a2, n2, ea2];
+        longer lists of [a, n, ea] triples are summed in the same way
     """
-    assert len(params) in (3, 6)
+    assert len(params) % 3 == 0 and len(params) > 0
 
     if len(params) == 3:
         kts = single_arrhenius(
             params[0], params[1], params[2],
             t_ref, temp)
-    else:
+    elif len(params) == 6:
         kts = double_arrhenius(
             params[0], params[1], params[2],
             params[3], params[4], params[5],
             t_ref, temp)
+    else:
+        kts = sum(
+            single_arrhenius(
+                params[i], params[i+1], params[i+2], t_ref, temp)
+            for i in range(0, len(params), 3))
 
     return kts
 
 
-def lindemann(highp_ks, lowp_ks, pressures, temps):
+def arrhenius_dlnk_dt(params, t_ref, temps):
+    """ the temperature derivative of ln k of a set of Arrhenius params,
+        d ln k / dT, with several [a, n, ea] triples summed
+    """
+    assert len(params) % 3 == 0 and len(params) > 0
+    temps = np.asarray(temps, dtype=float)
+
+    rate_ks = 0.0
+    dk_dts = 0.0
+    for i in range(0, len(params), 3):
+        kts = single_arrhenius(
+            params[i], params[i+1], params[i+2], t_ref, temps)
+        rate_ks = rate_ks + kts
+        dk_dts = dk_dts + kts * (params[i+1] / temps +
+                                 params[i+2] / (RC * temps**2))
+
+    return dk_dts / rate_ks
+
+
+def arrhenius_derivatives(params, t_ref, temps):
+    """ the derivatives of the rate constants of each [a, n, ea] triple of
+        a set of Arrhenius params with respect to a, n and ea, as three
+        (ntriples, ntemps) arrays
+    """
+    params = np.asarray(params, dtype=float).reshape(-1, 3)
+    temps = np.asarray(temps, dtype=float)
+
+    dk_das = np.array(
+        [single_arrhenius(1.0, n_par, ea_par, t_ref, temps)
+         for _, n_par, ea_par in params]).reshape(len(params), len(temps))
+    kts = params[:, :1] * dk_das
+    dk_dns = kts * np.log(temps / t_ref)
+    dk_deas = -kts / (RC * temps)
+
+    return dk_das, dk_dns, dk_deas
+
+
+def lindemann(highp_ks, lowp_ks, pressures, temps, m_factor=1.0):
     """ calculate pressure-dependence constants according to Lindemann
         model; no value for high
     """
-    ktp_dct = {}
-    for pressure in pressures:
-        ktp_dct[pressure] = lindemann_rate_constants(
-            highp_ks, lowp_ks, pressure, temps)
+    ktps = falloff_grid(highp_ks, lowp_ks, pressures, temps,
+                        m_factor=m_factor)
+    ktp_dct = dict(zip(pressures, ktps))
 
     return ktp_dct
 
@@ -77,15 +118,14 @@ def lindemann_rate_constants(highp_ks, lowp_ks, pressure, temps):
 
 
 def troe(highp_ks, lowp_ks, pressures, temps,
-         alpha, ts3, ts1, ts2=None):
+         alpha, ts3, ts1, ts2=None, m_factor=1.0):
     """ calculate pressure-dependence constants according to Troe
         model; no value for high
     """
-    ktp_dct = {}
-    for pressure in pressures:
-        ktp_dct[pressure] = troe_rate_constants(
-            highp_ks, lowp_ks, pressure, temps,
-            alpha, ts3, ts1, ts2)
+    ktps = falloff_grid(highp_ks, lowp_ks, pressures, temps,
+                        troe_params=(alpha, ts3, ts1, ts2),
+                        m_factor=m_factor)
+    ktp_dct = dict(zip(pressures, ktps))
 
     return ktp_dct
 
@@ -104,66 +144,239 @@ def troe_rate_constants(highp_ks, lowp_ks, pressure, temp,
     return ktps
 
 
-def plog(plog_dct, t_ref, pressures, temps):
+def sri(highp_ks, lowp_ks, pressures, temps,
+        a_par, b_par, c_par, d_par=1.0, e_par=0.0, m_factor=1.0):
+    """ calculate pressure-dependence constants according to SRI
+        model; no value for high
+    """
+    ktps = falloff_grid(highp_ks, lowp_ks, pressures, temps,
+                        sri_params=(a_par, b_par, c_par, d_par, e_par),
+                        m_factor=m_factor)
+    ktp_dct = dict(zip(pressures, ktps))
+
+    return ktp_dct
+
+
+def falloff_grid(highp_ks, lowp_ks, pressures, temps,
+                 troe_params=None, sri_params=None, m_factor=1.0):
+    """ calculate falloff rate constants over a grid of pressures and
+        temperatures; Lindemann unless Troe params (alpha, ts3, ts1, ts2)
+        or SRI params (a, b, c, d, e) are given
+
+        the high- and low-pressure rate constants may be (ntemps,) arrays
+        for one reaction or (nreactions, ntemps) arrays for several, with
+        the falloff params and m_factor then broadcast against
+        (nreactions, 1, 1); m_factor scales the bath gas concentration by
+        the third-body efficiencies of the mixture; returns an
+        (npressures, ntemps) or (nreactions, npressures, ntemps) array
+
+        the bath gas concentration [M] = P / RT is in mol/cm3, the units
+        of CHEMKIN rate constants, with the pressures in atm
+    """
+    temps = np.asarray(temps, dtype=float)
+    pressures = np.asarray(pressures, dtype=float)
+    highp_ks = np.asarray(highp_ks, dtype=float)[..., np.newaxis, :]
+    lowp_ks = np.asarray(lowp_ks, dtype=float)[..., np.newaxis, :]
+
+    # Calculate the pr term over the grid
+    conc_m = pressures[:, np.newaxis] / (RC_CM3 * temps)
+    pr_term = (lowp_ks / highp_ks) * conc_m * m_factor
+
+    # Calculate the broadening factor; Fcent only depends on temperature
+    if troe_params is not None:
+        alpha, ts3, ts1, ts2 = troe_params
+        f_cent = _troe_f_cent(alpha, ts3, ts1, ts2, temps)
+        f_term = _troe_f_term(pr_term, f_cent)
+    elif sri_params is not None:
+        f_term = _sri_f_term(pr_term, temps, *sri_params)
+    else:
+        f_term = 1.0
+
+    ktps = highp_ks * (pr_term / (1.0 + pr_term)) * f_term
+
+    return ktps
+
+
+def falloff_grid_derivatives(highp_ks, lowp_ks, highp_dlnks, lowp_dlnks,
+                             pressures, temps, troe_params=None,
+                             sri_params=None, m_factor=1.0):
+    """ the derivatives of the log of the falloff rate constants of
+        falloff_grid, over the same grid, with respect to temperature at a
+        fixed bath gas concentration, d ln k / dT, and with respect to the
+        log of the bath gas concentration, d ln k / d ln [M]
+
+        highp_dlnks and lowp_dlnks are the d ln k / dT of the high- and
+        low-pressure rate constants, in the shape of the rate constants
+    """
+    temps = np.asarray(temps, dtype=float)
+    pressures = np.asarray(pressures, dtype=float)
+    highp_ks = np.asarray(highp_ks, dtype=float)[..., np.newaxis, :]
+    lowp_ks = np.asarray(lowp_ks, dtype=float)[..., np.newaxis, :]
+    highp_dlnks = np.asarray(highp_dlnks, dtype=float)[..., np.newaxis, :]
+    lowp_dlnks = np.asarray(lowp_dlnks, dtype=float)[..., np.newaxis, :]
+
+    conc_m = pressures[:, np.newaxis] / (RC_CM3 * temps)
+    pr_term = (lowp_ks / highp_ks) * conc_m * m_factor
+
+    # d log10 Pr for each variable; [M] is held fixed for T
+    log_pr = np.log10(pr_term)
+    dlog_pr_dt = (lowp_dlnks - highp_dlnks) / np.log(10.0)
+    dlog_pr_dlnm = 1.0 / np.log(10.0)
+
+    # d ln F for each variable
+    if troe_params is not None:
+        alpha, ts3, ts1, ts2 = troe_params
+        f_cent = _troe_f_cent(alpha, ts3, ts1, ts2, temps)
+        df_cent_dt = (-(1.0 - alpha) / ts3 * np.exp(-temps / ts3) -
+                      alpha / ts1 * np.exp(-temps / ts1))
+        if ts2 is not None:
+            # an infinite T2, for a missing term, contributes nothing
+            df_cent_dt = df_cent_dt + (
+                np.where(np.isfinite(ts2), ts2, 0.0) / temps**2 *
+                np.exp(-ts2 / temps))
+        dlog_f_cent_dt = df_cent_dt / (f_cent * np.log(10.0))
+        dlnf_dt = np.log(10.0) * _troe_dlogf(
+            log_pr, np.log10(f_cent), dlog_pr_dt, dlog_f_cent_dt)
+        dlnf_dlnm = np.log(10.0) * _troe_dlogf(
+            log_pr, np.log10(f_cent), dlog_pr_dlnm, 0.0)
+    elif sri_params is not None:
+        a_par, b_par, c_par = sri_params[:3]
+        e_par = sri_params[4] if len(sri_params) > 4 else 0.0
+        base = a_par * np.exp(-b_par / temps) + np.exp(-temps / c_par)
+        dbase_dt = (a_par * b_par / temps**2 * np.exp(-b_par / temps) -
+                    np.exp(-temps / c_par) / c_par)
+        x_val = 1.0 / (1.0 + log_pr**2)
+        dx_dlog_pr = -2.0 * log_pr * x_val**2
+        dlnf_dt = (dx_dlog_pr * dlog_pr_dt * np.log(base) +
+                   x_val * dbase_dt / base + e_par / temps)
+        dlnf_dlnm = dx_dlog_pr * dlog_pr_dlnm * np.log(base)
+    else:
+        dlnf_dt, dlnf_dlnm = 0.0, 0.0
+
+    # ln k = ln kinf + ln Pr - ln(1 + Pr) + ln F
+    dlnk_dt = (highp_dlnks +
+               np.log(10.0) * dlog_pr_dt / (1.0 + pr_term) + dlnf_dt)
+    dlnk_dlnm = 1.0 / (1.0 + pr_term) + dlnf_dlnm
+
+    return dlnk_dt, dlnk_dlnm
+
+
+def plog(plog_dct, t_ref, pressures, temps, policy='clamp'):
     """ calculate the rate constant using a dictionary of plog params
     """
-    ktp_dct = {}
-    for pressure in pressures:
-        ktp_dct[pressure] = plog_rate_constants(
-            plog_dct, t_ref, pressure, temps)
+    ktps = plog_grid(plog_dct, t_ref, pressures, temps, policy=policy)
+    ktp_dct = dict(zip(pressures, ktps))
 
     return ktp_dct
 
 
-def plog_rate_constants(plog_dct, t_ref, pressure, temps):
+def plog_rate_constants(plog_dct, t_ref, pressure, temps, policy='clamp'):
     """ calculate the rate constant using a dictionary of plog params
     """
-    plog_pressures = [pressure for pressure in plog_dct]
+    ktps = plog_grid(plog_dct, t_ref, [pressure], temps, policy=policy)
 
-    # Check if pressure is in plog dct; use plog pressure for numerical stab
-    pressure_defined = False
-    for plog_pressure in plog_pressures:
-        if np.isclose(pressure, plog_pressure, atol=1.0e-3):
-            pressure_defined = True
-            plog_params = plog_dct[plog_pressure]
+    return ktps[0]
 
-    # If pressure equals value use, arrhenius expression
-    if pressure_defined:
-        ktps = arrhenius(plog_params, t_ref, temps)
-    # Find which two PLOG pressures our pressure of interest sits between
-    else:
-        for i, _ in enumerate(plog_pressures):
-            if i != len(plog_pressures)-1:
-                if plog_pressures[i] < pressure < plog_pressures[i+1]:
-                    plow = plog_pressures[i]
-                    phigh = plog_pressures[i+1]
-                    plow_params = plog_dct[plow]
-                    phigh_params = plog_dct[phigh]
-                    break
-
-        kt_low = arrhenius(plow_params, t_ref, temps)
-        kt_high = arrhenius(phigh_params, t_ref, temps)
-        pres_term = (
-            (np.log10(pressure) - np.log10(plow)) /
-            (np.log10(phigh) - np.log10(plow))
-        )
-        logkt = (
-            np.log10(kt_low) +
-            ((np.log10(kt_high) - np.log10(kt_low)) * pres_term)
-        )
-
-        ktps = 10**(logkt)
+
+def plog_grid(plog_dct, t_ref, pressures, temps, policy='clamp'):
+    """ calculate the rate constants using a dictionary of plog params
+        over a grid of pressures and temperatures;
+        returns an (npressures, ntemps) array
+
+        log k is interpolated linearly in log P between the bracketing
+        plog pressures; params with several [a, n, ea] triples are summed;
+        outside the range of plog pressures, policy='clamp' uses the rate
+        constants of the nearest plog pressure and policy='extrapolate'
+        continues the interpolation of the nearest pair
+    """
+    assert policy in ('clamp', 'extrapolate')
+    temps = np.asarray(temps, dtype=float)
+
+    # Sort the plog pressures and calculate their rate constants once
+    plog_pressures = np.array(sorted(plog_dct), dtype=float)
+    plog_logks = np.log10(np.array(
+        [arrhenius(plog_dct[pressure], t_ref, temps)
+         for pressure in sorted(plog_dct)], dtype=float).reshape(
+             len(plog_pressures), len(temps)))
+    if len(plog_pressures) == 1:
+        return np.tile(10**plog_logks, (len(pressures), 1))
+
+    idxs, pres_terms = _plog_weights(plog_pressures, pressures, policy)
+    logktps = (
+        plog_logks[idxs] +
+        (plog_logks[idxs+1] - plog_logks[idxs]) * pres_terms[:, np.newaxis]
+    )
+
+    ktps = 10**(logktps)
 
     return ktps
 
 
+def plog_grid_dlnk_dt(plog_dct, t_ref, pressures, temps, policy='clamp'):
+    """ the temperature derivative of ln k of the rate constants of
+        plog_grid, over the same grid
+    """
+    assert policy in ('clamp', 'extrapolate')
+    temps = np.asarray(temps, dtype=float)
+
+    plog_pressures = np.array(sorted(plog_dct), dtype=float)
+    plog_dlnks = np.array(
+        [arrhenius_dlnk_dt(plog_dct[pressure], t_ref, temps)
+         for pressure in sorted(plog_dct)], dtype=float).reshape(
+             len(plog_pressures), len(temps))
+    if len(plog_pressures) == 1:
+        return np.tile(plog_dlnks, (len(pressures), 1))
+
+    # log k is linear in the plog log k's, with weights free of T
+    idxs, pres_terms = _plog_weights(plog_pressures, pressures, policy)
+    dlnktps = (
+        plog_dlnks[idxs] +
+        (plog_dlnks[idxs+1] - plog_dlnks[idxs]) * pres_terms[:, np.newaxis]
+    )
+
+    return dlnktps
+
+
+def plog_grid_derivatives(plog_dct, t_ref, pressures, temps,
+                          policy='clamp'):
+    """ the derivatives of the rate constants of plog_grid with respect to
+        the a, n and ea of each [a, n, ea] triple, as three
+        (ntriples, npressures, ntemps) arrays; the triples are ordered by
+        plog pressure, then as they are given
+    """
+    assert policy in ('clamp', 'extrapolate')
+    temps = np.asarray(temps, dtype=float)
+    pressures = np.asarray(pressures, dtype=float)
+    ktps = plog_grid(plog_dct, t_ref, pressures, temps, policy=policy)
+
+    # weights of the log k of each plog pressure in the log k of the grid
+    plog_pressures = np.array(sorted(plog_dct), dtype=float)
+    weights = np.zeros((len(plog_pressures), len(pressures)))
+    if len(plog_pressures) == 1:
+        weights[0] = 1.0
+    else:
+        idxs, pres_terms = _plog_weights(plog_pressures, pressures, policy)
+        cols = np.arange(len(pressures))
+        weights[idxs, cols] = 1.0 - pres_terms
+        weights[idxs+1, cols] = pres_terms
+
+    derivs = ([], [], [])
+    for weight, pressure in zip(weights, sorted(plog_dct)):
+        plog_ks = arrhenius(plog_dct[pressure], t_ref, temps)
+        scale = ktps * weight[:, np.newaxis] / plog_ks
+        for deriv, expr_derivs in zip(
+                derivs, arrhenius_derivatives(plog_dct[pressure], t_ref,
+                                              temps)):
+            deriv.append(expr_derivs[:, np.newaxis, :] * scale)
+
+    return tuple(np.concatenate(deriv) for deriv in derivs)
+
+
 def chebyshev(alpha, tmin, tmax, pmin, pmax, pressures, temps):
     """ computes the rate constants using the chebyshev polynomials
     """
-    ktp_dct = {}
-    for pressure in pressures:
-        ktp_dct[pressure] = chebyshev_rate_constants(
-            temps, pressure, alpha, tmin, tmax, pmin, pmax)
+    ktps = chebyshev_grid(alpha, tmin, tmax, pmin, pmax, pressures, temps)
+    ktp_dct = dict(zip(pressures, ktps))
 
     return ktp_dct
 
@@ -171,38 +384,156 @@ def chebyshev(alpha, tmin, tmax, pmin, pmax, pressures, temps):
 def chebyshev_rate_constants(temps, pressure, alpha, tmin, tmax, pmin, pmax):
     """ computes the rate constants using the chebyshev polynomials
     """
-    alpha_nrows, alpha_ncols = alpha.shape
-
-    ktps = np.zeros(len(temps))
-    for i, temp in enumerate(temps):
-        ctemp = (
-            (2.0 * temp**(-1) - tmin**(-1) - tmax**(-1)) /
-            (tmax**(-1) - tmin**(-1))
-        )
-        cpress = (
-            (2.0 * np.log10(pressure) - np.log10(pmin) - np.log10(pmax)) /
-            (np.log10(pmax) - np.log10(pmin))
-        )
-
-        logktp = 0.0
-        for j in range(alpha_nrows):
-            for k in range(alpha_ncols):
-                logktp += (
-                    alpha[j][k] *
-                    eval_chebyt(j, ctemp) *
-                    eval_chebyt(k, cpress)
-                )
-
-        ktps[i] = 10**(logktp)
+    ktps = chebyshev_grid(alpha, tmin, tmax, pmin, pmax, [pressure], temps)
+
+    return ktps[0]
+
+
+def chebyshev_grid(alpha, tmin, tmax, pmin, pmax, pressures, temps):
+    """ computes the rate constants using the chebyshev polynomials
+        over a grid of pressures and temperatures;
+        returns an (npressures, ntemps) array
+    """
+    ktps = chebyshev_batch(
+        [alpha], [(tmin, tmax)], [(pmin, pmax)], pressures, temps)
+
+    return ktps[0]
+
+
+def chebyshev_batch(alphas, t_limits, p_limits, pressures, temps):
+    """ computes the rate constants of several chebyshev reactions at once
+        over a grid of pressures and temperatures
+
+        alpha matrices of different shapes are padded with zeros to the
+        largest one; returns an (nreactions, npressures, ntemps) array
+    """
+    alpha_arr, ctemps, cpresses = _chebyshev_arrays(
+        alphas, t_limits, p_limits, pressures, temps)
+    nrows, ncols = alpha_arr.shape[1:]
+
+    # log k = Phi_P . alpha^T . Phi_T^T with the chebyshev basis matrices
+    temp_basis = np.polynomial.chebyshev.chebvander(ctemps, nrows - 1)
+    press_basis = np.polynomial.chebyshev.chebvander(cpresses, ncols - 1)
+    logktps = np.matmul(
+        np.matmul(press_basis, np.transpose(alpha_arr, (0, 2, 1))),
+        np.transpose(temp_basis, (0, 2, 1)))
+
+    ktps = 10**(logktps)
 
     return ktps
 
 
+def chebyshev_batch_dlnk_dt(alphas, t_limits, p_limits, pressures, temps):
+    """ the temperature derivative of ln k of the rate constants of
+        chebyshev_batch, over the same grid
+    """
+    temps = np.asarray(temps, dtype=float)
+    alpha_arr, ctemps, cpresses = _chebyshev_arrays(
+        alphas, t_limits, p_limits, pressures, temps)
+    nrows, ncols = alpha_arr.shape[1:]
+    if nrows < 2:
+        return np.zeros((len(alpha_arr), len(cpresses[0]), len(temps)))
+    [tmins, tmaxs] = np.asarray(t_limits, dtype=float).reshape(-1, 2).T
+
+    # differentiate the temperature series, then apply the chain rule
+    # through the reduced temperature
+    dalpha_arr = np.polynomial.chebyshev.chebder(alpha_arr, axis=1)
+    temp_basis = np.polynomial.chebyshev.chebvander(ctemps, nrows - 2)
+    press_basis = np.polynomial.chebyshev.chebvander(cpresses, ncols - 1)
+    dlogktps = np.matmul(
+        np.matmul(press_basis, np.transpose(dalpha_arr, (0, 2, 1))),
+        np.transpose(temp_basis, (0, 2, 1)))
+    dctemps = (-2.0 / temps**2 /
+               (1.0 / tmaxs[:, None] - 1.0 / tmins[:, None]))
+
+    return np.log(10.0) * dlogktps * dctemps[:, np.newaxis, :]
+
+
+def chebyshev_batch_alpha_derivatives(alphas, t_limits, p_limits,
+                                      pressures, temps):
+    """ the derivatives of the rate constants of chebyshev_batch with
+        respect to each alpha element, as one
+        (nreactions, nrows, ncols, npressures, ntemps) array; the alpha
+        matrices are zero-padded to a common shape, with zero derivatives
+        for the padding
+    """
+    alpha_arr, ctemps, cpresses = _chebyshev_arrays(
+        alphas, t_limits, p_limits, pressures, temps)
+    nrows, ncols = alpha_arr.shape[1:]
+    ktps = chebyshev_batch(alphas, t_limits, p_limits, pressures, temps)
+
+    # d log10 k / d alpha_jk = T_j(T~) T_k(P~)
+    temp_basis = np.transpose(
+        np.polynomial.chebyshev.chebvander(ctemps, nrows - 1), (0, 2, 1))
+    press_basis = np.transpose(
+        np.polynomial.chebyshev.chebvander(cpresses, ncols - 1), (0, 2, 1))
+    dktps = (np.log(10.0) * ktps[:, np.newaxis, np.newaxis] *
+             temp_basis[:, :, np.newaxis, np.newaxis, :] *
+             press_basis[:, np.newaxis, :, :, np.newaxis])
+
+    for i, alpha in enumerate(alphas):
+        nrow, ncol = np.shape(alpha)
+        dktps[i, nrow:] = 0.0
+        dktps[i, :, ncol:] = 0.0
+
+    return dktps
+
+
+def _chebyshev_arrays(alphas, t_limits, p_limits, pressures, temps):
+    """ the zero-padded (nreactions, nrows, ncols) alpha array and the
+        (nreactions, ntemps) and (nreactions, npressures) reduced
+        temperatures and pressures of a set of chebyshev reactions
+    """
+    temps = np.asarray(temps, dtype=float)
+    pressures = np.asarray(pressures, dtype=float)
+    alphas = [np.asarray(alpha, dtype=float) for alpha in alphas]
+    [tmins, tmaxs] = np.asarray(t_limits, dtype=float).reshape(-1, 2).T
+    [pmins, pmaxs] = np.asarray(p_limits, dtype=float).reshape(-1, 2).T
+
+    # Stack the alpha matrices, padded to a common shape
+    nrows = max(alpha.shape[0] for alpha in alphas)
+    ncols = max(alpha.shape[1] for alpha in alphas)
+    alpha_arr = np.zeros((len(alphas), nrows, ncols))
+    for i, alpha in enumerate(alphas):
+        alpha_arr[i, :alpha.shape[0], :alpha.shape[1]] = alpha
+
+    # Reduced temperatures and pressures of each reaction
+    ctemps = (
+        (2.0 / temps - 1.0 / tmins[:, None] - 1.0 / tmaxs[:, None]) /
+        (1.0 / tmaxs[:, None] - 1.0 / tmins[:, None])
+    )
+    cpresses = (
+        (2.0 * np.log10(pressures) -
+         np.log10(pmins[:, None]) - np.log10(pmaxs[:, None])) /
+        (np.log10(pmaxs[:, None]) - np.log10(pmins[:, None]))
+    )
+
+    return alpha_arr, ctemps, cpresses
+
+
+def _plog_weights(plog_pressures, pressures, policy):
+    """ the index of the lower plog pressure of the bracketing pair of
+        each pressure and its position within the pair, in log P
+    """
+    plog_logps = np.log10(plog_pressures)
+    logps = np.log10(np.asarray(pressures, dtype=float))
+    idxs = np.clip(np.searchsorted(plog_logps, logps, side='right') - 1,
+                   0, len(plog_logps) - 2)
+    pres_terms = (
+        (logps - plog_logps[idxs]) /
+        (plog_logps[idxs+1] - plog_logps[idxs])
+    )
+    if policy == 'clamp':
+        pres_terms = np.clip(pres_terms, 0.0, 1.0)
+
+    return idxs, pres_terms
+
+
 def _pr_term(highp_rateks, lowp_rateks, pressure, temp):
     """ calculate the corrective pr term used for Lindemann and Troe
-        pressure-dependent forms
+        pressure-dependent forms, with [M] = P / RT in mol/cm3
     """
-    pr_term = (lowp_rateks / highp_rateks) * (pressure / (RC2 * temp))
+    pr_term = (lowp_rateks / highp_rateks) * (pressure / (RC_CM3 * temp))
     return pr_term
 
 
@@ -210,22 +541,67 @@ def _f_broadening_term(pr_term, alpha, ts3, ts1, ts2, temp):
     """ calculate the F broadening factor used for Troe
         pressure-dependent forms
     """
+    f_cent = _troe_f_cent(alpha, ts3, ts1, ts2, temp)
+    f_term = _troe_f_term(pr_term, f_cent)
+
+    return f_term
+
 
-    # Calculate Fcent term
+def _troe_f_cent(alpha, ts3, ts1, ts2, temp):
+    """ calculate the Fcent term of the Troe broadening factor
+    """
     f_cent = ((1.0 - alpha) * np.exp(-temp / ts3) +
               alpha * np.exp(-temp / ts1))
     if ts2 is not None:
-        f_cent += np.exp(-ts2 / temp)
+        f_cent = f_cent + np.exp(-ts2 / temp)
 
+    return f_cent
+
+
+def _troe_f_term(pr_term, f_cent):
+    """ calculate the Troe broadening factor from the pr term and Fcent
+    """
     # Calculate the Log F term
-    c_val = -0.4 - 0.67 * np.log10(f_cent)
-    n_val = 0.75 - 1.27 * np.log10(f_cent)
+    log_f_cent = np.log10(f_cent)
+    c_val = -0.4 - 0.67 * log_f_cent
+    n_val = 0.75 - 1.27 * log_f_cent
     d_val = 0.14
     val = ((np.log10(pr_term) + c_val) /
            (n_val - d_val * (np.log10(pr_term) + c_val)))**2
-    logf = (1.0 + val)**(-1) * np.log10(f_cent)
+    logf = (1.0 + val)**(-1) * log_f_cent
 
     # Calculate F broadening term
     f_term = 10**(logf)
 
     return f_term
+
+
+def _troe_dlogf(log_pr, log_f_cent, dlog_pr, dlog_f_cent):
+    """ the derivative of log10 F of the Troe broadening factor, from the
+        derivatives of log10 Pr and log10 Fcent
+    """
+    c_val = -0.4 - 0.67 * log_f_cent
+    n_val = 0.75 - 1.27 * log_f_cent
+    d_val = 0.14
+    u_val = log_pr + c_val
+    denom = n_val - d_val * u_val
+    x_val = u_val / denom
+
+    du_val = dlog_pr - 0.67 * dlog_f_cent
+    ddenom = -1.27 * dlog_f_cent - d_val * du_val
+    dx_val = (du_val * denom - u_val * ddenom) / denom**2
+
+    return (dlog_f_cent / (1.0 + x_val**2) -
+            log_f_cent * 2.0 * x_val * dx_val / (1.0 + x_val**2)**2)
+
+
+def _sri_f_term(pr_term, temp, a_par, b_par, c_par, d_par=1.0, e_par=0.0):
+    """ calculate the F broadening factor used for SRI
+        pressure-dependent forms
+    """
+    x_val = 1.0 / (1.0 + np.log10(pr_term)**2)
+    f_term = (d_par *
+              (a_par * np.exp(-b_par / temp) + np.exp(-temp / c_par))**x_val *
+              temp**e_par)
+
+    return f_term
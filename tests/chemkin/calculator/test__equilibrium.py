@@ -0,0 +1,113 @@
+""" test chemkin_io.calculator.equilibrium
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy as np
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+SYNGAS_THERMO_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.thermo_block(SYNGAS_MECH_STR))
+SYNGAS_UNITS = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+
+T_REF = 1.0
+TEMPS = np.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = np.array([1.0, 10.0])
+
+
+def test__stoichiometric_matrix():
+    """ test chemkin_io.calculator.equilibrium.stoichiometric_matrix
+    """
+    rxn_keys = [(('H2O2',), ('OH', 'OH')),
+                (('H', 'O2'), ('HO2',))]
+    names, stoich = chemkin_io.calculator.equilibrium.stoichiometric_matrix(
+        rxn_keys)
+    assert names == ('H2O2', 'OH', 'H', 'O2', 'HO2')
+    assert np.array_equal(
+        stoich.toarray(),
+        [[-1.0, 2.0, 0.0, 0.0, 0.0],
+         [0.0, 0.0, -1.0, -1.0, 1.0]])
+
+
+def test__equilibrium_constants():
+    """ test chemkin_io.calculator.equilibrium.equilibrium_constants
+    """
+    names, tmps, cfts = chemkin_io.parser.thermo.data_arrays(
+        SYNGAS_THERMO_BLOCK)
+    _, _, _, gibbs = chemkin_io.calculator.thermo.properties(
+        cfts, tmps, TEMPS)
+    gibbs_dct = dict(zip(names, gibbs))
+    cmech = chemkin_io.calculator.rates.compiled_mechanism(
+        SYNGAS_REACTION_BLOCK, SYNGAS_UNITS)
+    _, stoich = chemkin_io.calculator.equilibrium.stoichiometric_matrix(
+        cmech.rxn_keys, names=names)
+    k_ps = chemkin_io.calculator.equilibrium.equilibrium_constants(
+        stoich, gibbs, TEMPS, kind='kp')
+    k_cs = chemkin_io.calculator.equilibrium.equilibrium_constants(
+        stoich, gibbs, TEMPS, kind='kc')
+    assert k_ps.shape == (len(cmech.rxn_keys), len(TEMPS))
+
+    # every reaction agrees with the sum over its reagents
+    for rxn_idx, (rcts, prds) in enumerate(cmech.rxn_keys):
+        rxn_gibbs = (sum(gibbs_dct[prd] for prd in prds) -
+                     sum(gibbs_dct[rct] for rct in rcts))
+        ref_k_ps = np.exp(
+            -rxn_gibbs / (chemkin_io.calculator.equilibrium.RC * TEMPS))
+        assert np.allclose(k_ps[rxn_idx], ref_k_ps)
+
+        # Kc = Kp (P/RT)^dn in mol/cm3 units
+        delta_n = len(prds) - len(rcts)
+        ref_k_cs = ref_k_ps * (1.0 / (82.0573660809596 * TEMPS)) ** delta_n
+        assert np.allclose(k_cs[rxn_idx], ref_k_cs)
+
+
+def test__reverse_rates():
+    """ test chemkin_io.calculator.equilibrium.reverse_rates
+    """
+    names, tmps, cfts = chemkin_io.parser.thermo.data_arrays(
+        SYNGAS_THERMO_BLOCK)
+    _, _, _, gibbs = chemkin_io.calculator.thermo.properties(
+        cfts, tmps, TEMPS)
+    cmech = chemkin_io.calculator.rates.compiled_mechanism(
+        SYNGAS_REACTION_BLOCK, SYNGAS_UNITS)
+    ktp_arrays = chemkin_io.calculator.rates.mechanism_arrays(
+        cmech, SYNGAS_UNITS, T_REF, TEMPS, PRESSURES)
+    rev_arrays = chemkin_io.calculator.equilibrium.reverse_rates(
+        cmech, ktp_arrays, names, gibbs, TEMPS)
+
+    _, stoich = chemkin_io.calculator.equilibrium.stoichiometric_matrix(
+        cmech.rxn_keys, names=names)
+    k_cs = chemkin_io.calculator.equilibrium.equilibrium_constants(
+        stoich, gibbs, TEMPS)
+    ktps = chemkin_io.calculator.rates.dense_ktps(ktp_arrays)
+    rev_ktps = chemkin_io.calculator.rates.dense_ktps(rev_arrays)
+    assert len(rev_arrays.rxn_idx_dct) == len(cmech.rxn_keys)
+    for rxn_key, rxn_idx in ktp_arrays.rxn_idx_dct.items():
+        rev_idx = rev_arrays.rxn_idx_dct[rxn_key[::-1]]
+        assert np.allclose(
+            rev_ktps[rev_idx] * k_cs[rxn_idx], ktps[rxn_idx])
+
+    # the reversed tensor has a view like the forward one
+    rev_view = chemkin_io.calculator.rates.KTPView(rev_arrays)
+    rxn_key = cmech.rxn_keys[0]
+    assert list(rev_view[rxn_key[::-1]]) == list(
+        chemkin_io.calculator.rates.KTPView(ktp_arrays)[rxn_key])
+
+
+if __name__ == '__main__':
+    test__stoichiometric_matrix()
+    test__equilibrium_constants()
+    test__reverse_rates()
@@ -0,0 +1,177 @@
+""" test chemkin_io.calculator.production
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy as np
+import ratefit
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+SYNGAS_THERMO_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.thermo_block(SYNGAS_MECH_STR))
+SYNGAS_UNITS = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+SYNGAS_PMECH = chemkin_io.calculator.production.production_mechanism(
+    SYNGAS_REACTION_BLOCK, SYNGAS_UNITS,
+    thm_arrays=chemkin_io.parser.thermo.data_arrays(SYNGAS_THERMO_BLOCK))
+
+T_REF = 1.0
+TEMP = 1200.0
+PRESSURE = 2.0
+CONCS = np.random.RandomState(7).uniform(
+    1e-8, 1e-6, (3, len(SYNGAS_PMECH.names)))
+
+
+def test__production_rates():
+    """ test chemkin_io.calculator.production.production_rates
+        against a reaction-by-reaction sum
+    """
+    pmech = SYNGAS_PMECH
+    names = pmech.names
+    wdots = chemkin_io.calculator.production.production_rates(
+        pmech, TEMP, PRESSURE, CONCS, t_ref=T_REF)
+    assert wdots.shape == CONCS.shape
+
+    names_, tmps, cfts = chemkin_io.parser.thermo.data_arrays(
+        SYNGAS_THERMO_BLOCK)
+    gibbs_dct = dict(zip(names_, chemkin_io.calculator.thermo.properties(
+        cfts, tmps, [TEMP])[3][:, 0]))
+
+    for concs, batch_wdots in zip(CONCS, wdots):
+        conc_dct = dict(zip(names, concs))
+        ref_wdots = dict.fromkeys(names, 0.0)
+        for rxn in pmech.cmech.rxns:
+            buffer_dct = rxn.buffer or {}
+            conc_m = sum(buffer_dct.get(name, 1.0) * conc
+                         for name, conc in conc_dct.items())
+            if rxn.low_p is not None and rxn.plog is None and (
+                    rxn.chebyshev is None):
+                highp_ks = chemkin_io.calculator.rates.reaction(
+                    rxn._replace(low_p=None, troe=None, sri=None),
+                    SYNGAS_UNITS, T_REF, np.array([TEMP]))['high']
+                lowp_ks = chemkin_io.calculator.rates.reaction(
+                    rxn._replace(high_p=rxn.low_p, low_p=None, troe=None,
+                                 sri=None),
+                    SYNGAS_UNITS, T_REF, np.array([TEMP]))['high']
+                kf_val = chemkin_io.calculator.rates.falloff_rates(
+                    [rxn], [highp_ks], [lowp_ks], [PRESSURE], [TEMP],
+                    m_factor=(conc_m * ratefit.fxns.RC_CM3 * TEMP /
+                              PRESSURE))[0, 0, 0]
+            else:
+                ktp_dct = chemkin_io.calculator.rates.reaction(
+                    rxn, SYNGAS_UNITS, T_REF, np.array([TEMP]), [PRESSURE])
+                kf_val = ktp_dct.get(PRESSURE, ktp_dct['high'])[0]
+
+            rxn_gibbs = (sum(gibbs_dct[prd] for prd in rxn.products) -
+                         sum(gibbs_dct[rct] for rct in rxn.reactants))
+            k_c = np.exp(-rxn_gibbs / (chemkin_io.calculator.thermo.RC *
+                                       TEMP))
+            k_c *= (1.0 / (82.0573660809596 * TEMP)) ** (
+                len(rxn.products) - len(rxn.reactants))
+            kr_val = kf_val / k_c if rxn.reversible else 0.0
+
+            rop = (kf_val * np.prod([conc_dct[r] for r in rxn.reactants]) -
+                   kr_val * np.prod([conc_dct[p] for p in rxn.products]))
+            if rxn.third_body == '+M':
+                rop *= conc_m
+            for rct in rxn.reactants:
+                ref_wdots[rct] -= rop
+            for prd in rxn.products:
+                ref_wdots[prd] += rop
+
+        assert np.allclose(
+            batch_wdots, [ref_wdots[name] for name in names],
+            rtol=1e-8, atol=1e-20)
+
+
+def test__third_body_concentrations():
+    """ test chemkin_io.calculator.production.third_body_concentrations
+    """
+    pmech = SYNGAS_PMECH
+    conc_ms = chemkin_io.calculator.production.third_body_concentrations(
+        pmech, CONCS)
+    rxn_idx = next(idx for idx, rxn in enumerate(pmech.cmech.rxns)
+                   if rxn.buffer)
+    buffer_dct = pmech.cmech.rxns[rxn_idx].buffer
+    assert np.allclose(
+        conc_ms[:, rxn_idx],
+        [sum(buffer_dct.get(name, 1.0) * conc
+             for name, conc in zip(pmech.names, concs)) for concs in CONCS])
+
+
+def test__jacobians():
+    """ test chemkin_io.calculator.production.jacobians
+        against central finite differences
+    """
+    pmech = SYNGAS_PMECH
+    jacs, dwdot_dts = chemkin_io.calculator.production.jacobians(
+        pmech, TEMP, PRESSURE, CONCS, t_ref=T_REF)
+    assert len(jacs) == len(CONCS)
+    assert dwdot_dts.shape == CONCS.shape
+
+    for concs, jac, batch_dwdot_dts in zip(CONCS, jacs, dwdot_dts):
+        assert jac.shape == (len(pmech.names),) * 2
+
+        # perturb every species at once, one per batch entry
+        steps = 1e-6 * concs
+        concs_up = concs + np.diag(steps)
+        concs_dn = concs - np.diag(steps)
+        ref_jac = (
+            chemkin_io.calculator.production.production_rates(
+                pmech, TEMP, PRESSURE, concs_up, t_ref=T_REF) -
+            chemkin_io.calculator.production.production_rates(
+                pmech, TEMP, PRESSURE, concs_dn, t_ref=T_REF)).T / (
+                    2.0 * steps)
+        scale = np.abs(ref_jac).max()
+        assert np.allclose(jac.toarray(), ref_jac, rtol=1e-5,
+                           atol=1e-7 * scale)
+
+        temp_step = 1e-3
+        ref_dwdot_dts = (
+            chemkin_io.calculator.production.production_rates(
+                pmech, TEMP + temp_step, PRESSURE, concs, t_ref=T_REF) -
+            chemkin_io.calculator.production.production_rates(
+                pmech, TEMP - temp_step, PRESSURE, concs, t_ref=T_REF)
+        )[0] / (2.0 * temp_step)
+        assert np.allclose(batch_dwdot_dts, ref_dwdot_dts, rtol=1e-5,
+                           atol=1e-7 * np.abs(ref_dwdot_dts).max())
+
+
+def test__falloff_units():
+    """ test that chemkin_io.calculator.production.rate_constants and
+        chemkin_io.calculator.rates.mechanism_arrays give the same falloff
+        rate constants for the same state
+    """
+    pmech = SYNGAS_PMECH
+    pressure = 1.0
+    concs = np.zeros((1, len(pmech.names)))
+    concs[0, pmech.names.index('N2')] = pressure / (
+        ratefit.fxns.RC_CM3 * TEMP)
+    kfs, _ = chemkin_io.calculator.production.rate_constants(
+        pmech, TEMP, pressure, concs, t_ref=T_REF)
+    ktps = chemkin_io.calculator.rates.dense_ktps(
+        chemkin_io.calculator.rates.mechanism_arrays(
+            chemkin_io.calculator.rates.record_mechanism(pmech.cmech),
+            SYNGAS_UNITS, T_REF, [TEMP], [pressure],
+            mol_fracs={'N2': 1.0}))
+    assert pmech.falloff.any()
+    assert np.allclose(kfs[0], ktps[:, 1, 0])
+
+
+if __name__ == '__main__':
+    test__production_rates()
+    test__third_body_concentrations()
+    test__jacobians()
+    test__falloff_units()
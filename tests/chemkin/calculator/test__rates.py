@@ -17,6 +17,10 @@ def _read_file(file_name):
 PATH = os.path.dirname(os.path.realpath(__file__))
 SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
 SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+NATGAS_PATH = os.path.join(PATH, '../data/natgas')
+NATGAS_MECH_STR = _read_file(os.path.join(NATGAS_PATH, 'mechanism.txt'))
+HEPTANE_PATH = os.path.join(PATH, '../data/heptane')
+HEPTANE_MECH_STR = _read_file(os.path.join(HEPTANE_PATH, 'mechanism.txt'))
 
 SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
     chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
@@ -100,6 +104,132 @@ def test__mechanism():
         print(ktp)
 
 
+def test__mechanism_arrays():
+    """ test chemkin_io.calculator.rates.mechanism
+        with the rates as a single array and as a view of it
+    """
+    units = chemkin_io.parser.mechanism.reaction_units(
+        SYNGAS_MECH_STR)
+    ktp_dct = chemkin_io.calculator.rates.mechanism(
+        SYNGAS_REACTION_BLOCK, units, T_REF, TEMPS, pressures=PRESSURES)
+    ktp_arrays = chemkin_io.calculator.rates.mechanism(
+        SYNGAS_REACTION_BLOCK, units, T_REF, TEMPS, pressures=PRESSURES,
+        output='array')
+    ktp_view = chemkin_io.calculator.rates.mechanism(
+        SYNGAS_REACTION_BLOCK, units, T_REF, TEMPS, pressures=PRESSURES,
+        output='view')
+    assert ktp_arrays.high_ktps.shape == (len(ktp_dct), len(TEMPS))
+    assert ktp_arrays.pdep_ktps.shape == (
+        ktp_arrays.pdep.sum(), len(PRESSURES), len(TEMPS))
+    assert chemkin_io.calculator.rates.dense_ktps(ktp_arrays).shape == (
+        len(ktp_dct), len(PRESSURES) + 1, len(TEMPS))
+    assert list(ktp_arrays.rxn_idx_dct) == list(ktp_dct)
+    assert list(ktp_arrays.press_idx_dct) == ['high'] + list(PRESSURES)
+
+    # the view reads like the dictionary, without copying the rates
+    assert list(ktp_view) == list(ktp_dct)
+    for rxn_key, rxn_ktp_dct in ktp_dct.items():
+        for pressure, ktps in rxn_ktp_dct.items():
+            assert np.allclose(ktp_view[rxn_key][pressure], ktps)
+        assert np.shares_memory(
+            ktp_view[rxn_key]['high'], ktp_view.arrays.high_ktps)
+
+    # pressure-independent reactions only have high-pressure rates
+    rxn_key = next(key for key, rxn_ktp_dct in ktp_dct.items()
+                   if list(rxn_ktp_dct) == ['high'] and
+                   not ktp_arrays.pdep[ktp_arrays.rxn_idx_dct[key]])
+    assert list(ktp_view[rxn_key]) == ['high']
+    rxn_idx = ktp_arrays.rxn_idx_dct[rxn_key]
+    assert ktp_arrays.pdep_rows[rxn_idx] == -1
+    ktps = chemkin_io.calculator.rates.dense_ktps(ktp_arrays)
+    assert np.allclose(ktps[rxn_idx, 1:], ktps[rxn_idx, 0])
+
+
+def test__mechanism_view():
+    """ test chemkin_io.calculator.rates.mechanism
+        with the rates as a view against the dictionary, for mechanisms
+        with mixed pressure-dependent and -independent duplicates
+    """
+    for mech_str in (SYNGAS_MECH_STR, NATGAS_MECH_STR, HEPTANE_MECH_STR):
+        units = chemkin_io.parser.mechanism.reaction_units(mech_str)
+        rxn_block = chemkin_io.parser.util.clean_up_whitespace(
+            chemkin_io.parser.mechanism.reaction_block(mech_str))
+        ktp_dct = chemkin_io.calculator.rates.mechanism(
+            rxn_block, units, T_REF, TEMPS, pressures=PRESSURES)
+        ktp_view = chemkin_io.calculator.rates.mechanism(
+            rxn_block, units, T_REF, TEMPS, pressures=PRESSURES,
+            output='view')
+        assert list(ktp_view) == list(ktp_dct)
+        for rxn_key, rxn_ktp_dct in ktp_dct.items():
+            assert list(ktp_view[rxn_key]) == list(rxn_ktp_dct)
+            for pressure, ktps in rxn_ktp_dct.items():
+                assert np.allclose(ktp_view[rxn_key][pressure], ktps,
+                                   equal_nan=True)
+
+
+def test__mechanism_arrays_nbytes():
+    """ test chemkin_io.calculator.rates.mechanism_arrays
+        only stores pressure columns for the pressure-dependent reactions
+    """
+    temps = np.linspace(500.0, 2000.0, 100)
+    pressures = np.logspace(-1.0, 2.0, 10)
+    units = chemkin_io.parser.mechanism.reaction_units(HEPTANE_MECH_STR)
+    rxn_block = chemkin_io.parser.util.clean_up_whitespace(
+        chemkin_io.parser.mechanism.reaction_block(HEPTANE_MECH_STR))
+    ktp_arrays = chemkin_io.calculator.rates.mechanism(
+        rxn_block, units, T_REF, temps, pressures=pressures,
+        output='array')
+    nrxns = len(ktp_arrays.rxn_idx_dct)
+    npdep = ktp_arrays.pdep.sum()
+    assert 0 < npdep < nrxns // 10
+
+    nbytes = (ktp_arrays.high_ktps.nbytes + ktp_arrays.pdep_ktps.nbytes +
+              ktp_arrays.pdep_rows.nbytes)
+    assert nbytes == (nrxns * len(temps) * 8 +
+                      npdep * len(pressures) * len(temps) * 8 +
+                      ktp_arrays.pdep_rows.nbytes)
+    dense_nbytes = chemkin_io.calculator.rates.dense_ktps(ktp_arrays).nbytes
+    assert dense_nbytes == nrxns * (len(pressures) + 1) * len(temps) * 8
+    assert nbytes < dense_nbytes / 5
+
+
+def test__arrhenius_rates():
+    """ test chemkin_io.calculator.rates.arrhenius_rates
+    """
+    units = chemkin_io.parser.mechanism.reaction_units(
+        SYNGAS_MECH_STR)
+    cmech = chemkin_io.calculator.rates.compiled_mechanism(
+        SYNGAS_REACTION_BLOCK, units)
+    nrxns = len(cmech.rxns)
+    highp_ks = chemkin_io.calculator.rates.arrhenius_rates(
+        cmech.high_p, nrxns, TEMPS, T_REF)
+    lowp_ks = chemkin_io.calculator.rates.arrhenius_rates(
+        cmech.low_p, nrxns, TEMPS, T_REF)
+    assert highp_ks.shape == lowp_ks.shape == (nrxns, len(TEMPS))
+
+    for idx, rxn in enumerate(cmech.rxns):
+        ktp_dct = chemkin_io.calculator.rates.reaction(
+            rxn, units, T_REF, TEMPS, pressures=PRESSURES)
+        assert np.allclose(highp_ks[idx], ktp_dct['high'])
+        if rxn.low_p is None:
+            assert not np.any(lowp_ks[idx])
+
+    # duplicates are summed into one reaction
+    dup_rxns = tuple(map(chemkin_io.parser.reaction.data_record,
+                         DUP_HIGHP_REACTION.splitlines()))
+    dup_cmech = chemkin_io.calculator.rates.compiled_mechanism(
+        dup_rxns, ('cal/mole', 'moles'))
+    dup_ks = chemkin_io.calculator.rates.reduced_rates(
+        dup_cmech, chemkin_io.calculator.rates.arrhenius_rates(
+            dup_cmech.high_p, 2, TEMPS, T_REF))
+    ref_ks = sum(
+        chemkin_io.calculator.rates.reaction(
+            rxn, ('cal/mole', 'moles'), T_REF, TEMPS)['high']
+        for rxn in dup_rxns)
+    assert dup_ks.shape == (1, len(TEMPS))
+    assert np.allclose(dup_ks[0], ref_ks)
+
+
 def test__high_p_rate_constants():
     """ test chemkin_io.calculator.rates.reaction
         for a reaction with only high-pressure params
@@ -146,6 +276,32 @@ def test__troe_rate_constants():
         print(val)
 
 
+def test__sri_rate_constants():
+    """ test chemkin_io.calculator.rates.reaction
+        for a reaction with high-pressure, low-pressure, and SRI params
+        and third-body efficiencies
+    """
+    units = ('cal/mole', 'moles')
+    sri_reaction = (
+        'C2H4(+M)=C2H2+H2(+M)    8.000E+12     0.440   86770.0\n'
+        'H2/ 2.00/ H2O/ 6.00/ AR/ 0.70/\n'
+        'LOW /  1.580E+51    -9.300   97800.0 /\n'
+        'SRI /  0.450     797.0     979.0     1.200     0.100 /')
+    ktp_dct = chemkin_io.calculator.rates.reaction(
+        sri_reaction, units, T_REF, TEMPS, pressures=PRESSURES)
+    assert all(pressure in ktp_dct for pressure in PRESSURES)
+
+    # efficiencies scale the bath gas concentration
+    mol_fracs = {'N2': 0.5, 'H2O': 0.5}
+    eff_ktp_dct = chemkin_io.calculator.rates.reaction(
+        sri_reaction, units, T_REF, TEMPS, pressures=PRESSURES,
+        mol_fracs=mol_fracs)
+    ref_ktp_dct = chemkin_io.calculator.rates.reaction(
+        sri_reaction, units, T_REF, TEMPS, pressures=3.5 * PRESSURES)
+    for pressure, ref_pressure in zip(PRESSURES, 3.5 * PRESSURES):
+        assert np.allclose(eff_ktp_dct[pressure], ref_ktp_dct[ref_pressure])
+
+
 def test__chebyshev_rate_constants():
     """ test chemkin_io.calculator.rates.reaction
         for a reaction with only high-pressure and Chebyshev params
@@ -201,6 +357,10 @@ def test__duplicate_plog_rate_constants():
 
 if __name__ == '__main__':
     test__mechanism()
+    test__mechanism_arrays()
+    test__mechanism_view()
+    test__mechanism_arrays_nbytes()
+    test__arrhenius_rates()
     # test__high_p_rate_constants()
     # test__lindemann_rate_constants()
     # test__troe_rate_constants()
@@ -0,0 +1,133 @@
+""" test chemkin_io.calculator.reduction
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy as np
+import scipy.sparse
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_MECH_DATA = chemkin_io.parser.cache.parse(SYNGAS_MECH_STR)
+SYNGAS_PMECH = chemkin_io.calculator.production.production_mechanism(
+    SYNGAS_MECH_DATA['reactions'], SYNGAS_MECH_DATA['units'],
+    thm_arrays=chemkin_io.parser.thermo.record_arrays(
+        SYNGAS_MECH_DATA['thermo']))
+
+STATES = (
+    (1200.0, 1.0, {'H2(2)': 0.2, 'O2(3)': 0.1, 'N2': 0.7, 'H(4)': 1e-4,
+                   'O(5)': 1e-5, 'OH(6)': 1e-4, 'H2O(7)': 0.01,
+                   'HO2(10)': 1e-6, 'CO(1)': 1e-3}),
+    (1500.0, 10.0, {'H2(2)': 0.1, 'O2(3)': 0.05, 'N2': 0.7, 'H(4)': 1e-3,
+                    'OH(6)': 1e-3, 'H2O(7)': 0.1, 'CO(1)': 1e-2,
+                    'CO2(12)': 1e-3}),
+)
+TARGETS = ('H2(2)', 'O2(3)')
+
+
+def test__interaction_coefficients():
+    """ test chemkin_io.calculator.reduction.interaction_coefficients
+        against sums over the records, species pair by species pair
+    """
+    pmech = SYNGAS_PMECH
+    rops = chemkin_io.calculator.reduction.state_rates(pmech, STATES)
+    assert rops.shape == (len(STATES), len(pmech.cmech.rxns))
+
+    stoich = pmech.net_stoich.toarray()
+    partic = (pmech.rct_stoich + pmech.prd_stoich).toarray() != 0.0
+    for method in ('drg', 'drgep'):
+        coeffs = chemkin_io.calculator.reduction.interaction_coefficients(
+            pmech, rops, method=method)
+        assert scipy.sparse.issparse(coeffs)
+        ref_coeffs = np.zeros(coeffs.shape)
+        for state_rops in rops:
+            terms = stoich * state_rops[:, np.newaxis]
+            for idx_a in range(len(pmech.names)):
+                if method == 'drg':
+                    denom = np.abs(terms[:, idx_a]).sum()
+                    numers = np.abs(terms[:, idx_a]) @ partic
+                else:
+                    denom = max(terms[:, idx_a].clip(min=0.0).sum(),
+                                -terms[:, idx_a].clip(max=0.0).sum())
+                    numers = np.abs(terms[:, idx_a] @ partic)
+                if denom > 0.0:
+                    ref_coeffs[idx_a] = np.maximum(
+                        ref_coeffs[idx_a], numers / denom)
+        np.fill_diagonal(ref_coeffs, 0.0)
+        assert np.allclose(coeffs.toarray(), ref_coeffs)
+        assert coeffs.max() <= 1.0 + 1e-12
+
+
+def test__path_coefficients():
+    """ test chemkin_io.calculator.reduction.path_coefficients
+    """
+    coeffs = scipy.sparse.csr_matrix(np.array(
+        [[0.0, 0.5, 0.1, 0.0],
+         [0.0, 0.0, 0.8, 0.0],
+         [0.0, 0.0, 0.0, 0.0],
+         [0.0, 0.0, 0.9, 0.0]]))
+    path_coeffs = chemkin_io.calculator.reduction.path_coefficients(
+        coeffs, [0])
+    assert np.allclose(path_coeffs, [1.0, 0.5, 0.4, 0.0])
+    path_coeffs = chemkin_io.calculator.reduction.path_coefficients(
+        coeffs, [0, 3])
+    assert np.allclose(path_coeffs, [1.0, 0.5, 0.9, 1.0])
+
+
+def test__reduced_string():
+    """ test chemkin_io.calculator.reduction.reduced_string
+    """
+    spc_counts = []
+    for threshold in (0.0, 0.1, 0.5):
+        mech_str = chemkin_io.calculator.reduction.reduced_string(
+            SYNGAS_MECH_STR, STATES, TARGETS, threshold, keep_names=['N2'])
+        mech_data = chemkin_io.parser.cache.parse(mech_str)
+        spc_counts.append(len(mech_data['species']))
+
+        # the written mechanism reads back as the skeletal one
+        sub_data = chemkin_io.calculator.reduction.reduced_mechanism(
+            SYNGAS_MECH_DATA, STATES, TARGETS, threshold, keep_names=['N2'])
+        assert mech_data['species'] == sub_data['species']
+        assert mech_data['thermo'] == sub_data['thermo']
+        assert mech_data['reactions'] == sub_data['reactions']
+        assert (chemkin_io.parser.mechanism.elements_block(mech_str) ==
+                chemkin_io.parser.mechanism.elements_block(SYNGAS_MECH_STR))
+
+        # the thermo entries keep the 80-column layout of NASA polynomials
+        thm_strs = chemkin_io.parser.thermo.column_strings(
+            chemkin_io.parser.mechanism.section(mech_str, 'thermo'))
+        assert len(thm_strs) == len(sub_data['thermo'])
+        for thm_str in thm_strs:
+            lines = thm_str.splitlines()
+            assert [(len(line), line[-1]) for line in lines] == [
+                (80, '1'), (80, '2'), (80, '3'), (80, '4')]
+        assert set(TARGETS + ('N2',)) <= set(mech_data['species'])
+        rxn_keys = [(rxn.reactants, rxn.products)
+                    for rxn in SYNGAS_MECH_DATA['reactions']]
+        assert all((rxn.reactants, rxn.products) in rxn_keys
+                   for rxn in sub_data['reactions'])
+
+    assert spc_counts == sorted(spc_counts, reverse=True)
+    assert spc_counts[-1] < spc_counts[0]
+
+    # DRG keeps the targets and the species reached from them
+    drg_data = chemkin_io.calculator.reduction.reduced_mechanism(
+        SYNGAS_MECH_DATA, STATES, TARGETS, 0.1, method='drg')
+    assert set(TARGETS) <= set(drg_data['species'])
+    assert len(drg_data['species']) < len(SYNGAS_MECH_DATA['species'])
+
+
+if __name__ == '__main__':
+    test__interaction_coefficients()
+    test__path_coefficients()
+    test__reduced_string()
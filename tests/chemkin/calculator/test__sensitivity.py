@@ -0,0 +1,133 @@
+""" test chemkin_io.calculator.sensitivity
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy as np
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+SYNGAS_UNITS = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+PLOG_REACTION = """HOCO<=>CO+OH         6.300E+032    -5.960    32.470
+PLOG/      0.0010     1.550E-008     2.930     8.768/
+PLOG/      0.0030     1.770E+003     0.340    18.076/
+PLOG/      0.0296     2.020E+013    -1.870    22.755/
+PLOG/      0.0987     1.680E+018    -3.050    24.323/
+PLOG/      0.0987     1.680E+016    -2.050    24.323/
+PLOG/      0.2961     2.500E+024    -4.630    27.067/
+PLOG/      0.9869     4.540E+026    -5.120    27.572/"""
+CMECH = chemkin_io.calculator.rates.compiled_mechanism(
+    SYNGAS_REACTION_BLOCK + '\n' + PLOG_REACTION, SYNGAS_UNITS)
+
+T_REF = 1.0
+TEMPS = np.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = np.array([0.01, 0.1, 1.0, 10.0])
+REL_STEP = 1e-6
+
+
+def _record_ktps(cmech):
+    return chemkin_io.calculator.rates.dense_ktps(
+        chemkin_io.calculator.rates.mechanism_arrays(
+            chemkin_io.calculator.rates.record_mechanism(cmech),
+            SYNGAS_UNITS, T_REF, TEMPS, PRESSURES))
+
+
+def _assert_close(sens, ktps_up, ktps_dn, step):
+    ref_sens = (ktps_up - ktps_dn) / (2.0 * step)
+    assert np.allclose(sens, ref_sens, rtol=1e-4,
+                       atol=1e-7 * np.abs(ref_sens).max())
+
+
+def test__parameter_sensitivities():
+    """ test chemkin_io.calculator.sensitivity.parameter_sensitivities
+        against central finite differences of each parameter
+    """
+    sens = chemkin_io.calculator.sensitivity.parameter_sensitivities(
+        CMECH, SYNGAS_UNITS, T_REF, TEMPS, PRESSURES)
+    assert np.array_equal(sens.ktps, _record_ktps(CMECH))
+    assert sens.high_p.a.shape == (
+        len(CMECH.high_p.a), len(PRESSURES) + 1, len(TEMPS))
+    assert len(sens.plog.a) == 7
+
+    # Arrhenius expressions, including the falloff ones; the rate
+    # constants of a record depend only on its own parameters
+    for arr_name in ('high_p', 'low_p'):
+        arr_arrays = getattr(CMECH, arr_name)
+        arr_sens = getattr(sens, arr_name)
+        for expr_idx in range(len(arr_arrays.a)):
+            rec_idx = arr_arrays.idxs[expr_idx]
+            for par_name in ('a', 'n', 'ea'):
+                vals = getattr(arr_arrays, par_name)
+                step = REL_STEP * (abs(vals[expr_idx]) or 1.0)
+                ktps_pm = []
+                for sign in (1.0, -1.0):
+                    new_vals = vals.copy()
+                    new_vals[expr_idx] += sign * step
+                    ktps_pm.append(_record_ktps(CMECH._replace(**{
+                        arr_name: arr_arrays._replace(
+                            **{par_name: new_vals})}))[rec_idx])
+                _assert_close(getattr(arr_sens, par_name)[expr_idx],
+                              *ktps_pm, step)
+
+    # PLOG expressions, perturbed in the parsed records, whose a and ea
+    # are converted to the units of the compiled ones
+    plog_arrs = chemkin_io.calculator.rates.plog_arrays(CMECH, SYNGAS_UNITS)
+    rec_idx = len(CMECH.rxns) - 1
+    rxn = CMECH.rxns[rec_idx]
+    assert np.all(plog_arrs.idxs == rec_idx)
+    expr_idx = 0
+    for pressure in sorted(rxn.plog):
+        for start in range(0, len(rxn.plog[pressure]), 3):
+            for par_num, par_name in enumerate(('a', 'n', 'ea')):
+                val = rxn.plog[pressure][start + par_num]
+                conv = getattr(plog_arrs, par_name)[expr_idx] / val
+                step = REL_STEP * (abs(val) or 1.0)
+                ktps_pm = []
+                for sign in (1.0, -1.0):
+                    params = list(rxn.plog[pressure])
+                    params[start + par_num] += sign * step
+                    plog_dct = dict(rxn.plog)
+                    plog_dct[pressure] = params
+                    rxns = CMECH.rxns[:rec_idx] + (
+                        rxn._replace(plog=plog_dct),)
+                    ktps_pm.append(_record_ktps(
+                        CMECH._replace(rxns=rxns))[rec_idx])
+                _assert_close(
+                    getattr(sens.plog, par_name)[expr_idx] * conv,
+                    *ktps_pm, step)
+            expr_idx += 1
+
+    # Chebyshev alpha elements
+    for cheb_num, rec_idx in enumerate(sens.cheb_idxs):
+        rxn = CMECH.rxns[rec_idx]
+        alpha = np.array(rxn.chebyshev['alpha_elm'])
+        for row, col in np.ndindex(*alpha.shape):
+            step = REL_STEP
+            ktps_pm = []
+            for sign in (1.0, -1.0):
+                new_alpha = alpha.copy()
+                new_alpha[row, col] += sign * step
+                cheb_dct = dict(rxn.chebyshev, alpha_elm=new_alpha)
+                rxns = (CMECH.rxns[:rec_idx] +
+                        (rxn._replace(chebyshev=cheb_dct),) +
+                        CMECH.rxns[rec_idx+1:])
+                ktps_pm.append(_record_ktps(
+                    CMECH._replace(rxns=rxns))[rec_idx])
+            _assert_close(sens.chebyshev[cheb_num, row, col], *ktps_pm,
+                          step)
+
+
+if __name__ == '__main__':
+    test__parameter_sensitivities()
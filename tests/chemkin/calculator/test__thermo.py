@@ -36,11 +36,58 @@ def test__mechanism():
     print(therm_dct)
 
 
+def test__properties():
+    """ test chemkin_io.calculator.thermo.properties
+    """
+    names, tmps, cfts = chemkin_io.parser.thermo.data_arrays(
+        NATGAS_THERMO_BLOCK)
+    temps = [TEMP1, 2000.0, 10000.0]
+    h_t, cp_t, s_t, g_t = chemkin_io.calculator.thermo.properties(
+        cfts, tmps, temps)
+    assert h_t.shape == (len(names), len(temps))
+
+    # below the common temperature the low temperature set is used
+    scalar_fxns = (
+        chemkin_io.calculator.thermo.enthalpy,
+        chemkin_io.calculator.thermo.heat_capacity,
+        chemkin_io.calculator.thermo.entropy,
+        chemkin_io.calculator.thermo.gibbs)
+    for fxn, prop in zip(scalar_fxns, (h_t, cp_t, s_t, g_t)):
+        assert np.isclose(fxn(SPECIES_POLYNOMIAL, TEMP1),
+                          prop[SPECIES_IDX, 0])
+
+    # above it the high temperature set is used
+    high_cfts = cfts[SPECIES_IDX, 1]
+    ref_cp = chemkin_io.calculator.thermo.RC * np.polyval(
+        high_cfts[4::-1], 2000.0)
+    assert np.isclose(ref_cp, cp_t[SPECIES_IDX, 1])
+
+    # beyond the range of the polynomial the properties are undefined
+    assert np.all(np.isnan(g_t[:, 2]))
+
+
+def test__property_dct():
+    """ test chemkin_io.calculator.thermo.property_dct
+    """
+    names, tmps, cfts = chemkin_io.parser.thermo.data_arrays(
+        NATGAS_THERMO_BLOCK)
+    props = chemkin_io.calculator.thermo.properties(
+        cfts, tmps, [TEMP1, 10000.0])
+    therm_dct = chemkin_io.calculator.thermo.property_dct(names, props)
+    assert therm_dct[names[SPECIES_IDX]][3][1] is None
+
+    names2, props2 = chemkin_io.calculator.thermo.property_arrays(
+        therm_dct)
+    assert names2 == names
+    for prop, prop2 in zip(props, props2):
+        assert np.allclose(prop, prop2, equal_nan=True)
+
+
 def test__enthalpy():
     """ test chemkin_io.calculator.thermo.enthalpy
     """
     ref_ht1 = -42.58312043165988
-    ref_ht2 = -19.266388540056756
+    ref_ht2 = -19.26601405386509
     ht1 = chemkin_io.calculator.thermo.enthalpy(
         SPECIES_POLYNOMIAL, TEMP1)
     ht2 = chemkin_io.calculator.thermo.enthalpy(
@@ -53,7 +100,7 @@ def test__entropy():
     """ test chemkin_io.calculator.thermo.entropy
     """
     ref_st1 = 0.11016051269318868
-    ref_st2 = 0.14192480698218363
+    ref_st2 = 0.1419251912321684
     st1 = chemkin_io.calculator.thermo.entropy(
         SPECIES_POLYNOMIAL, TEMP1)
     st2 = chemkin_io.calculator.thermo.entropy(
@@ -66,7 +113,7 @@ def test__gibbs():
     """ test chemkin_io.calculator.thermo.gibbs
     """
     ref_gt1 = -97.66337677825422
-    ref_gt2 = -161.1911955222404
+    ref_gt2 = -161.1912052860335
     gt1 = chemkin_io.calculator.thermo.gibbs(
         SPECIES_POLYNOMIAL, TEMP1)
     gt2 = chemkin_io.calculator.thermo.gibbs(
@@ -79,7 +126,7 @@ def test__heat_capacity():
     """ test chemkin_io.calculator.thermo.heat_capacity
     """
     ref_cp1 = 0.038811581024503064
-    ref_cp2 = 0.05285850615746261
+    ref_cp2 = 0.05287108677601687
     cp1 = chemkin_io.calculator.thermo.heat_capacity(
         SPECIES_POLYNOMIAL, TEMP1)
     cp2 = chemkin_io.calculator.thermo.heat_capacity(
@@ -88,9 +135,32 @@ def test__heat_capacity():
     assert np.isclose(ref_cp2, cp2)
 
 
+def test__common_temperature():
+    """ test that the single-temperature functions switch polynomials at the
+        common temperature as chemkin_io.calculator.thermo.properties does
+    """
+    name, tmps, low_cfts, high_cfts = chemkin_io.parser.thermo.data_record(
+        SPECIES_POLYNOMIAL)
+    temps = [tmps[2] - 1.0, tmps[2], tmps[2] + 1.0, tmps[0], tmps[1]]
+    props = chemkin_io.calculator.thermo.properties(
+        [low_cfts, high_cfts], [tmps], temps)
+    assert name
+    for prop, func in zip(props, (chemkin_io.calculator.thermo.enthalpy,
+                                  chemkin_io.calculator.thermo.heat_capacity,
+                                  chemkin_io.calculator.thermo.entropy,
+                                  chemkin_io.calculator.thermo.gibbs)):
+        vals = [func(SPECIES_POLYNOMIAL, temp) for temp in temps]
+        assert np.allclose(vals, prop[0])
+    assert chemkin_io.calculator.thermo.enthalpy(
+        SPECIES_POLYNOMIAL, tmps[1] + 1.0) is None
+
+
 if __name__ == '__main__':
     test__mechanism()
+    test__properties()
+    test__property_dct()
     test__enthalpy()
     test__entropy()
     test__gibbs()
     test__heat_capacity()
+    test__common_temperature()
@@ -0,0 +1,115 @@
+""" test chemkin_io.calculator.uncertainty
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import numpy as np
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+SYNGAS_THERMO_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.thermo_block(SYNGAS_MECH_STR))
+SYNGAS_UNITS = chemkin_io.parser.mechanism.reaction_units(SYNGAS_MECH_STR)
+SYNGAS_THM_ARRAYS = chemkin_io.parser.thermo.data_arrays(SYNGAS_THERMO_BLOCK)
+CMECH = chemkin_io.calculator.rates.compiled_mechanism(
+    SYNGAS_REACTION_BLOCK, SYNGAS_UNITS)
+
+T_REF = 1.0
+TEMPS = np.array([500.0, 1000.0, 1500.0, 2000.0])
+PRESSURES = np.array([1.0, 10.0])
+NSAMPLES = 10
+
+
+def test__samples():
+    """ test chemkin_io.calculator.uncertainty.samples
+        against rate constants of mechanisms with shifted parameters
+    """
+    rxn_key = CMECH.rxn_keys[0]
+    rct_name = rxn_key[0][0]
+    rate_samples = chemkin_io.calculator.uncertainty.samples(
+        CMECH, SYNGAS_UNITS, SYNGAS_THM_ARRAYS, T_REF, TEMPS, PRESSURES,
+        NSAMPLES, ln_a_sigmas=0.5, ea_sigmas={rxn_key: 1.0},
+        h_sigmas={rct_name: 0.5}, seed=3)
+    nrxns = len(CMECH.rxn_keys)
+    assert rate_samples.ktps.shape == (
+        NSAMPLES, nrxns, len(PRESSURES) + 1, len(TEMPS))
+    assert rate_samples.k_equils.shape == (NSAMPLES, nrxns, len(TEMPS))
+    assert np.all(rate_samples.ea_shifts[:, 1:] == 0.0)
+    rct_idx = rate_samples.names.index(rct_name)
+    assert np.count_nonzero(rate_samples.h_shifts.any(axis=0)) == 1
+    assert rate_samples.h_shifts[:, rct_idx].all()
+
+    # each sample matches a mechanism with its shifts applied to every
+    # expression, in the units of the compiled mechanism
+    for num in (0, NSAMPLES - 1):
+        rxn_ln_a_shifts = rate_samples.ln_a_shifts[num][CMECH.rxn_idxs]
+        rxn_ea_shifts = rate_samples.ea_shifts[num][CMECH.rxn_idxs]
+        arrs = {}
+        for arr_name in ('high_p', 'low_p'):
+            arr_arrays = getattr(CMECH, arr_name)
+            arrs[arr_name] = arr_arrays._replace(
+                a=arr_arrays.a * np.exp(rxn_ln_a_shifts[arr_arrays.idxs]),
+                ea=arr_arrays.ea + rxn_ea_shifts[arr_arrays.idxs])
+        ktps = chemkin_io.calculator.rates.dense_ktps(
+            chemkin_io.calculator.rates.mechanism_arrays(
+                CMECH._replace(**arrs), SYNGAS_UNITS, T_REF, TEMPS,
+                PRESSURES))
+        pdep = np.array([rxn.plog is not None or rxn.chebyshev is not None
+                         for rxn in CMECH.rxns])
+        arr_rows = np.setdiff1d(np.arange(nrxns), CMECH.rxn_idxs[pdep])
+        assert np.allclose(rate_samples.ktps[num][arr_rows], ktps[arr_rows])
+
+        # the reverse rate constants follow from the shifted enthalpies
+        names, tmps, cfts = SYNGAS_THM_ARRAYS
+        _, _, _, gibbs = chemkin_io.calculator.thermo.properties(
+            cfts, tmps, TEMPS)
+        gibbs_dct = dict(zip(names, gibbs))
+        gibbs_dct[rct_name] = (
+            gibbs_dct[rct_name] + rate_samples.h_shifts[num, rct_idx])
+        _, stoich = chemkin_io.calculator.equilibrium.stoichiometric_matrix(
+            CMECH.rxn_keys, names=rate_samples.names)
+        k_equils = chemkin_io.calculator.equilibrium.equilibrium_constants(
+            stoich, [gibbs_dct[name] for name in rate_samples.names], TEMPS)
+        assert np.allclose(rate_samples.k_equils[num], k_equils)
+        rev = chemkin_io.calculator.equilibrium.reversible(CMECH)
+        assert np.allclose(
+            rate_samples.rev_ktps[num][rev],
+            rate_samples.ktps[num][rev] / k_equils[rev][:, np.newaxis])
+
+
+def test__sample_chunks():
+    """ test chemkin_io.calculator.uncertainty.sample_chunks
+        gives the same samples for any chunk size
+    """
+    kwargs = {'ln_a_sigmas': 0.3, 'ea_sigmas': 0.5, 'h_sigmas': 0.2,
+              'seed': 11}
+    rate_samples = chemkin_io.calculator.uncertainty.samples(
+        CMECH, SYNGAS_UNITS, SYNGAS_THM_ARRAYS, T_REF, TEMPS, PRESSURES,
+        NSAMPLES, **kwargs)
+    chunks = list(chemkin_io.calculator.uncertainty.sample_chunks(
+        CMECH, SYNGAS_UNITS, SYNGAS_THM_ARRAYS, T_REF, TEMPS, PRESSURES,
+        NSAMPLES, chunk_size=3, **kwargs))
+    assert [chunk.start for chunk in chunks] == [0, 3, 6, 9]
+    assert np.array_equal(
+        np.concatenate([chunk.ktps for chunk in chunks]), rate_samples.ktps,
+        equal_nan=True)
+    assert np.array_equal(
+        np.concatenate([chunk.rev_ktps for chunk in chunks]),
+        rate_samples.rev_ktps, equal_nan=True)
+
+
+if __name__ == '__main__':
+    test__samples()
+    test__sample_chunks()
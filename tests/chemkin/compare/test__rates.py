@@ -4,6 +4,7 @@ compare thermo
 
 import os
 import numpy as np
+import chemkin_io
 from chemkin_io.calculator import combine
 
 
@@ -66,8 +67,8 @@ def test__compare_rates():
     # Rate constant
     ktp_dct = combine.mechanism_rates(
         mech1_ktp_dct, mech2_ktp_dct,
-        mech2_thermo_dct,
-        TEMPS)
+        TEMPS,
+        mech2_thermo_dct=mech2_thermo_dct)
 
     # print dict
     print('\n\nktp dct')
@@ -81,5 +82,156 @@ def test__compare_rates():
             print(' ')
 
 
+def test__reaction_index():
+    """ test chemkin_io.calculator.combine.reaction_index
+    """
+    mech2_ktp_dct = {
+        (('H', 'O2'), ('O', 'OH')): {'high': [1.0]},
+        (('OH', 'OH'), ('H2O2',)): {'high': [2.0]},
+    }
+    mech2_rxn_idx = combine.reaction_index(mech2_ktp_dct)
+    assert len(mech2_rxn_idx) == 2
+
+    # reagent order does not matter, and reversed reactions are flagged
+    for mech1_key, ref_key, ref_flip in (
+            ((('O2', 'H'), ('OH', 'O')), (('H', 'O2'), ('O', 'OH')), False),
+            ((('O', 'OH'), ('H', 'O2')), (('H', 'O2'), ('O', 'OH')), True),
+            ((('H2O2',), ('OH', 'OH')), (('OH', 'OH'), ('H2O2',)), True),
+            ((('H2O2',), ('OH', 'H')), (), None)):
+        assert combine._assess_reaction_match(
+            mech1_key, mech2_ktp_dct, mech2_rxn_idx=mech2_rxn_idx) == (
+                ref_key, ref_flip)
+
+
+def test__mechanisms():
+    """ test chemkin_io.calculator.combine.mechanisms
+    """
+    spc_dcts = [
+        chemkin_io.parser.mechanism.spc_name_dct(csv_str, 'inchi')
+        for csv_str in (MECH1_CSV_STR, MECH2_CSV_STR)]
+    mech_strs = [MECH1_STR, MECH2_STR, MECH1_STR]
+    comparison = combine.mechanisms(
+        mech_strs, T_REF, TEMPS, PRESSURES,
+        spc_dcts=spc_dcts + spc_dcts[:1], nprocs=2)
+    nspc, nrxn = len(comparison.spc_keys), len(comparison.rxn_keys)
+    assert comparison.thermo.shape == (3, nspc, 4, len(TEMPS))
+    assert comparison.ktps.shape == (3, nrxn, len(PRESSURES) + 1, len(TEMPS))
+    assert comparison.spc_mask.all() and comparison.rxn_mask.all()
+
+    # repeated mechanisms give identical entries
+    assert np.array_equal(comparison.thermo[0], comparison.thermo[2])
+    assert np.array_equal(comparison.ktps[0], comparison.ktps[2])
+
+    # reactions written in the canonical direction keep their rates, and
+    # those written in reverse are reversed with Kc as by mechanism_rates
+    mech1_thermo_dct, _ = combine.build_thermo_inchi_dcts(
+        MECH1_STR, MECH2_STR, MECH1_CSV_STR, MECH2_CSV_STR, TEMPS)
+    mech1_ktp_dct, _ = combine.build_reaction_inchi_dcts(
+        MECH1_STR, MECH2_STR, MECH1_CSV_STR, MECH2_CSV_STR,
+        T_REF, TEMPS, PRESSURES)
+    nrev = 0
+    for rxn_key, ktp_dct in mech1_ktp_dct.items():
+        can_key, is_rev = combine.reaction_key(rxn_key)
+        rxn_idx = comparison.rxn_keys.index(can_key)
+        assert comparison.rxn_reversed[0, rxn_idx] == is_rev
+        if not is_rev:
+            assert np.allclose(
+                comparison.ktps[0, rxn_idx, 0], ktp_dct['high'])
+        elif not np.isnan(comparison.ktps[0, rxn_idx, 0]).any():
+            rev_ktp_dct = combine._reverse_reaction_rates(
+                mech1_ktp_dct, mech1_thermo_dct, rxn_key, TEMPS)
+            assert np.allclose(
+                comparison.ktps[0, rxn_idx, 0], rev_ktp_dct['high'])
+            nrev += 1
+    assert nrev
+
+
+def test__mechanisms_missing():
+    """ test chemkin_io.calculator.combine.mechanisms
+        with a mechanism that lacks a species and its reactions
+    """
+    mech_data = chemkin_io.parser.cache.parse(MECH1_STR)
+    sub_names = [name for name in mech_data['species'] if name != 'OH(1)']
+    sub_data = chemkin_io.parser.submechanism.extract(mech_data, sub_names)
+    thm_str_dct = {
+        chemkin_io.parser.thermo.species_name(thm_str): thm_str
+        for thm_str in chemkin_io.parser.thermo.column_strings(
+            chemkin_io.parser.mechanism.section(MECH1_STR, 'thermo'))}
+    sub_mech_str = chemkin_io.writer.mechanism.string(
+        sub_data['species'], sub_data['reactions'], sub_data['units'],
+        thm_strs=[thm_str_dct[name] for name in sub_data['species']],
+        elm_block=chemkin_io.parser.mechanism.elements_block(MECH1_STR))
+
+    comparison = combine.mechanisms(
+        [MECH1_STR, sub_mech_str], T_REF, TEMPS, PRESSURES)
+
+    # the missing species is masked out and NaN in the second mechanism
+    spc_idx = comparison.spc_keys.index('OH(1)')
+    assert comparison.spc_mask[0].all()
+    assert list(comparison.spc_mask[1]) == [
+        key != 'OH(1)' for key in comparison.spc_keys]
+    assert np.isnan(comparison.thermo[1, spc_idx]).all()
+    assert np.array_equal(
+        np.delete(comparison.thermo[1], spc_idx, axis=0),
+        np.delete(comparison.thermo[0], spc_idx, axis=0))
+
+    # and so are the reactions of the species
+    oh_rxns = np.array(['OH(1)' in rcts + prds
+                        for rcts, prds in comparison.rxn_keys])
+    assert oh_rxns.any() and not oh_rxns.all()
+    assert comparison.rxn_mask[0].all()
+    assert np.array_equal(comparison.rxn_mask[1], ~oh_rxns)
+    assert np.isnan(comparison.ktps[1, oh_rxns]).all()
+    assert not comparison.rxn_reversed[1, oh_rxns].any()
+    assert np.array_equal(comparison.ktps[1, ~oh_rxns],
+                          comparison.ktps[0, ~oh_rxns], equal_nan=True)
+
+
+def test__failed_inchi():
+    """ test chemkin_io.calculator.combine.build_reaction_inchi_dcts
+        and build_thermo_inchi_dcts with a SMILES that fails to convert
+    """
+    identity = chemkin_io.parser.identity
+    inchi_fxn = identity._inchi
+
+    def _failing_inchi(smi):
+        if smi.startswith('X'):
+            raise ValueError('bad SMILES')
+        return inchi_fxn(smi)
+
+    mech1_csv_str = MECH1_CSV_STR.replace('OH(1),[OH]', 'OH(1),X[OH]')
+    assert mech1_csv_str != MECH1_CSV_STR
+    identity._inchi = _failing_inchi
+    try:
+        identity.clear()
+        mech1_ktp_dct, mech2_ktp_dct = combine.build_reaction_inchi_dcts(
+            MECH1_STR, MECH2_STR, mech1_csv_str, MECH2_CSV_STR,
+            T_REF, TEMPS, PRESSURES)
+        mech1_thermo_dct, _ = combine.build_thermo_inchi_dcts(
+            MECH1_STR, MECH2_STR, mech1_csv_str, MECH2_CSV_STR, TEMPS)
+        identity.clear()
+        ref_ktp_dct, ref2_ktp_dct = combine.build_reaction_inchi_dcts(
+            MECH1_STR, MECH2_STR, MECH1_CSV_STR, MECH2_CSV_STR,
+            T_REF, TEMPS, PRESSURES)
+        ref_thermo_dct, _ = combine.build_thermo_inchi_dcts(
+            MECH1_STR, MECH2_STR, MECH1_CSV_STR, MECH2_CSV_STR, TEMPS)
+    finally:
+        identity._inchi = inchi_fxn
+        identity.clear()
+
+    # only the reactions and species of OH(1) are left out
+    oh_ich = inchi_fxn('[OH]')
+    assert set(mech1_ktp_dct) == set(
+        rxn_key for rxn_key in ref_ktp_dct
+        if oh_ich not in rxn_key[0] + rxn_key[1])
+    assert len(mech1_ktp_dct) < len(ref_ktp_dct)
+    assert set(mech1_thermo_dct) == set(ref_thermo_dct) - {oh_ich}
+    assert set(mech2_ktp_dct) == set(ref2_ktp_dct)
+
+
 if __name__ == '__main__':
     test__compare_rates()
+    test__reaction_index()
+    test__failed_inchi()
+    test__mechanisms()
+    test__mechanisms_missing()
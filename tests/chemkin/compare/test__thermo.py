@@ -3,6 +3,9 @@ compare thermo
 """
 
 import os
+import shutil
+import tempfile
+import chemkin_io
 from chemkin_io.calculator import combine
 
 
@@ -97,5 +100,33 @@ def test__compare_thermo():
     print(thermo_vals_dct)
 
 
+def test__thermo_inchi_store():
+    """ test chemkin_io.calculator.combine.build_thermo_inchi_dcts
+        with a store of the SMILES -> InChI conversions, and
+        chemkin_io.calculator.combine.spc_name_from_inchi
+    """
+    identity = chemkin_io.parser.identity
+    cache_dir = tempfile.mkdtemp()
+    try:
+        identity.clear()
+        mech1_thermo_dct, mech2_thermo_dct = combine.build_thermo_inchi_dcts(
+            MECH1_STR, MECH2_STR, MECH1_CSV_STR, MECH2_CSV_STR, TEMPS,
+            cache_dir=cache_dir)
+        stored = identity._read_store(cache_dir)
+        assert mech1_thermo_dct and mech2_thermo_dct
+        assert set(mech1_thermo_dct) | set(mech2_thermo_dct) <= set(
+            stored.values())
+
+        for ich in mech1_thermo_dct:
+            name = combine.spc_name_from_inchi(
+                MECH1_CSV_STR, MECH2_CSV_STR, ich)
+            assert identity.identities(
+                MECH1_CSV_STR).name_inchi_dct[name] == ich
+    finally:
+        identity.clear()
+        shutil.rmtree(cache_dir)
+
+
 if __name__ == '__main__':
     test__compare_thermo()
+    test__thermo_inchi_store()
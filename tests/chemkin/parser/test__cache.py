@@ -0,0 +1,107 @@
+""" test chemkin_io.parser.cache
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import pickle
+import shutil
+import tempfile
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+
+
+def test__mechanism_data():
+    """ test chemkin_io.parser.cache.mechanism_data
+    """
+    cache_dir = tempfile.mkdtemp()
+    try:
+        ref_data = chemkin_io.parser.cache.parse(SYNGAS_MECH_STR)
+        assert len(ref_data['species']) == 21
+        assert len(ref_data['reactions']) == 74
+        assert ref_data['units'] == ('kcal/mole', 'moles')
+
+        # Cold start parses and writes the entry
+        mech_data = chemkin_io.parser.cache.mechanism_data(
+            SYNGAS_MECH_STR, cache_dir=cache_dir)
+        assert mech_data == ref_data
+        assert len(os.listdir(cache_dir)) == 1
+
+        # Warm start reads the entry without matching any patterns
+        with chemkin_io.parser.registry.counting() as counts:
+            mech_data = chemkin_io.parser.cache.mechanism_data(
+                SYNGAS_MECH_STR, cache_dir=cache_dir)
+        assert mech_data == ref_data
+        assert counts['matches'] == 0
+
+        # Edited mechanism gets its own entry
+        chemkin_io.parser.cache.mechanism_data(
+            SYNGAS_MECH_STR + '\n', cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test__parse():
+    """ test chemkin_io.parser.cache.parse
+        cleans the mechanism string once
+    """
+    clean_up_fxn = chemkin_io.parser.mechanism._clean_up
+    calls = []
+
+    def _counting_clean_up(mech_str, **kwargs):
+        calls.append(len(mech_str))
+        return clean_up_fxn(mech_str, **kwargs)
+
+    chemkin_io.parser.mechanism._clean_up = _counting_clean_up
+    try:
+        mech_data = chemkin_io.parser.cache.parse(SYNGAS_MECH_STR)
+    finally:
+        chemkin_io.parser.mechanism._clean_up = clean_up_fxn
+    assert calls == [len(SYNGAS_MECH_STR)]
+
+    # the blocks are those of the single block functions
+    mech = chemkin_io.parser.mechanism
+    assert mech_data['species'] == chemkin_io.parser.species.names(
+        chemkin_io.parser.util.clean_up_whitespace(
+            mech.species_block(SYNGAS_MECH_STR)))
+    assert mech_data['thermo'] == chemkin_io.parser.thermo.data_block(
+        chemkin_io.parser.util.clean_up_whitespace(
+            mech.thermo_block(SYNGAS_MECH_STR)))
+    assert mech_data['units'] == mech.reaction_units(SYNGAS_MECH_STR)
+    assert mech.blocks(SYNGAS_MECH_STR)[2] == mech.reaction_block(
+        SYNGAS_MECH_STR)
+
+
+def test__write():
+    """ test chemkin_io.parser.cache._write
+        leaves no temporary file behind when an entry fails to pickle
+    """
+    cache_dir = tempfile.mkdtemp()
+    try:
+        try:
+            chemkin_io.parser.cache._write(
+                os.path.join(cache_dir, 'entry.pickle'), {'fxn': lambda: 0})
+        except (pickle.PicklingError, AttributeError, TypeError):
+            pass
+        else:
+            assert False
+        assert not os.listdir(cache_dir)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    test__mechanism_data()
+    test__parse()
+    test__write()
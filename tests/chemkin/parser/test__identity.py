@@ -0,0 +1,137 @@
+""" test chemkin_io.parser.identity
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import shutil
+import tempfile
+import multiprocessing
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_CSV_STR = _read_file(os.path.join(SYNGAS_PATH, 'smiles.csv'))
+
+
+def test__identities():
+    """ test chemkin_io.parser.identity.identities
+    """
+    store_dir = tempfile.mkdtemp()
+    inchi_fxn = chemkin_io.parser.identity._inchi
+    calls = []
+
+    def _counting_inchi(smi):
+        calls.append(smi)
+        return inchi_fxn(smi)
+
+    chemkin_io.parser.identity._inchi = _counting_inchi
+    try:
+        chemkin_io.parser.identity.clear()
+        spc_ids = chemkin_io.parser.identity.identities(
+            SYNGAS_CSV_STR, store_dir=store_dir)
+        nspc = len(spc_ids.name_inchi_dct)
+        assert len(calls) == nspc
+        for name, ich in spc_ids.name_inchi_dct.items():
+            assert spc_ids.inchi_name_dct[ich] == name
+
+        # The same CSV is resolved once per process
+        assert chemkin_io.parser.identity.identities(
+            SYNGAS_CSV_STR, store_dir=store_dir) is spc_ids
+        assert chemkin_io.parser.mechanism.spc_inchi_dct(
+            SYNGAS_CSV_STR) == spc_ids.inchi_name_dct
+        assert len(calls) == nspc
+
+        # A new process reads the conversions back from the store
+        chemkin_io.parser.identity.clear()
+        assert chemkin_io.parser.identity.identities(
+            SYNGAS_CSV_STR, store_dir=store_dir) == spc_ids
+        assert len(calls) == nspc
+    finally:
+        chemkin_io.parser.identity._inchi = inchi_fxn
+        chemkin_io.parser.identity.clear()
+        shutil.rmtree(store_dir)
+
+
+def test__inchis():
+    """ test chemkin_io.parser.identity.inchis
+        with failed conversions, on a pool of worker processes
+    """
+    inchi_fxn = chemkin_io.parser.identity._inchi
+
+    def _failing_inchi(smi):
+        if smi.startswith('X'):
+            raise ValueError('bad SMILES')
+        return inchi_fxn(smi)
+
+    smiles_lst = ['C' * num for num in range(1, 30)] + ['XC', 'C']
+    chemkin_io.parser.identity._inchi = _failing_inchi
+    try:
+        chemkin_io.parser.identity.clear()
+        ichs, failed_dct = chemkin_io.parser.identity.inchis(
+            smiles_lst, nprocs=2)
+        assert ichs[:-2] == [inchi_fxn(smi) for smi in smiles_lst[:-2]]
+        assert ichs[-2] is None and ichs[-1] == ichs[0]
+        assert list(failed_dct) == ['XC']
+        assert 'bad SMILES' in failed_dct['XC']
+
+        # a species that fails is left out of the name -> InChI map
+        csv_str = 'name,smiles\nCH4,C\nBAD,XC\n'
+        spc_ids = chemkin_io.parser.identity.identities(csv_str)
+        assert spc_ids.name_inchi_dct == {'CH4': inchi_fxn('C')}
+        assert list(spc_ids.failed_dct) == ['BAD']
+
+        # identities with failed species are not kept, so the failed
+        # species are tried again
+        chemkin_io.parser.identity._inchi = lambda smi: 'InChI=1S/' + smi
+        spc_ids = chemkin_io.parser.identity.identities(csv_str)
+        assert spc_ids.name_inchi_dct == {
+            'CH4': inchi_fxn('C'), 'BAD': 'InChI=1S/XC'}
+        assert not spc_ids.failed_dct
+    finally:
+        chemkin_io.parser.identity._inchi = inchi_fxn
+        chemkin_io.parser.identity.clear()
+
+
+def test__write_store():
+    """ test chemkin_io.parser.identity._write_store
+        with concurrent writers
+    """
+    store_dir = tempfile.mkdtemp()
+    new_ichs_lst = [{'S{}'.format(num): 'I{}'.format(num)}
+                    for num in range(40)]
+    try:
+        with multiprocessing.Pool(4) as pool:
+            pool.starmap(chemkin_io.parser.identity._write_store,
+                         [(store_dir, new_ichs) for new_ichs in new_ichs_lst])
+        stored = chemkin_io.parser.identity._read_store(store_dir)
+        assert stored == {smi: ich for new_ichs in new_ichs_lst
+                          for smi, ich in new_ichs.items()}
+
+        # a store that fails to write leaves no temporary file behind
+        try:
+            chemkin_io.parser.identity._write_store(
+                store_dir, {'C': object()})
+        except TypeError:
+            pass
+        else:
+            assert False
+        assert sorted(os.listdir(store_dir)) == sorted(
+            [chemkin_io.parser.identity.STORE_NAME,
+             chemkin_io.parser.identity.LOCK_NAME])
+        assert chemkin_io.parser.identity._read_store(store_dir) == stored
+    finally:
+        shutil.rmtree(store_dir)
+
+
+if __name__ == '__main__':
+    test__identities()
+    test__inchis()
+    test__write_store()
@@ -52,6 +52,24 @@ def test__reaction_block():
     assert len(block_str.splitlines()) == 1834
 
 
+def test__reaction_stream():
+    """ test chemkin_io.parser.mechanism.reaction_stream
+    """
+    block_str = chemkin_io.parser.util.clean_up_whitespace(
+        chemkin_io.parser.mechanism.reaction_block(NATGAS_MECH_STR))
+    ref_rxns = list(map(chemkin_io.parser.reaction.data_fields,
+                        chemkin_io.parser.reaction.data_strings(block_str)))
+
+    rxns = list(chemkin_io.parser.mechanism.reaction_stream(
+        os.path.join(NATGAS_PATH, 'mechanism.txt')))
+    assert rxns == ref_rxns
+
+    with open(os.path.join(NATGAS_PATH, 'mechanism.txt'),
+              encoding='utf8', errors='ignore') as file_obj:
+        rxn_iter = chemkin_io.parser.mechanism.reaction_stream(file_obj)
+        assert next(rxn_iter) == ref_rxns[0]
+
+
 def test__thermo_block():
     """ test chemkin_io.parser.mechanism.thermo_block
     """
@@ -76,6 +94,27 @@ def test__reaction_units():
     assert units5 == ('joules/mole', 'moles')
 
 
+def test__mechanism_handle():
+    """ test chemkin_io.parser.mechanism.Mechanism
+    """
+    mech_path = os.path.join(NATGAS_PATH, 'mechanism.txt')
+    with chemkin_io.parser.mechanism.Mechanism(mech_path) as mech:
+        assert set(mech.offsets) >= {'species', 'thermo', 'reactions'}
+        assert mech.species_block() == (
+            chemkin_io.parser.mechanism.species_block(NATGAS_MECH_STR))
+        assert mech.reaction_block() == (
+            chemkin_io.parser.mechanism.reaction_block(NATGAS_MECH_STR))
+        assert mech.thermo_block() == (
+            chemkin_io.parser.mechanism.thermo_block(NATGAS_MECH_STR))
+        assert mech.reaction_units() == ('kcal/mole', 'moles')
+
+    # File with Windows line endings
+    mech_path = os.path.join(HEPTANE_PATH, 'mechanism.txt')
+    with chemkin_io.parser.mechanism.Mechanism(mech_path) as mech:
+        assert mech.species_block() == (
+            chemkin_io.parser.mechanism.species_block(HEPTANE_MECH_STR))
+
+
 def test__species_name_dct():
     """ test chemkin_io.parser.species_name_dct
     """
@@ -99,7 +138,9 @@ def test__species_inchi_dct():
 if __name__ == '__main__':
     test__species_block()
     test__reaction_block()
+    test__reaction_stream()
     test__thermo_block()
     test__reaction_units()
+    test__mechanism_handle()
     test__species_name_dct()
     test__species_inchi_dct()
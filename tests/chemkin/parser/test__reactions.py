@@ -23,6 +23,11 @@ SYNGAS_REACTION_STRS = chemkin_io.parser.reaction.data_strings(
     SYNGAS_REACTION_BLOCK)
 REACTION = SYNGAS_REACTION_STRS[20]
 
+HEPTANE_PATH = os.path.join(PATH, '../data/heptane')
+HEPTANE_MECH_STR = _read_file(os.path.join(HEPTANE_PATH, 'mechanism.txt'))
+HEPTANE_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(HEPTANE_MECH_STR))
+
 TEST_PATH = os.path.join(PATH, '../data/syngas')
 TEST_MECH_STR = _read_file(os.path.join(TEST_PATH, 'mechanism.txt'))
 
@@ -44,6 +49,11 @@ PLOG/      0.0987     1.680E+018    -3.050     24323.0/
 PLOG/      0.2961     2.500E+024    -4.630     27067.0/
 PLOG/      0.9869     4.540E+026    -5.120     27572.0/"""
 
+SRI_REACTION = """C2H4(+M)=C2H2+H2(+M)    8.000E+12     0.440   86770.0
+H2/ 2.00/ H2O/ 6.00/ AR/ 0.70/
+LOW /  1.580E+51    -9.300   97800.0 /
+SRI /  0.450     797.0     979.0     1.200     0.100 /"""
+
 # Duplicate Reaction Strings
 DUP_HIGHP_REACTION = """CO+OH<=>CO2+H    7.015e+4     2.053          -355.7
 CO+OH<=>CO2+H   5.757e+12    -0.664           331.8"""
@@ -130,6 +140,17 @@ def test__troe_parameters():
     print(params)
 
 
+def test__sri_parameters():
+    """ test chemkin_io.parser.reaction.sri_parameters
+    """
+    params = chemkin_io.parser.reaction.sri_parameters(
+        SRI_REACTION)
+    assert params == [0.45, 797.0, 979.0, 1.2, 0.1]
+    assert chemkin_io.parser.reaction.sri_parameters(
+        'SRI / 0.45 797.0 979.0 /') == [0.45, 797.0, 979.0]
+    assert chemkin_io.parser.reaction.sri_parameters(TROE_REACTION) is None
+
+
 def test__chebyshev_parameters():
     """ test chemkin_io.parser.reaction.chebyshev_parameters
     """
@@ -156,6 +177,112 @@ def test__buffer_enhance_factors():
     print('\nLow Pressure Buffer Enhhancement Factors')
     print(fct_dct)
 
+    # spaces around the slashes are allowed
+    fct_dct = chemkin_io.parser.reaction.buffer_enhance_factors(
+        SRI_REACTION)
+    assert fct_dct == {'H2': 2.0, 'H2O': 6.0, 'AR': 0.7}
+
+
+def test__data_fields():
+    """ test chemkin_io.parser.reaction.data_fields
+    """
+    for rxn_str in (SYNGAS_REACTION_STRS + [PLOG_REACTION, SRI_REACTION]):
+        fld_dct = chemkin_io.parser.reaction.data_fields(rxn_str)
+        assert fld_dct['reactants'] == (
+            chemkin_io.parser.reaction.reactant_names(rxn_str))
+        assert fld_dct['products'] == (
+            chemkin_io.parser.reaction.product_names(rxn_str))
+        assert fld_dct['high_p'] == (
+            chemkin_io.parser.reaction.high_p_parameters(rxn_str))
+        assert fld_dct['low_p'] == (
+            chemkin_io.parser.reaction.low_p_parameters(rxn_str))
+        assert fld_dct['troe'] == (
+            chemkin_io.parser.reaction.troe_parameters(rxn_str))
+        assert fld_dct['sri'] == (
+            chemkin_io.parser.reaction.sri_parameters(rxn_str))
+        assert fld_dct['chebyshev'] == (
+            chemkin_io.parser.reaction.chebyshev_parameters(rxn_str))
+        assert fld_dct['plog'] == (
+            chemkin_io.parser.reaction.plog_parameters(rxn_str))
+        assert fld_dct['buffer'] == (
+            chemkin_io.parser.reaction.buffer_enhance_factors(rxn_str))
+
+    cheb_dct = chemkin_io.parser.reaction.data_fields(
+        CHEBYSHEV_REACTION)['chebyshev']
+    assert cheb_dct['alpha_dim'] == [6, 4]
+    assert len(cheb_dct['alpha_elm']) == 6
+    assert all(len(row) == 4 for row in cheb_dct['alpha_elm'])
+
+    assert chemkin_io.parser.reaction.data_fields(
+        DUP_PLOG_REACTION.split('DUP')[0] + 'DUP')['duplicate']
+    assert not chemkin_io.parser.reaction.data_fields(
+        PLOG_REACTION)['duplicate']
+
+
+def test__data_record():
+    """ test chemkin_io.parser.reaction.data_record
+    """
+    rxn = chemkin_io.parser.reaction.data_record(TROE_REACTION)
+    assert rxn.reactants == ('O2(3)', 'H(4)')
+    assert rxn.products == ('HO2(10)',)
+    assert rxn.reversible
+    assert rxn.third_body == '(+M)'
+    assert rxn.high_p == (4.565e+12, 0.44, 0.0)
+    assert rxn.low_p == (6.37e+20, -1.72, 0.525)
+    assert rxn.troe == (0.5, 30.0, 9e+04, 9e+04)
+    assert rxn.buffer['H2O(7)'] == 15.81
+    assert rxn.plog is None and rxn.chebyshev is None
+    assert not rxn.duplicate
+
+    rxn = chemkin_io.parser.reaction.data_record(PLOG_REACTION)
+    assert rxn.plog[0.0296] == (2.020e+13, -1.870, 22755.0)
+    assert all(isinstance(val, float) for val in rxn.high_p)
+
+    # expressions repeated at a pressure are concatenated
+    rxn = chemkin_io.parser.reaction.data_record(
+        PLOG_REACTION + '\nPLOG/      0.0296     1.000E+010     1.000   0.0/')
+    assert rxn.plog[0.0296] == (
+        2.020e+13, -1.870, 22755.0, 1.0e+10, 1.0, 0.0)
+
+
+def test__data_dct():
+    """ test chemkin_io.parser.reaction.data_dct
+    """
+    str_dct = chemkin_io.parser.reaction.data_dct(SYNGAS_REACTION_BLOCK)
+    rec_dct = chemkin_io.parser.reaction.data_dct(
+        SYNGAS_REACTION_BLOCK, data_entry='block')
+    assert list(str_dct) == list(rec_dct)
+    for key, rxns in rec_dct.items():
+        assert all((rxn.reactants, rxn.products) == key for rxn in rxns)
+        assert len(rxns) == len(
+            chemkin_io.parser.reaction.data_strings(str_dct[key]))
+
+
+def test__data_block():
+    """ test chemkin_io.parser.reaction.data_block
+    """
+    rxn_dat_lst = chemkin_io.parser.reaction.data_block(
+        SYNGAS_REACTION_BLOCK)
+    assert len(rxn_dat_lst) == len(SYNGAS_REACTION_STRS)
+    assert all(len(rxn_dat) == 8 for rxn_dat in rxn_dat_lst)
+
+
+def test__parallel_data_block():
+    """ test chemkin_io.parser.reaction.data_block
+        and chemkin_io.parser.reaction.data_dct over a process pool
+    """
+    ref_rxn_dat_lst = chemkin_io.parser.reaction.data_block(
+        HEPTANE_REACTION_BLOCK)
+    rxn_dat_lst = chemkin_io.parser.reaction.data_block(
+        HEPTANE_REACTION_BLOCK, nprocs=2)
+    assert rxn_dat_lst == ref_rxn_dat_lst
+
+    ref_rxn_dct = chemkin_io.parser.reaction.data_dct(
+        HEPTANE_REACTION_BLOCK)
+    rxn_dct = chemkin_io.parser.reaction.data_dct(
+        HEPTANE_REACTION_BLOCK, nprocs=2)
+    assert list(rxn_dct.items()) == list(ref_rxn_dct.items())
+
 
 def test__data_strings():
     """ test chemkin_io.parser.reaction.data_strings
@@ -192,6 +319,7 @@ if __name__ == '__main__':
     test__high_p_parameters()
     test__low_p_parameters()
     # test__troe_parameters()
+    test__sri_parameters()
     test__chebyshev_parameters()
     test__plog_parameters()
     # test__buffer_enhance_factors()
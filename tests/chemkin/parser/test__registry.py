@@ -0,0 +1,52 @@
+""" test chemkin_io.parser.registry
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+
+
+def test__counting():
+    """ test chemkin_io.parser.registry.counting
+    """
+    # First parse may compile, repeated parses should only match
+    chemkin_io.parser.reaction.data_block(SYNGAS_REACTION_BLOCK)
+    with chemkin_io.parser.registry.counting() as counts:
+        chemkin_io.parser.reaction.data_block(SYNGAS_REACTION_BLOCK)
+    assert counts['compiles'] == 0
+    assert counts['matches'] > 0
+
+    nmatches = counts['matches']
+    with chemkin_io.parser.registry.counting() as counts:
+        chemkin_io.parser.reaction.data_block(SYNGAS_REACTION_BLOCK)
+    assert counts['matches'] == nmatches
+
+
+def test__compiled():
+    """ test chemkin_io.parser.registry.compiled
+    """
+    pattern = chemkin_io.parser.reaction.REACTION_LINE_PATTERN
+    regex = chemkin_io.parser.registry.compiled(pattern)
+    with chemkin_io.parser.registry.counting() as counts:
+        assert chemkin_io.parser.registry.compiled(pattern) is regex
+    assert counts['compiles'] == 0
+
+
+if __name__ == '__main__':
+    test__counting()
+    test__compiled()
@@ -0,0 +1,74 @@
+""" test chemkin_io.parser.submechanism
+"""
+
+from __future__ import unicode_literals
+from builtins import open
+import os
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_DATA = chemkin_io.parser.cache.parse(SYNGAS_MECH_STR)
+
+H2_O2_NAMES = ('H2(2)', 'O2(3)', 'H(4)', 'O(5)', 'OH(6)', 'HO2(10)',
+               'H2O(7)', 'H2O2(11)')
+
+
+def test__species_index():
+    """ test chemkin_io.parser.reaction.species_index
+    """
+    rxns = SYNGAS_DATA['reactions']
+    spc_idx_dct = SYNGAS_DATA['species_index']
+    for name, rxn_idxs in spc_idx_dct.items():
+        assert rxn_idxs == tuple(
+            idx for idx, rxn in enumerate(rxns)
+            if name in rxn.reactants + rxn.products)
+    assert set(spc_idx_dct) == set().union(
+        *(rxn.reactants + rxn.products for rxn in rxns))
+
+
+def test__extract():
+    """ test chemkin_io.parser.submechanism.extract
+    """
+    sub_data = chemkin_io.parser.submechanism.extract(
+        SYNGAS_DATA, H2_O2_NAMES, keep_names=('N2',))
+    assert set(sub_data['species']) == set(H2_O2_NAMES + ('N2',))
+    assert set(thm_dat[0] for thm_dat in sub_data['thermo']) == set(
+        sub_data['species'])
+    assert sub_data['reactions'] == tuple(
+        rxn._replace(buffer=(
+            None if rxn.buffer is None else
+            {name: val for name, val in rxn.buffer.items()
+             if name in sub_data['species']}))
+        for rxn in SYNGAS_DATA['reactions']
+        if set(H2_O2_NAMES).issuperset(rxn.reactants + rxn.products))
+    assert sub_data['reactions']
+    assert sub_data['units'] == SYNGAS_DATA['units']
+
+    # growing the set from CO reaches the species of its reactions
+    sub_data = chemkin_io.parser.submechanism.extract(
+        SYNGAS_DATA, ('CO(1)',), depth=1)
+    for rxn in sub_data['reactions']:
+        assert set(rxn.reactants + rxn.products) <= set(sub_data['species'])
+    sub_rxn_keys = [(rxn.reactants, rxn.products, rxn.high_p)
+                    for rxn in sub_data['reactions']]
+    for idx in SYNGAS_DATA['species_index']['CO(1)']:
+        rxn = SYNGAS_DATA['reactions'][idx]
+        assert (rxn.reactants, rxn.products, rxn.high_p) in sub_rxn_keys
+
+    # the sub-mechanism can be extracted again
+    assert chemkin_io.parser.submechanism.extract(
+        sub_data, sub_data['species']) == sub_data
+
+
+if __name__ == '__main__':
+    test__species_index()
+    test__extract()
@@ -90,6 +90,38 @@ def test__data_block():
     assert ref_block == block_str[SPECIES_IDX]
 
 
+def test__data_arrays():
+    """ test chemkin_io.parser.thermo.data_arrays
+    """
+    names, temps, cfts = chemkin_io.parser.thermo.data_arrays(
+        NATGAS_THERMO_BLOCK)
+    assert len(names) == 130
+    assert temps.shape == (130, 3)
+    assert cfts.shape == (130, 2, 7)
+
+    ref_block = chemkin_io.parser.thermo.data_block(
+        NATGAS_THERMO_BLOCK)[SPECIES_IDX]
+    assert names[SPECIES_IDX] == ref_block[0]
+    assert np.array_equal(temps[SPECIES_IDX], ref_block[1])
+    assert np.array_equal(cfts[SPECIES_IDX, 0], ref_block[2])
+    assert np.array_equal(cfts[SPECIES_IDX, 1], ref_block[3])
+
+
+def test__data_record():
+    """ test chemkin_io.parser.thermo.data_record
+    """
+    # entries without the line number column are read by the pattern parsers
+    lines = SPECIES_POLYNOMIAL.splitlines()
+    misaligned_str = '\n'.join(line[:-1] for line in lines)
+    for thm_dstr in (SPECIES_POLYNOMIAL, misaligned_str):
+        record = chemkin_io.parser.thermo.data_record(thm_dstr)
+        assert record == (
+            chemkin_io.parser.thermo.species_name(thm_dstr),
+            chemkin_io.parser.thermo.temperatures(thm_dstr),
+            chemkin_io.parser.thermo.low_coefficients(thm_dstr),
+            chemkin_io.parser.thermo.high_coefficients(thm_dstr))
+
+
 def test__data_strings():
     """ test chemkin_io.parser.thermo.data_strings
     """
@@ -141,6 +173,8 @@ if __name__ == '__main__':
     test__low_coefficients()
     test__high_coefficients()
     test__data_block()
+    test__data_arrays()
+    test__data_record()
     test__dct_name_idx()
     test__dct_inchi_idx()
     test__temp_common_default()
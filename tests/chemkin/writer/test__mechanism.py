@@ -0,0 +1,44 @@
+""" test chemkin_io.writer.mechanism
+"""
+
+import os
+import chemkin_io
+
+
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_THERMO_SECTION = chemkin_io.parser.mechanism.section(
+    SYNGAS_MECH_STR, 'thermo')
+
+
+def test__mechanism_writer():
+    """ test chemkin_io.writer.mechanism.string
+        by reading the written mechanism back
+    """
+    mech_data = chemkin_io.parser.cache.parse(SYNGAS_MECH_STR)
+    thm_strs = chemkin_io.parser.thermo.column_strings(SYNGAS_THERMO_SECTION)
+    elm_block = chemkin_io.parser.mechanism.elements_block(SYNGAS_MECH_STR)
+    mech_str = chemkin_io.writer.mechanism.string(
+        mech_data['species'], mech_data['reactions'], mech_data['units'],
+        thm_strs=thm_strs, elm_block=elm_block)
+    new_mech_data = chemkin_io.parser.cache.parse(mech_str)
+    for key in ('species', 'thermo', 'reactions', 'units'):
+        assert new_mech_data[key] == mech_data[key]
+
+    # the elements block is kept and the thermo entries keep their columns
+    assert mech_str.startswith('ELEMENTS\n')
+    assert chemkin_io.parser.mechanism.elements_block(
+        mech_str).split() == elm_block.split()
+    assert chemkin_io.parser.thermo.column_strings(
+        chemkin_io.parser.mechanism.section(mech_str, 'thermo')) == thm_strs
+
+
+if __name__ == '__main__':
+    test__mechanism_writer()
@@ -2,9 +2,23 @@
  tests writers
 """
 
+import os
 import chemkin_io
 
 
+def _read_file(file_name):
+    with open(file_name, encoding='utf8', errors='ignore') as file_obj:
+        file_str = file_obj.read()
+    return file_str
+
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+SYNGAS_PATH = os.path.join(PATH, '../data/syngas')
+SYNGAS_MECH_STR = _read_file(os.path.join(SYNGAS_PATH, 'mechanism.txt'))
+SYNGAS_REACTION_BLOCK = chemkin_io.parser.util.clean_up_whitespace(
+    chemkin_io.parser.mechanism.reaction_block(SYNGAS_MECH_STR))
+
+
 def test__plog_writer():
     """ test chemkin_io.writer.reaction.plog
     """
@@ -40,5 +54,15 @@ def test__plog_writer():
     print(plog_str2)
 
 
+def test__data_string():
+    """ test chemkin_io.writer.reaction.data_string
+    """
+    rxns = chemkin_io.parser.reaction.data_records(SYNGAS_REACTION_BLOCK)
+    for rxn in rxns:
+        rxn_str = chemkin_io.writer.reaction.data_string(rxn)
+        assert chemkin_io.parser.reaction.data_record(rxn_str) == rxn
+
+
 if __name__ == '__main__':
     test__plog_writer()
+    test__data_string()
@@ -4,6 +4,7 @@ Test the ratefit rate constant calculators
 
 import numpy as np
 import pandas
+from scipy.special import eval_chebyt
 import ratefit
 
 TEMPS = np.array([300., 600., 900., 1200., 1500.,
@@ -20,6 +21,19 @@ PLOG_DCT = {
     9.8690: [5.480E+029, -5.700, 28.899]
 }
 
+CHEB_ALPHA1 = np.array([
+    [8.684, 0.2529, -0.03011, -0.004506],
+    [-0.5052, 0.1497, 0.01149, -0.005498],
+    [-0.1906, 0.04638, 0.007437, -0.0003488],
+    [-0.07253, 0.008762, 0.002487, 0.0006513],
+    [-0.02287, -0.000871, -0.0003002, 0.0003911],
+    [-0.004722, -0.001963, -0.0006948, 4.686e-05]])
+CHEB_ALPHA2 = np.array([
+    [1.0, 0.5],
+    [-0.2, 0.1]])
+CHEB_T_LIMITS = ((300.0, 2500.0), (500.0, 2000.0))
+CHEB_P_LIMITS = ((0.001, 100.0), (0.01, 10.0))
+
 np.set_printoptions(precision=15)
 
 
@@ -44,5 +58,59 @@ def test__chebyshev():
     assert np.allclose(chebyshev_ktps[5.0], np.array(data.ktp4), atol=0.01)
 
 
+def test__chebyshev_batch():
+    """ test ratefit.fxns.chebyshev_batch
+    """
+    alphas = (CHEB_ALPHA1, CHEB_ALPHA2)
+    batch_ktps = ratefit.fxns.chebyshev_batch(
+        alphas, CHEB_T_LIMITS, CHEB_P_LIMITS, PRESSURES, TEMPS)
+    assert batch_ktps.shape == (2, len(PRESSURES), len(TEMPS))
+
+    for alpha, (tmin, tmax), (pmin, pmax), ktps in zip(
+            alphas, CHEB_T_LIMITS, CHEB_P_LIMITS, batch_ktps):
+        grid_ktps = ratefit.fxns.chebyshev_grid(
+            alpha, tmin, tmax, pmin, pmax, PRESSURES, TEMPS)
+        assert np.allclose(grid_ktps, ktps)
+        for i, pressure in enumerate(PRESSURES):
+            ref_ktps = _chebyshev_sum(
+                alpha, tmin, tmax, pmin, pmax, pressure, TEMPS)
+            assert np.allclose(ktps[i], ref_ktps)
+
+
+def _chebyshev_sum(alpha, tmin, tmax, pmin, pmax, pressure, temps):
+    """ chebyshev rate constants summed term by term
+    """
+    ctemps = (
+        (2.0 / temps - 1.0 / tmin - 1.0 / tmax) /
+        (1.0 / tmax - 1.0 / tmin))
+    cpress = (
+        (2.0 * np.log10(pressure) - np.log10(pmin) - np.log10(pmax)) /
+        (np.log10(pmax) - np.log10(pmin)))
+    logktps = sum(
+        alpha[j, k] * eval_chebyt(j, ctemps) * eval_chebyt(k, cpress)
+        for j in range(alpha.shape[0]) for k in range(alpha.shape[1]))
+    return 10**logktps
+
+
+def test__chebyshev_batch_dlnk_dt():
+    """ test ratefit.fxns.chebyshev_batch_dlnk_dt
+        against central finite differences
+    """
+    alphas = (CHEB_ALPHA1, CHEB_ALPHA2)
+    step = 1e-3
+    dlnktps = ratefit.fxns.chebyshev_batch_dlnk_dt(
+        alphas, CHEB_T_LIMITS, CHEB_P_LIMITS, PRESSURES, TEMPS)
+    ref_dlnktps = (
+        np.log(ratefit.fxns.chebyshev_batch(
+            alphas, CHEB_T_LIMITS, CHEB_P_LIMITS, PRESSURES, TEMPS + step)) -
+        np.log(ratefit.fxns.chebyshev_batch(
+            alphas, CHEB_T_LIMITS, CHEB_P_LIMITS, PRESSURES, TEMPS - step))
+    ) / (2.0 * step)
+    assert dlnktps.shape == (2, len(PRESSURES), len(TEMPS))
+    assert np.allclose(dlnktps, ref_dlnktps, rtol=1e-5, atol=1e-10)
+
+
 if __name__ == '__main__':
     test__chebyshev()
+    test__chebyshev_batch()
+    test__chebyshev_batch_dlnk_dt()
@@ -14,6 +14,7 @@ T_REF = 1.0
 A_HIGH, N_HIGH, EA_HIGH = 2.000e+12, 0.900, 4.87490
 A_LOW, N_LOW, EA_LOW = 2.490e24, -2.300, 4.87490
 TROE_ALPHA, TROE_T3, TROE_T1, TROE_T2 = 6.0e-1, 1.0e3, 7.0, 1.7e3
+SRI_A, SRI_B, SRI_C, SRI_D, SRI_E = 0.45, 797.0, 979.0, 1.2, 0.1
 
 np.set_printoptions(precision=15)
 
@@ -60,5 +61,94 @@ def test__lindemann_troe():
     assert np.allclose(troe_ktps[10.0], np.array(data_troe.ktp4), atol=0.01)
 
 
+def test__falloff_grid():
+    """ test ratefit.fxns.falloff_grid
+    """
+    highp_ks = ratefit.fxns.single_arrhenius(
+        A_HIGH, N_HIGH, EA_HIGH,
+        T_REF, TEMPS)
+    lowp_ks = ratefit.fxns.single_arrhenius(
+        A_LOW, N_LOW, EA_LOW,
+        T_REF, TEMPS)
+
+    troe_ktps = ratefit.fxns.falloff_grid(
+        highp_ks, lowp_ks, PRESSURES, TEMPS,
+        troe_params=(TROE_ALPHA, TROE_T3, TROE_T1, TROE_T2))
+    assert troe_ktps.shape == (len(PRESSURES), len(TEMPS))
+    for i, pressure in enumerate(PRESSURES):
+        ref_ktps = ratefit.fxns.troe_rate_constants(
+            highp_ks, lowp_ks, pressure, TEMPS,
+            TROE_ALPHA, TROE_T3, TROE_T1, TROE_T2)
+        assert np.allclose(troe_ktps[i], ref_ktps)
+
+    # SRI broadening factor
+    sri_ktps = ratefit.fxns.falloff_grid(
+        highp_ks, lowp_ks, PRESSURES, TEMPS,
+        sri_params=(SRI_A, SRI_B, SRI_C, SRI_D, SRI_E))
+    lind_ktps = ratefit.fxns.falloff_grid(
+        highp_ks, lowp_ks, PRESSURES, TEMPS)
+    pr_terms = np.array([
+        (lowp_ks / highp_ks) * pressure / (ratefit.fxns.RC_CM3 * TEMPS)
+        for pressure in PRESSURES])
+    x_vals = 1.0 / (1.0 + np.log10(pr_terms)**2)
+    ref_f_terms = (
+        SRI_D * (SRI_A * np.exp(-SRI_B / TEMPS) +
+                 np.exp(-TEMPS / SRI_C))**x_vals * TEMPS**SRI_E)
+    assert np.allclose(sri_ktps, lind_ktps * ref_f_terms)
+
+    # several reactions at once, with third-body efficiencies
+    m_factors = np.array([1.0, 2.5]).reshape(2, 1, 1)
+    batch_ktps = ratefit.fxns.falloff_grid(
+        np.vstack([highp_ks, highp_ks]), np.vstack([lowp_ks, lowp_ks]),
+        PRESSURES, TEMPS, m_factor=m_factors)
+    assert batch_ktps.shape == (2, len(PRESSURES), len(TEMPS))
+    assert np.allclose(batch_ktps[0], lind_ktps)
+    assert np.allclose(
+        batch_ktps[1],
+        ratefit.fxns.falloff_grid(highp_ks, lowp_ks, 2.5 * PRESSURES, TEMPS))
+
+
+def test__falloff_grid_derivatives():
+    """ test ratefit.fxns.falloff_grid_derivatives
+        against central finite differences
+    """
+    def _ks(temps):
+        return (ratefit.fxns.single_arrhenius(
+                    A_HIGH, N_HIGH, EA_HIGH, T_REF, temps),
+                ratefit.fxns.single_arrhenius(
+                    A_LOW, N_LOW, EA_LOW, T_REF, temps))
+
+    highp_ks, lowp_ks = _ks(TEMPS)
+    highp_dlnks = ratefit.fxns.arrhenius_dlnk_dt(
+        [A_HIGH, N_HIGH, EA_HIGH], T_REF, TEMPS)
+    lowp_dlnks = ratefit.fxns.arrhenius_dlnk_dt(
+        [A_LOW, N_LOW, EA_LOW], T_REF, TEMPS)
+
+    # the bath gas concentration is held fixed through the pressures
+    step = 1e-3
+    for params in ({}, {'troe_params': (TROE_ALPHA, TROE_T3, TROE_T1,
+                                        TROE_T2)},
+                   {'sri_params': (SRI_A, SRI_B, SRI_C, SRI_D, SRI_E)}):
+        dlnk_dts, dlnk_dlnms = ratefit.fxns.falloff_grid_derivatives(
+            highp_ks, lowp_ks, highp_dlnks, lowp_dlnks, PRESSURES, TEMPS,
+            **params)
+
+        for i, pressure in enumerate(PRESSURES):
+            lnks = [np.log(ratefit.fxns.falloff_grid(
+                *_ks(temps), pressure * temps / TEMPS, temps,
+                **params).diagonal())
+                    for temps in (TEMPS - step, TEMPS + step)]
+            assert np.allclose(dlnk_dts[i], (lnks[1] - lnks[0]) / (2.0 * step),
+                               rtol=1e-5)
+
+        lnks = [np.log(ratefit.fxns.falloff_grid(
+            highp_ks, lowp_ks, PRESSURES * fac, TEMPS, **params))
+                for fac in (np.exp(-step), np.exp(step))]
+        assert np.allclose(dlnk_dlnms, (lnks[1] - lnks[0]) / (2.0 * step),
+                           rtol=1e-5)
+
+
 if __name__ == '__main__':
     test__lindemann_troe()
+    test__falloff_grid()
+    test__falloff_grid_derivatives()
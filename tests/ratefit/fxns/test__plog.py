@@ -43,5 +43,65 @@ def test__plog():
     assert np.allclose(plog_ktps[5.0], np.array(data.ktp4), atol=0.01)
 
 
+def test__plog_grid():
+    """ test ratefit.fxns.plog_grid
+    """
+    plog_pressures = sorted(PLOG_DCT)
+    grid_ktps = ratefit.fxns.plog_grid(PLOG_DCT, T_REF, PRESSURES, TEMPS)
+    assert grid_ktps.shape == (len(PRESSURES), len(TEMPS))
+
+    # at a plog pressure the expression of that pressure is used
+    ref_ktps = ratefit.fxns.arrhenius(PLOG_DCT[0.9869], T_REF, TEMPS)
+    assert np.allclose(grid_ktps[1], ref_ktps)
+
+    # outside the range the rate constants are clamped or extrapolated
+    low_pressure = plog_pressures[0] / 10.0
+    clamp_ktps = ratefit.fxns.plog_grid(
+        PLOG_DCT, T_REF, [low_pressure], TEMPS, policy='clamp')
+    extrap_ktps = ratefit.fxns.plog_grid(
+        PLOG_DCT, T_REF, [low_pressure], TEMPS, policy='extrapolate')
+    first_ktps = ratefit.fxns.arrhenius(
+        PLOG_DCT[plog_pressures[0]], T_REF, TEMPS)
+    second_ktps = ratefit.fxns.arrhenius(
+        PLOG_DCT[plog_pressures[1]], T_REF, TEMPS)
+    pres_term = (
+        np.log10(low_pressure / plog_pressures[0]) /
+        np.log10(plog_pressures[1] / plog_pressures[0]))
+    ref_extrap_ktps = 10**(
+        np.log10(first_ktps) +
+        (np.log10(second_ktps) - np.log10(first_ktps)) * pres_term)
+    assert np.allclose(clamp_ktps[0], first_ktps)
+    assert np.allclose(extrap_ktps[0], ref_extrap_ktps)
+
+    # expressions given at the same pressure are summed
+    dup_plog_dct = {
+        pressure: params + [params[0], params[1] + 0.5, params[2]]
+        for pressure, params in PLOG_DCT.items()}
+    dup_ktps = ratefit.fxns.plog_grid(
+        dup_plog_dct, T_REF, [0.9869], TEMPS)
+    ref_ktps = (
+        ratefit.fxns.arrhenius(PLOG_DCT[0.9869], T_REF, TEMPS) +
+        ratefit.fxns.arrhenius(dup_plog_dct[0.9869][3:], T_REF, TEMPS))
+    assert np.allclose(dup_ktps[0], ref_ktps)
+
+
+def test__plog_grid_dlnk_dt():
+    """ test ratefit.fxns.plog_grid_dlnk_dt
+        against central finite differences
+    """
+    step = 1e-3
+    dlnktps = ratefit.fxns.plog_grid_dlnk_dt(
+        PLOG_DCT, T_REF, PRESSURES, TEMPS)
+    ref_dlnktps = (
+        np.log(ratefit.fxns.plog_grid(
+            PLOG_DCT, T_REF, PRESSURES, TEMPS + step)) -
+        np.log(ratefit.fxns.plog_grid(
+            PLOG_DCT, T_REF, PRESSURES, TEMPS - step))) / (2.0 * step)
+    assert dlnktps.shape == (len(PRESSURES), len(TEMPS))
+    assert np.allclose(dlnktps, ref_dlnktps, rtol=1e-5)
+
+
 if __name__ == '__main__':
     test__plog()
+    test__plog_grid()
+    test__plog_grid_dlnk_dt()